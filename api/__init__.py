@@ -1,13 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
 from dotenv import load_dotenv
+from os import getenv
+from threading import Lock
+from time import time
 from .utils.info import Info
 from .utils.video import Video
 from .utils.episode import Episode
+from .utils.player import resolve_mirror, resolve_mirrors
+from .utils.resolvers import media_ttl
+from .utils.listing import LISTING_PAGE_SIZE, LISTING_WORKERS, merge_listing
 from .utils.home import Home
-from .utils.search import Search
+from .utils.search import Search, DEEP_SEARCH_DEADLINE, DEEP_SEARCH_MAX_PAGES
 from .utils.genre import Genres
 from .utils.anime import Anime
+from .utils.client import close_async_client
+from .utils.singleflight import SingleFlight, AsyncSingleFlight
+from .utils.cache import TieredCache
+from .utils.catalog import Catalog
+from .utils.fuzzy import FUZZY_LIMIT, TITLE_INDEX, fuzzy_result, seed_titles
+from .utils.suggest import SUGGEST_INDEX, SUGGEST_LIMIT
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Union
+import math
+import sqlite3
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Union,
+)
 
 load_dotenv()
 
@@ -15,65 +43,494 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+class _DeepSearch:
+    """Merges search pages into stream lines, dropping repeated cards."""
+
+    def __init__(self, query: str) -> None:
+        self.query: str = query
+        self.pages: List[int] = []
+        self.errors: List[Dict[str, Any]] = []
+        self.total: int = 0
+        self.__seen: Set[str] = set()
+
+    def page(self, page: int, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the line of a result page with only the cards not seen before."""
+        self.pages.append(page)
+        if result.get("error"):
+            self.errors.append({"page": page, "error": result["error"]})
+            return {"page": page, "results": [], "error": result["error"]}
+
+        cards = []
+        for card in result.get("results", []):
+            slug = card.get("slug")
+            # Cards without a link all share the "unknown" slug
+            key = slug if slug and slug != "unknown" else card.get("title")
+            if key in self.__seen:
+                continue
+            self.__seen.add(key)
+            cards.append(card)
+        self.total += len(cards)
+        return {"page": page, "results": cards}
+
+    def summary(self, total_pages: int) -> Dict[str, Any]:
+        """Get the closing line of the stream.
+
+        The stream is complete only when every one of total_pages was sent
+        without error, so pages cut off by max_pages or the deadline show.
+        """
+        line: Dict[str, Any] = {
+            "query": self.query,
+            "pages": self.pages,
+            "total_pages": total_pages,
+            "total": self.total,
+            "complete": len(self.pages) == total_pages and not self.errors,
+            "done": True,
+        }
+        if self.errors:
+            line["errors"] = self.errors
+        return line
+
+
 class Main:
+    # Shared by every handler so identical concurrent requests coalesce
+    __flight: SingleFlight = SingleFlight()
+    __async_flight: AsyncSingleFlight = AsyncSingleFlight()
+    __cache: TieredCache = TieredCache.from_env()
+    # Crawled catalog served instead of scraping, when CATALOG_DB is set
+    __catalog: Optional[Catalog] = Catalog.from_env()
+    # Stale-while-revalidate refreshes run off the request path
+    __refresh_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+        max_workers=int(getenv("CACHE_REFRESH_WORKERS", 4)),
+        thread_name_prefix="cache-refresh",
+    )
+    # Upstream listing pages fetched concurrently for multi-page requests
+    __page_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+        max_workers=LISTING_WORKERS, thread_name_prefix="listing-page"
+    )
+    __refresh_lock: Lock = Lock()
+    # Without a catalog there is nothing to seed the title indexes with
+    __titles_seeded: bool = __catalog is None
+    __seed_lock: Lock = Lock()
+    __refreshing: Set[str] = set()
+    __refresh_tasks: Set["asyncio.Task[None]"] = set()
+
     def __init__(self) -> None:
         logger.info("Initialized Main API handler")
 
+    def __store(self, endpoint: str, key: str, result: Any) -> None:
+        """Cache a successful result under the TTL of its endpoint."""
+        if not isinstance(result, dict) or result.get("error"):
+            return
+        if "result" in result and result["result"] is None:
+            return
+
+        ttl = None
+        if endpoint == "info":
+            status = str(result["result"].get("status", "")).lower()
+            if status == "completed":
+                endpoint = "info_completed"
+        elif endpoint == "video":
+            # Signed media links are only cached until they expire
+            ttl = media_ttl(result, self.__cache.ttl.get(endpoint, 0))
+
+        self.__cache.set(key, result, endpoint, ttl)
+
+    def __refresh(self, key: str, load: Callable[[], Any]) -> None:
+        """Refresh a stale entry in the background, once per key."""
+        with self.__refresh_lock:
+            if key in self.__refreshing:
+                return
+            self.__refreshing.add(key)
+
+        def run() -> None:
+            try:
+                self.__flight.do(key, load)
+            except Exception as e:
+                logger.error(f"Background refresh failed for {key}: {e}")
+            finally:
+                with self.__refresh_lock:
+                    self.__refreshing.discard(key)
+
+        logger.debug(f"Serving stale entry while refreshing: {key}")
+        self.__refresh_executor.submit(run)
+
+    def __load(self, endpoint: str, url: str, fn: Callable[[], Any]) -> Any:
+        """Serve a cached result, or run fn once for all concurrent callers."""
+        key = f"{endpoint}:{url}"
+
+        def load() -> Any:
+            result = fn()
+            self.__store(endpoint, key, result)
+            return result
+
+        cached = self.__cache.lookup(key)
+        if cached is not None:
+            value, stale = cached
+            if stale:
+                self.__refresh(key, load)
+            return value
+
+        return self.__flight.do(key, load)
+
+    async def __load_async(
+        self, endpoint: str, url: str, fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Serve a cached result, or await fn once for all concurrent callers."""
+        key = f"{endpoint}:{url}"
+
+        async def load() -> Any:
+            result = await fn()
+            self.__store(endpoint, key, result)
+            return result
+
+        cached = self.__cache.lookup(key)
+        if cached is not None:
+            value, stale = cached
+            if stale and key not in self.__refreshing:
+                self.__refresh_async(key, load)
+            return value
+
+        return await self.__async_flight.do(key, load)
+
+    def __refresh_async(self, key: str, load: Callable[[], Awaitable[Any]]) -> None:
+        """Refresh a stale entry in a background task, once per key."""
+        self.__refreshing.add(key)
+
+        async def run() -> None:
+            try:
+                await self.__async_flight.do(key, load)
+            except Exception as e:
+                logger.error(f"Background refresh failed for {key}: {e}")
+            finally:
+                self.__refreshing.discard(key)
+
+        logger.debug(f"Serving stale entry while refreshing: {key}")
+        # Keep a reference so the task is not garbage collected mid-refresh
+        task = asyncio.ensure_future(run())
+        self.__refresh_tasks.add(task)
+        task.add_done_callback(self.__refresh_tasks.discard)
+
+    def __resolve_players(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace the mirror handles of an episode with their embed URLs."""
+        result = data.get("result")
+        if not result or not isinstance(result.get("players"), list):
+            return data
+        players = resolve_mirrors(result["players"])
+        return {**data, "result": {**result, "players": players}}
+
+    def __with_video(
+        self, url: str, data: Dict[str, Any], media: Union[Dict[str, Any], bool]
+    ) -> Dict[str, Any]:
+        """Add resolved video sources to an episode and share them with get_video_source."""
+        if media:
+            self.__store("video", f"video:{url}", media)
+        return {**data, "result": {**data["result"], "video": media or None}}
+
+    def __pick_mirror(self, data: Dict[str, Any], mirror: int) -> Dict[str, Any]:
+        """Decode one mirror of an episode."""
+        result = data.get("result")
+        if not result:
+            return data
+        players = result.get("players")
+        handles = players if isinstance(players, list) else []
+        for handle in handles:
+            if handle["mirror"] == mirror:
+                player = resolve_mirror(handle)
+                if player:
+                    return {"result": player, "source": data.get("source")}
+                break
+        return {
+            "result": None,
+            "source": data.get("source"),
+            "error": "Mirror not found",
+        }
+
+    def __load_pages(
+        self, pages: List[int], load_page: Callable[[int], Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Load listing pages concurrently, returning them in page order."""
+        return list(self.__page_executor.map(load_page, pages))
+
+    async def __load_pages_async(
+        self, pages: List[int], load_page: Callable[[int], Awaitable[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Await listing pages with at most LISTING_WORKERS in flight."""
+        semaphore = asyncio.Semaphore(LISTING_WORKERS)
+
+        async def run(page: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await load_page(page)
+
+        return list(await asyncio.gather(*(run(page) for page in pages)))
+
+    def __anime_page(self, params: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """Get the upstream parameters of one anime list page."""
+        params = {key: value for key, value in params.items() if key != "page"}
+        if page > 1:
+            params["page"] = str(page)
+        return params
+
+    def __indexed(self, read: Callable[[Catalog], Any]) -> Any:
+        """Read a result from the catalog index, or None to scrape it live."""
+        if self.__catalog is None:
+            return None
+        try:
+            if not self.__catalog.ready:
+                return None
+            return read(self.__catalog)
+        except sqlite3.Error as e:
+            logger.warning(f"Catalog index unavailable, scraping live: {e}")
+            return None
+
+    async def __indexed_async(
+        self, read: Callable[..., Optional[Dict[str, Any]]], *args: Any, **kwargs: Any
+    ) -> Optional[Dict[str, Any]]:
+        """Run a catalog read on a worker thread, off the event loop."""
+        if self.__catalog is None:
+            return None
+        return await asyncio.to_thread(read, *args, **kwargs)
+
+    def __indexed_info(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Get anime information from the catalog index."""
+        return self.__indexed(lambda catalog: catalog.get_info(slug))
+
+    def __seed_titles(self) -> None:
+        """Load the series of the catalog index into the title indexes once.
+
+        Concurrent first requests wait for the one seeding instead of
+        scanning the catalog again.
+        """
+        if Main.__titles_seeded:
+            return
+        with Main.__seed_lock:
+            if Main.__titles_seeded:
+                return
+            titles = self.__indexed(lambda catalog: list(catalog.iter_titles()))
+            if titles is not None:
+                seed_titles(TITLE_INDEX, titles)
+                SUGGEST_INDEX.add_many(titles)
+                Main.__titles_seeded = True
+
+    async def __seed_titles_async(self) -> None:
+        """Seed the title indexes on a worker thread, off the event loop."""
+        if not Main.__titles_seeded:
+            await asyncio.to_thread(self.__seed_titles)
+
+    def __indexed_search(
+        self, search: Search, query: str, page: int
+    ) -> Optional[Dict[str, Any]]:
+        """Get a search result page from the catalog's full-text index."""
+        found = self.__indexed(lambda catalog: catalog.search(query, page))
+        if found is None:
+            return None
+        cards, matches = found
+        return {
+            "results": cards,
+            "query": query,
+            "total": len(cards),
+            "page": page,
+            "total_pages": max(math.ceil(matches / LISTING_PAGE_SIZE), 1),
+            "source": search.upstream_url(),
+        }
+
+    def __indexed_genre(
+        self, genres_handler: Genres, genre: str, page: int
+    ) -> Optional[Dict[str, Any]]:
+        """Get a genre listing page from the catalog index."""
+        cards = self.__indexed(
+            lambda catalog: catalog.list_series({"genre[]": genre, "page": page})
+        )
+        if cards is None:
+            return None
+        return {
+            "results": cards,
+            "slug": genre,
+            "page": page,
+            "total": len(cards),
+            "source": genres_handler.upstream_url(genre, page),
+        }
+
+    def __indexed_anime(self, anime: Anime, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        """Get an anime list page from the catalog index."""
+        cards = self.__indexed(
+            lambda catalog: catalog.list_series(kwargs.get("params"))
+        )
+        if cards is None:
+            return None
+        return {
+            "results": cards,
+            "total": len(cards),
+            "source": anime.upstream_url(**kwargs),
+        }
+
     def get_info(self, slug: str) -> Dict[str, Any]:
         """Get anime information by slug."""
         try:
             logger.info(f"Getting info for slug: {slug}")
-            return Info(slug).to_json()
+            indexed = self.__indexed_info(slug)
+            if indexed:
+                return indexed
+            info = Info(slug)
+            return self.__load("info", info.upstream_url(), info.to_json)
         except Exception as e:
             logger.error(f"Error getting info for {slug}: {e}")
             return {"result": None, "error": str(e)}
 
+    def get_episodes(self, slug: str, page: int = 1, limit: int = 50) -> Dict[str, Any]:
+        """Get one page of the episode list of an anime."""
+        try:
+            logger.info(f"Getting episodes for slug: {slug}, page: {page}")
+            info = Info(slug)
+            return self.__load(
+                "episodes",
+                f"{info.upstream_url()}|page={page}&limit={limit}",
+                lambda: info.get_episodes(page, limit),
+            )
+        except Exception as e:
+            logger.error(f"Error getting episodes for {slug}: {e}")
+            return {"results": [], "slug": slug, "page": page, "error": str(e)}
+
     def get_video_source(self, slug: str) -> Union[Dict[str, Any], bool]:
         """Get video source by slug."""
         try:
             logger.info(f"Getting video source for slug: {slug}")
-            return Video(slug).get_details()
+            video = Video(slug)
+            return self.__load("video", video.upstream_url(), video.get_details)
         except Exception as e:
             logger.error(f"Error getting video source for {slug}: {e}")
             return False
 
-    def get_episode(self, slug: str) -> Dict[str, Any]:
-        """Get episode information by slug."""
+    def get_episode(
+        self, slug: str, resolve: bool = False, video: bool = False
+    ) -> Dict[str, Any]:
+        """Get episode information by slug, optionally with decoded mirrors and video."""
         try:
             logger.info(f"Getting episode for slug: {slug}")
-            return Episode(slug).to_json()
+            episode = Episode(slug)
+            url = episode.upstream_url()
+            data = self.__load("episode", url, episode.to_json)
+            players = (data.get("result") or {}).get("players")
+            if video and isinstance(players, list):
+                cached = self.__cache.get(f"video:{url}")
+                media = cached or Video(slug).get_media(players)
+                data = self.__with_video(url, data, media)
+            return self.__resolve_players(data) if resolve else data
         except Exception as e:
             logger.error(f"Error getting episode for {slug}: {e}")
             return {"result": None, "error": str(e)}
 
+    def get_episode_mirror(self, slug: str, mirror: int) -> Dict[str, Any]:
+        """Get the embed URL of one mirror of an episode."""
+        try:
+            logger.info(f"Getting mirror {mirror} of episode: {slug}")
+            episode = Episode(slug)
+            data = self.__load("episode", episode.upstream_url(), episode.to_json)
+            return self.__pick_mirror(data, mirror)
+        except Exception as e:
+            logger.error(f"Error getting mirror {mirror} of {slug}: {e}")
+            return {"result": None, "error": str(e)}
+
     def get_home(self, page: int = 1) -> Dict[str, Any]:
         """Get home page content."""
         try:
             logger.info(f"Getting home page for page: {page}")
-            return Home(page).get_details()
+            home = Home(page)
+            return self.__load(home.endpoint, home.upstream_url(), home.get_details)
         except Exception as e:
             logger.error(f"Error getting home page {page}: {e}")
             return {"results": [], "page": page, "total": 0, "error": str(e)}
 
-    def search(self, query: str) -> Dict[str, Any]:
+    def search(self, query: str, page: int = 1) -> Dict[str, Any]:
         """Search anime by query."""
         try:
-            logger.info(f"Searching for query: {query}")
-            return Search(query).get_details()
+            logger.info(f"Searching for query: {query}, page: {page}")
+            search = Search(query, page)
+            indexed = self.__indexed_search(search, query, page)
+            if indexed:
+                return indexed
+            return self.__load("search", search.upstream_url(), search.get_details)
         except Exception as e:
             logger.error(f"Error searching for {query}: {e}")
             return {"results": [], "query": query, "total": 0, "error": str(e)}
 
+    def search_fuzzy(self, query: str, limit: int = FUZZY_LIMIT) -> Dict[str, Any]:
+        """Search known series titles tolerating typos, else search upstream."""
+        try:
+            logger.info(f"Fuzzy searching for query: {query}")
+            self.__seed_titles()
+            found = fuzzy_result(query, TITLE_INDEX.lookup(query, limit))
+            if found:
+                return found
+            return {**self.search(query), "fuzzy": False}
+        except Exception as e:
+            logger.error(f"Error fuzzy searching for {query}: {e}")
+            return {"results": [], "query": query, "total": 0, "error": str(e)}
+
+    def suggest(self, query: str, limit: int = SUGGEST_LIMIT) -> Dict[str, Any]:
+        """Suggest series whose title or slug starts with the query, without scraping."""
+        try:
+            logger.debug(f"Suggesting for query: {query}")
+            self.__seed_titles()
+            results = SUGGEST_INDEX.lookup(query, limit)
+            return {"results": results, "query": query, "total": len(results)}
+        except Exception as e:
+            logger.error(f"Error suggesting for {query}: {e}")
+            return {"results": [], "query": query, "total": 0, "error": str(e)}
+
+    def search_deep(
+        self, query: str, max_pages: int = DEEP_SEARCH_MAX_PAGES
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream the results of every search page, in page order.
+
+        Page 1 tells how many pages there are; the rest are fetched
+        concurrently and yielded as soon as every earlier page is out, until
+        DEEP_SEARCH_DEADLINE runs out.
+        """
+        ends_at = time() + DEEP_SEARCH_DEADLINE
+        first = self.search(query)
+        stream = _DeepSearch(query)
+        yield stream.page(1, first)
+
+        # Pages past max_pages are left out; the summary still counts them
+        total_pages = max(first.get("total_pages", 1), 1)
+        pages = list(range(2, min(total_pages, max_pages) + 1))
+        futures = [self.__page_executor.submit(self.search, query, p) for p in pages]
+        try:
+            for page, future in zip(pages, futures):
+                try:
+                    result = future.result(timeout=max(ends_at - time(), 0))
+                except FutureTimeout:
+                    logger.warning(f"Deep search deadline reached for: {query}")
+                    break
+                yield stream.page(page, result)
+        finally:
+            # Also runs when the client disconnects and the stream is closed
+            for pending in futures:
+                pending.cancel()
+
+        yield stream.summary(total_pages)
+
     def genres(self, genre: Optional[str] = None, page: int = 1) -> Dict[str, Any]:
         """Get genres list or anime by genre."""
         try:
             genres_handler = Genres()
             if not genre:
                 logger.info("Getting genres list")
-                return genres_handler.list_genre()
+                return self.__load(
+                    "genres",
+                    genres_handler.upstream_url(),
+                    genres_handler.list_genre,
+                )
             else:
                 logger.info(f"Getting genre '{genre}' page {page}")
-                return genres_handler.get_genre(genre, page)
+                indexed = self.__indexed_genre(genres_handler, genre, page)
+                if indexed:
+                    return indexed
+                return self.__load(
+                    "genre",
+                    genres_handler.upstream_url(genre, page),
+                    lambda: genres_handler.get_genre(genre, page),
+                )
         except Exception as e:
             if genre:
                 logger.error(f"Error getting genre {genre} page {page}: {e}")
@@ -88,15 +545,323 @@ class Main:
                 logger.error(f"Error getting genres list: {e}")
                 return {"genres": [], "total": 0, "error": str(e)}
 
+    def genre_pages(
+        self, genre: str, pages: List[int], limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Get several pages of a genre listing at once, merged in page order."""
+        try:
+            logger.info(f"Getting genre '{genre}' pages {pages}")
+            results = self.__load_pages(pages, lambda page: self.genres(genre, page))
+            return {"slug": genre, **merge_listing(results, pages, limit)}
+        except Exception as e:
+            logger.error(f"Error getting genre {genre} pages {pages}: {e}")
+            return {
+                "results": [],
+                "slug": genre,
+                "pages": pages,
+                "total": 0,
+                "error": str(e),
+            }
+
+    def anime_pages(
+        self, pages: List[int], limit: Optional[int] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Get several pages of the anime list at once, merged in page order."""
+        try:
+            logger.info(f"Getting anime list pages {pages}")
+            params = kwargs.pop("params", None) or {}
+            results = self.__load_pages(
+                pages,
+                lambda page: self.anime(
+                    params=self.__anime_page(params, page), **kwargs
+                ),
+            )
+            return merge_listing(results, pages, limit)
+        except Exception as e:
+            logger.error(f"Error getting anime list pages {pages}: {e}")
+            return {"results": [], "pages": pages, "total": 0, "error": str(e)}
+
     def anime(self, **kwargs: Any) -> Dict[str, Any]:
         """Get anime list with optional parameters."""
         try:
             logger.info("Getting anime list")
-            return Anime().get_details(**kwargs)
+            anime = Anime()
+            indexed = self.__indexed_anime(anime, **kwargs)
+            if indexed:
+                return indexed
+            return self.__load(
+                "anime",
+                anime.upstream_url(**kwargs),
+                lambda: anime.get_details(**kwargs),
+            )
+        except Exception as e:
+            logger.error(f"Error getting anime list: {e}")
+            return {"results": [], "total": 0, "error": str(e)}
+
+    async def get_info_async(self, slug: str) -> Dict[str, Any]:
+        """Get anime information by slug without blocking."""
+        try:
+            logger.info(f"Getting info for slug: {slug}")
+            indexed = await self.__indexed_async(self.__indexed_info, slug)
+            if indexed:
+                return indexed
+            info = Info(slug)
+            return await self.__load_async(
+                "info", info.upstream_url(), info.to_json_async
+            )
+        except Exception as e:
+            logger.error(f"Error getting info for {slug}: {e}")
+            return {"result": None, "error": str(e)}
+
+    async def get_episodes_async(
+        self, slug: str, page: int = 1, limit: int = 50
+    ) -> Dict[str, Any]:
+        """Get one page of the episode list of an anime without blocking."""
+        try:
+            logger.info(f"Getting episodes for slug: {slug}, page: {page}")
+            info = Info(slug)
+            return await self.__load_async(
+                "episodes",
+                f"{info.upstream_url()}|page={page}&limit={limit}",
+                lambda: info.get_episodes_async(page, limit),
+            )
+        except Exception as e:
+            logger.error(f"Error getting episodes for {slug}: {e}")
+            return {"results": [], "slug": slug, "page": page, "error": str(e)}
+
+    async def get_video_source_async(self, slug: str) -> Union[Dict[str, Any], bool]:
+        """Get video source by slug without blocking."""
+        try:
+            logger.info(f"Getting video source for slug: {slug}")
+            video = Video(slug)
+            return await self.__load_async(
+                "video", video.upstream_url(), video.get_details_async
+            )
+        except Exception as e:
+            logger.error(f"Error getting video source for {slug}: {e}")
+            return False
+
+    async def get_episode_async(
+        self, slug: str, resolve: bool = False, video: bool = False
+    ) -> Dict[str, Any]:
+        """Get episode information by slug without blocking."""
+        try:
+            logger.info(f"Getting episode for slug: {slug}")
+            episode = Episode(slug)
+            url = episode.upstream_url()
+            data = await self.__load_async("episode", url, episode.to_json_async)
+            players = (data.get("result") or {}).get("players")
+            if video and isinstance(players, list):
+                cached = self.__cache.get(f"video:{url}")
+                media = cached or await Video(slug).get_media_async(players)
+                data = self.__with_video(url, data, media)
+            return self.__resolve_players(data) if resolve else data
+        except Exception as e:
+            logger.error(f"Error getting episode for {slug}: {e}")
+            return {"result": None, "error": str(e)}
+
+    async def get_episode_mirror_async(self, slug: str, mirror: int) -> Dict[str, Any]:
+        """Get the embed URL of one mirror of an episode without blocking."""
+        try:
+            logger.info(f"Getting mirror {mirror} of episode: {slug}")
+            episode = Episode(slug)
+            data = await self.__load_async(
+                "episode", episode.upstream_url(), episode.to_json_async
+            )
+            return self.__pick_mirror(data, mirror)
+        except Exception as e:
+            logger.error(f"Error getting mirror {mirror} of {slug}: {e}")
+            return {"result": None, "error": str(e)}
+
+    async def get_home_async(self, page: int = 1) -> Dict[str, Any]:
+        """Get home page content without blocking."""
+        try:
+            logger.info(f"Getting home page for page: {page}")
+            home = Home(page)
+            return await self.__load_async(
+                home.endpoint, home.upstream_url(), home.get_details_async
+            )
+        except Exception as e:
+            logger.error(f"Error getting home page {page}: {e}")
+            return {"results": [], "page": page, "total": 0, "error": str(e)}
+
+    async def search_async(self, query: str, page: int = 1) -> Dict[str, Any]:
+        """Search anime by query without blocking."""
+        try:
+            logger.info(f"Searching for query: {query}, page: {page}")
+            search = Search(query, page)
+            indexed = await self.__indexed_async(
+                self.__indexed_search, search, query, page
+            )
+            if indexed:
+                return indexed
+            return await self.__load_async(
+                "search", search.upstream_url(), search.get_details_async
+            )
+        except Exception as e:
+            logger.error(f"Error searching for {query}: {e}")
+            return {"results": [], "query": query, "total": 0, "error": str(e)}
+
+    async def search_fuzzy_async(
+        self, query: str, limit: int = FUZZY_LIMIT
+    ) -> Dict[str, Any]:
+        """Search known series titles tolerating typos without blocking."""
+        try:
+            logger.info(f"Fuzzy searching for query: {query}")
+            await self.__seed_titles_async()
+            found = fuzzy_result(query, TITLE_INDEX.lookup(query, limit))
+            if found:
+                return found
+            return {**await self.search_async(query), "fuzzy": False}
+        except Exception as e:
+            logger.error(f"Error fuzzy searching for {query}: {e}")
+            return {"results": [], "query": query, "total": 0, "error": str(e)}
+
+    async def suggest_async(
+        self, query: str, limit: int = SUGGEST_LIMIT
+    ) -> Dict[str, Any]:
+        """Suggest series whose title or slug starts with the query without blocking."""
+        try:
+            logger.debug(f"Suggesting for query: {query}")
+            await self.__seed_titles_async()
+            results = SUGGEST_INDEX.lookup(query, limit)
+            return {"results": results, "query": query, "total": len(results)}
+        except Exception as e:
+            logger.error(f"Error suggesting for {query}: {e}")
+            return {"results": [], "query": query, "total": 0, "error": str(e)}
+
+    async def search_deep_async(
+        self, query: str, max_pages: int = DEEP_SEARCH_MAX_PAGES
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the results of every search page in page order without blocking."""
+        loop = asyncio.get_running_loop()
+        ends_at = loop.time() + DEEP_SEARCH_DEADLINE
+        first = await self.search_async(query)
+        stream = _DeepSearch(query)
+        yield stream.page(1, first)
+
+        total_pages = max(first.get("total_pages", 1), 1)
+        pages = list(range(2, min(total_pages, max_pages) + 1))
+        semaphore = asyncio.Semaphore(LISTING_WORKERS)
+
+        async def run(page: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.search_async(query, page)
+
+        tasks = [asyncio.ensure_future(run(page)) for page in pages]
+        try:
+            for page, task in zip(pages, tasks):
+                done, _ = await asyncio.wait(
+                    {task}, timeout=max(ends_at - loop.time(), 0)
+                )
+                if not done:
+                    logger.warning(f"Deep search deadline reached for: {query}")
+                    break
+                yield stream.page(page, task.result())
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        yield stream.summary(total_pages)
+
+    async def genres_async(
+        self, genre: Optional[str] = None, page: int = 1
+    ) -> Dict[str, Any]:
+        """Get genres list or anime by genre without blocking."""
+        try:
+            genres_handler = Genres()
+            if not genre:
+                logger.info("Getting genres list")
+                return await self.__load_async(
+                    "genres",
+                    genres_handler.upstream_url(),
+                    genres_handler.list_genre_async,
+                )
+            else:
+                logger.info(f"Getting genre '{genre}' page {page}")
+                indexed = await self.__indexed_async(
+                    self.__indexed_genre, genres_handler, genre, page
+                )
+                if indexed:
+                    return indexed
+                return await self.__load_async(
+                    "genre",
+                    genres_handler.upstream_url(genre, page),
+                    lambda: genres_handler.get_genre_async(genre, page),
+                )
+        except Exception as e:
+            if genre:
+                logger.error(f"Error getting genre {genre} page {page}: {e}")
+                return {
+                    "results": [],
+                    "slug": genre,
+                    "page": page,
+                    "total": 0,
+                    "error": str(e),
+                }
+            else:
+                logger.error(f"Error getting genres list: {e}")
+                return {"genres": [], "total": 0, "error": str(e)}
+
+    async def genre_pages_async(
+        self, genre: str, pages: List[int], limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Get several pages of a genre listing at once without blocking."""
+        try:
+            logger.info(f"Getting genre '{genre}' pages {pages}")
+            results = await self.__load_pages_async(
+                pages, lambda page: self.genres_async(genre, page)
+            )
+            return {"slug": genre, **merge_listing(results, pages, limit)}
+        except Exception as e:
+            logger.error(f"Error getting genre {genre} pages {pages}: {e}")
+            return {
+                "results": [],
+                "slug": genre,
+                "pages": pages,
+                "total": 0,
+                "error": str(e),
+            }
+
+    async def anime_pages_async(
+        self, pages: List[int], limit: Optional[int] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Get several pages of the anime list at once without blocking."""
+        try:
+            logger.info(f"Getting anime list pages {pages}")
+            params = kwargs.pop("params", None) or {}
+            results = await self.__load_pages_async(
+                pages,
+                lambda page: self.anime_async(
+                    params=self.__anime_page(params, page), **kwargs
+                ),
+            )
+            return merge_listing(results, pages, limit)
+        except Exception as e:
+            logger.error(f"Error getting anime list pages {pages}: {e}")
+            return {"results": [], "pages": pages, "total": 0, "error": str(e)}
+
+    async def anime_async(self, **kwargs: Any) -> Dict[str, Any]:
+        """Get anime list with optional parameters without blocking."""
+        try:
+            logger.info("Getting anime list")
+            anime = Anime()
+            indexed = await self.__indexed_async(self.__indexed_anime, anime, **kwargs)
+            if indexed:
+                return indexed
+            return await self.__load_async(
+                "anime",
+                anime.upstream_url(**kwargs),
+                lambda: anime.get_details_async(**kwargs),
+            )
         except Exception as e:
             logger.error(f"Error getting anime list: {e}")
             return {"results": [], "total": 0, "error": str(e)}
 
+    async def close_async(self) -> None:
+        """Release the pooled connections of the running event loop."""
+        await close_async_client()
+
 
 if __name__ == "__main__":
     # Configure logging for testing
@@ -0,0 +1,286 @@
+from bs4 import BeautifulSoup, CData, NavigableString, SoupStrainer, Tag
+from dotenv import load_dotenv
+from os import getenv
+import logging
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401
+
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+    HAS_SELECTOLAX = True
+except ImportError:
+    LexborNode = None
+    HAS_SELECTOLAX = False
+
+# Backends selectable with the HTML_PARSER setting
+BACKENDS: Dict[str, bool] = {
+    "html.parser": True,
+    "lxml": HAS_LXML,
+    "selectolax": HAS_SELECTOLAX,
+}
+
+
+class Node:
+    """BeautifulSoup-compatible view of a selectolax node.
+
+    Implements the subset of the Tag API used by the extractors: find,
+    find_all, get, item access, text, get_text and extract.
+    """
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: "LexborNode") -> None:
+        self._node = node
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return self._node.html or ""
+
+    def __getitem__(self, key: str) -> str:
+        return self._node.attributes[key] or ""
+
+    @property
+    def name(self) -> str:
+        return self._node.tag
+
+    @property
+    def attrs(self) -> Dict[str, Optional[str]]:
+        return self._node.attributes
+
+    @property
+    def text(self) -> str:
+        return self._node.text(deep=True)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get an attribute value."""
+        attributes = self._node.attributes
+        if key not in attributes:
+            return default
+        return attributes[key] or ""
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        """Get the text of the node and its descendants."""
+        return self._node.text(deep=True, separator=separator, strip=strip)
+
+    def extract(self) -> "Node":
+        """Remove the node from the tree."""
+        self._node.decompose()
+        return self
+
+    @property
+    def descendants(self) -> Iterator["Node"]:
+        """Iterate over the descendant elements in document order."""
+        for node in self.__iter_nodes(True):
+            if not node.tag.startswith("-"):
+                yield Node(node)
+
+    def __iter_nodes(self, recursive: bool) -> Iterator["LexborNode"]:
+        if recursive:
+            nodes = self._node.traverse()
+            next(nodes, None)  # traverse() starts with the node itself
+            return nodes
+        return self._node.iter()
+
+    def find_all(
+        self,
+        name: Any = None,
+        attrs: Union[Dict[str, Any], str, None] = None,
+        recursive: bool = True,
+        limit: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List["Node"]:
+        """Find descendant elements matching a tag name and attributes."""
+        if isinstance(attrs, str):
+            attrs = {"class": attrs}
+        attrs = {**(attrs or {}), **kwargs}
+
+        results: List[Node] = []
+        for node in self.__iter_nodes(recursive):
+            if node.tag.startswith("-") or not _matches(node, name, attrs):
+                continue
+            results.append(Node(node))
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def find(
+        self,
+        name: Any = None,
+        attrs: Union[Dict[str, Any], str, None] = None,
+        recursive: bool = True,
+        **kwargs: Any,
+    ) -> Optional["Node"]:
+        """Find the first descendant element matching a tag name and attributes."""
+        results = self.find_all(name, attrs, recursive, limit=1, **kwargs)
+        return results[0] if results else None
+
+
+def _matches(node: "LexborNode", name: Any, attrs: Dict[str, Any]) -> bool:
+    """Match a node the way BeautifulSoup matches name and attribute filters."""
+    if name not in (None, True) and node.tag != name:
+        return False
+
+    attributes = node.attributes
+    for key, expected in attrs.items():
+        if key == "class_":
+            key = "class"
+        if expected is True:
+            if key not in attributes:
+                return False
+            continue
+
+        value = attributes.get(key)
+        if value is None:
+            return False
+        if key == "class" and expected in value.split():
+            continue
+        if value != expected:
+            return False
+    return True
+
+
+_SELECTOR = re.compile(
+    r"^(?P<tag>[\w-]+)"
+    r'(?:\.(?P<cls>[\w-]+)|\[(?P<attr>[\w-]+)(?:="(?P<value>[^"]*)")?\])?$'
+)
+
+
+class Selector:
+    """A compiled ``tag``, ``tag.class``, ``tag[attr]`` or ``tag[attr="value"]``."""
+
+    __slots__ = ("text", "name", "key", "value")
+
+    def __init__(self, text: str) -> None:
+        match = _SELECTOR.match(text)
+        if not match:
+            raise ValueError(f"Unsupported selector: {text}")
+        self.text: str = text
+        self.name: str = match["tag"]
+        self.key: Optional[str] = "class" if match["cls"] else match["attr"]
+        self.value: Optional[str] = match["cls"] or match["value"]
+
+    def matches(self, name: str, attrs: Optional[Dict[str, Any]]) -> bool:
+        """Check a tag name and its attributes against the selector."""
+        if name != self.name:
+            return False
+        if self.key is None:
+            return True
+        value = (attrs or {}).get(self.key)
+        if value is None:
+            return False
+        if self.value is None:
+            return True
+        if self.key == "class":
+            classes = value.split() if isinstance(value, str) else value
+            return self.value in classes
+        return value == self.value
+
+
+class ParseProfile:
+    """Regions of a page an extractor reads; the rest is never built into a tree.
+
+    Every element matching one of the selectors is kept with all of its
+    descendants.
+    """
+
+    def __init__(self, *selectors: str) -> None:
+        self.selectors: Tuple[Selector, ...] = tuple(Selector(s) for s in selectors)
+        self.css: str = ", ".join(selectors)
+        self.strainer: SoupStrainer = _ProfileStrainer(self)
+
+    def matches(self, name: str, attrs: Optional[Dict[str, Any]]) -> bool:
+        """Check whether a tag starts one of the regions."""
+        return any(selector.matches(name, attrs) for selector in self.selectors)
+
+
+class _ProfileStrainer(SoupStrainer):
+    """SoupStrainer that keeps the regions of a ParseProfile and no loose text."""
+
+    def __init__(self, profile: ParseProfile) -> None:
+        super().__init__()
+        self.__profile = profile
+
+    def allow_tag_creation(
+        self, nsprefix: Optional[str], name: str, attrs: Optional[Dict[str, Any]]
+    ) -> bool:
+        return self.__profile.matches(name, attrs)
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+    def search_tag(self, markup_name: Any = None, markup_attrs: Any = None) -> bool:
+        # beautifulsoup4 < 4.13 filters tags through search_tag instead
+        return self.__profile.matches(markup_name, markup_attrs)
+
+
+def _slice_regions(tree: "LexborHTMLParser", profile: ParseProfile) -> str:
+    """Get the outer HTML of the outermost elements matching a profile."""
+    matched = tree.css(profile.css)
+    ids = {node.mem_id for node in matched}
+    regions = []
+    for node in matched:
+        parent = node.parent
+        while parent is not None and parent.mem_id not in ids:
+            parent = parent.parent
+        if parent is None:
+            regions.append(node.html)
+    return "".join(regions)
+
+
+def is_element(value: Any) -> bool:
+    """Check whether a value is an element of any backend."""
+    return isinstance(value, (Tag, Node))
+
+
+def own_text(element: Union[Tag, Node]) -> str:
+    """Get the text directly inside an element, leaving out its child elements."""
+    if isinstance(element, Node):
+        return element._node.text(deep=False)
+    return "".join(
+        child for child in element.children if type(child) in (NavigableString, CData)
+    )
+
+
+def get_backend() -> str:
+    """Get the configured parser backend, falling back to html.parser."""
+    backend = getenv("HTML_PARSER", "html.parser")
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown HTML_PARSER '{backend}', using html.parser")
+        return "html.parser"
+    if not BACKENDS[backend]:
+        logger.warning(f"HTML_PARSER '{backend}' is not installed, using html.parser")
+        return "html.parser"
+    return backend
+
+
+def parse_html(
+    html: str, backend: Optional[str] = None, profile: Optional[ParseProfile] = None
+) -> Union[BeautifulSoup, Node]:
+    """Parse an HTML document, or only the regions of a profile, with a backend."""
+    backend = backend or BACKEND
+    if backend == "selectolax":
+        tree = LexborHTMLParser(html)
+        if profile is not None:
+            tree = LexborHTMLParser(_slice_regions(tree, profile))
+        return Node(tree.root)
+    if profile is not None:
+        return BeautifulSoup(html, backend, parse_only=profile.strainer)
+    return BeautifulSoup(html, backend)
+
+
+BACKEND: str = get_backend()
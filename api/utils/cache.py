@@ -0,0 +1,240 @@
+from collections import OrderedDict
+from dotenv import load_dotenv
+from hashlib import sha1
+from os import getenv
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from time import time
+import json
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Default time-to-live per endpoint, in seconds
+DEFAULT_TTL: Dict[str, int] = {
+    "home": 60,
+    "home_page": 600,
+    "search": 600,
+    "info": 1800,
+    "info_completed": 86400,
+    "episodes": 1800,
+    "episode": 600,
+    "video": 300,
+    "genres": 604800,
+    "genre": 1800,
+    "anime": 1800,
+}
+
+# How long past its TTL an entry may still be served while it is refreshed
+DEFAULT_MAX_STALE: Dict[str, int] = {
+    "home": 600,
+    "home_page": 3600,
+    "genre": 3600,
+}
+
+
+def _env_seconds(prefix: str, endpoints: Dict[str, int]) -> Dict[str, int]:
+    """Read per-endpoint second values such as CACHE_TTL_HOME from the environment."""
+    values = {}
+    for endpoint in endpoints:
+        value = getenv(f"{prefix}_{endpoint.upper()}")
+        if value is not None:
+            try:
+                values[endpoint] = int(value)
+            except ValueError:
+                logger.warning(f"Invalid {prefix} for {endpoint}: {value}")
+    return values
+
+
+class MemoryCache:
+    """Size-bounded in-memory LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.__max_entries: int = max_entries
+        self.__entries: "OrderedDict[str, Tuple[float, float, Any]]" = OrderedDict()
+        self.__lock: Lock = Lock()
+
+    def get(self, key: str) -> Optional[Tuple[float, float, Any]]:
+        """Get the (expires_at, stale_until, value) entry of a key, if usable."""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time():
+                del self.__entries[key]
+                return None
+            self.__entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Any, expires_at: float, stale_until: float) -> None:
+        """Store a value until stale_until, evicting the least recently used."""
+        with self.__lock:
+            self.__entries[key] = (expires_at, stale_until, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove a key from the cache."""
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self.__lock:
+            self.__entries.clear()
+
+
+class DiskCache:
+    """JSON file cache shared by every worker process on the host."""
+
+    def __init__(self, directory: str) -> None:
+        self.__directory: str = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def __path(self, key: str) -> str:
+        return os.path.join(
+            self.__directory, f"{sha1(key.encode('utf-8')).hexdigest()}.json"
+        )
+
+    def get(self, key: str) -> Optional[Tuple[float, float, Any]]:
+        """Get the (expires_at, stale_until, value) entry of a key, if usable."""
+        path = self.__path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read disk cache entry for {key}: {e}")
+            return None
+
+        if entry.get("key") != key:
+            return None
+        stale_until = entry.get("stale_until", entry["expires_at"])
+        if stale_until <= time():
+            self.delete(key)
+            return None
+        return entry["expires_at"], stale_until, entry["value"]
+
+    def set(self, key: str, value: Any, expires_at: float, stale_until: float) -> None:
+        """Store a value until stale_until, replacing the file atomically."""
+        path = self.__path(key)
+        temp_path: Optional[str] = None
+        entry = {
+            "key": key,
+            "expires_at": expires_at,
+            "stale_until": stale_until,
+            "value": value,
+        }
+        try:
+            # A unique temp file per write, so threads and processes storing
+            # the same key never write into each other's file
+            with NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=self.__directory,
+                prefix=f"{os.path.basename(path)}.",
+                suffix=".tmp",
+                delete=False,
+            ) as file:
+                temp_path = file.name
+                json.dump(entry, file)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write disk cache entry for {key}: {e}")
+            if temp_path:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def delete(self, key: str) -> None:
+        """Remove a key from the cache."""
+        try:
+            os.remove(self.__path(key))
+        except OSError:
+            pass
+
+
+class TieredCache:
+    """In-memory LRU in front of an optional on-disk tier."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        directory: Optional[str] = None,
+        ttl: Optional[Dict[str, int]] = None,
+        max_stale: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.memory: MemoryCache = MemoryCache(max_entries)
+        self.disk: Optional[DiskCache] = DiskCache(directory) if directory else None
+        self.ttl: Dict[str, int] = {**DEFAULT_TTL, **(ttl or {})}
+        self.max_stale: Dict[str, int] = {**DEFAULT_MAX_STALE, **(max_stale or {})}
+        logger.info(
+            f"Initialized response cache (entries: {max_entries}, "
+            f"disk: {directory or 'disabled'})"
+        )
+
+    @classmethod
+    def from_env(cls) -> "TieredCache":
+        """Build the cache from CACHE_* environment settings."""
+        return cls(
+            max_entries=int(getenv("CACHE_MAX_ENTRIES", 1024)),
+            directory=getenv("CACHE_DIR") or None,
+            ttl=_env_seconds("CACHE_TTL", DEFAULT_TTL),
+            max_stale=_env_seconds("CACHE_MAX_STALE", DEFAULT_TTL),
+        )
+
+    def lookup(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """Get a cached (value, is_stale) pair from memory, falling back to disk."""
+        entry = self.memory.get(key)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.set(key, entry[2], entry[0], entry[1])
+        if entry is None:
+            return None
+
+        stale = entry[0] <= time()
+        logger.debug(f"Cache {'stale ' if stale else ''}hit for: {key}")
+        return entry[2], stale
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a fresh cached value, ignoring stale entries."""
+        entry = self.lookup(key)
+        if entry is None or entry[1]:
+            return None
+        return entry[0]
+
+    def set(
+        self, key: str, value: Any, endpoint: str, ttl: Optional[float] = None
+    ) -> None:
+        """Store a value for the TTL and max staleness of its endpoint.
+
+        An explicit ttl is a hard expiry: the entry is never served stale.
+        """
+        if self.ttl.get(endpoint, 0) <= 0:
+            return
+
+        if ttl is None:
+            expires_at = time() + self.ttl[endpoint]
+            stale_until = expires_at + max(self.max_stale.get(endpoint, 0), 0)
+        elif ttl > 0:
+            expires_at = stale_until = time() + ttl
+        else:
+            return
+        self.memory.set(key, value, expires_at, stale_until)
+        if self.disk is not None:
+            self.disk.set(key, value, expires_at, stale_until)
+
+    def delete(self, key: str) -> None:
+        """Remove a key from every tier."""
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
@@ -0,0 +1,177 @@
+from .backends import Selector, is_element, own_text
+from urllib.parse import urlparse
+import re
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Callbacks given every batch of extracted cards, such as the fuzzy title index
+_observers: List[Callable[[List[Dict[str, Any]]], None]] = []
+
+# series-name-episode-12-subtitle-indonesia
+_EPISODE_SLUG = re.compile(r"-episode-\d+.*$")
+
+
+def observe_cards(callback: Callable[[List[Dict[str, Any]]], None]) -> None:
+    """Register a callback that receives the cards of every extracted listing."""
+    _observers.append(callback)
+
+
+def series_slug(slug: str) -> str:
+    """Get the series slug of a card, which may link to an episode."""
+    return _EPISODE_SLUG.sub("", slug)
+
+
+class Field:
+    """A card value read from the first element matching a selector."""
+
+    def __init__(
+        self,
+        selector: str,
+        read: Callable[[Any], Any],
+        default: Any = None,
+        required: bool = False,
+    ) -> None:
+        self.selector: str = selector
+        self.read: Callable[[Any], Any] = read
+        self.default: Any = default
+        self.required: bool = required
+
+
+class CardSchema:
+    """Card fields compiled into one pass over each article's descendants.
+
+    Fields sharing a selector share its match. A field whose element is
+    missing, or whose reader returns None, gets its default; a required one
+    drops the whole card.
+    """
+
+    def __init__(self, **fields: Field) -> None:
+        self.__selectors: List[Selector] = []
+        self.__fields: List[Tuple[str, int, Field]] = []
+
+        indexes: Dict[str, int] = {}
+        for key, field in fields.items():
+            if field.selector not in indexes:
+                indexes[field.selector] = len(self.__selectors)
+                self.__selectors.append(Selector(field.selector))
+            self.__fields.append((key, indexes[field.selector], field))
+
+    def __match(self, item: Any) -> List[Any]:
+        """Find the first element matching each selector in one walk."""
+        found: List[Any] = [None] * len(self.__selectors)
+        remaining = len(found)
+        for element in item.descendants:
+            if not is_element(element):
+                continue
+            name, attrs = element.name, element.attrs
+            for index, selector in enumerate(self.__selectors):
+                if found[index] is None and selector.matches(name, attrs):
+                    found[index] = element
+                    remaining -= 1
+            if not remaining:
+                break
+        return found
+
+    def extract(self, item: Any) -> Optional[Dict[str, Any]]:
+        """Extract a card from an article, or None if a required field is missing."""
+        found = self.__match(item)
+        card: Dict[str, Any] = {}
+        for key, index, field in self.__fields:
+            element = found[index]
+            value = field.read(element) if element is not None else None
+            if value is None:
+                if field.required:
+                    logger.debug(f"Card skipped, '{field.selector}' not found")
+                    return None
+                value = field.default
+            card[key] = value
+        return card
+
+    def extract_all(self, items: Iterable[Any]) -> List[Optional[Dict[str, Any]]]:
+        """Extract the card of every article, keeping None for incomplete ones."""
+        cards = []
+        for item in items:
+            try:
+                cards.append(self.extract(item))
+            except Exception as e:
+                logger.error(f"Error extracting card data: {e}")
+                cards.append(None)
+
+        found = [card for card in cards if card]
+        for callback in _observers:
+            try:
+                callback(found)
+            except Exception as e:
+                logger.error(f"Card observer failed: {e}")
+        return cards
+
+
+def read_text(element: Any) -> str:
+    """Read the stripped text of an element."""
+    return element.text.strip()
+
+
+def read_title(element: Any) -> str:
+    """Read the title text of div.tt without the text of its child elements."""
+    text = own_text(element)
+    return text.strip() if text else "Unknown Title"
+
+
+def read_headline(element: Any) -> Optional[str]:
+    """Read the h2 headline inside div.tt."""
+    headline = element.find("h2")
+    return headline.text.strip() if headline else None
+
+
+def read_eps(element: Any) -> Optional[int]:
+    """Read the episode number of the epx badge."""
+    numbers = re.sub("[^0-9]", "", element.text.strip())
+    return int(numbers) if numbers else None
+
+
+def read_thumbnail(element: Any) -> str:
+    """Read the thumbnail URL, preferring the lazy-loaded source."""
+    return element.get("data-lazy-src") or element.get("src") or ""
+
+
+def read_slug(element: Any) -> Optional[str]:
+    """Read the slug of the card link."""
+    url = element.get("href")
+    if not url:
+        return None
+    path = urlparse(url).path
+    return path.split("/")[-2] if path.endswith("/") else path.split("/")[-1]
+
+
+# Cards of the home page sections
+HOME_CARD = CardSchema(
+    title=Field("div.tt", read_title, required=True),
+    type=Field("div.typez", read_text, "Unknown"),
+    headline=Field("div.tt", read_headline, "Unknown"),
+    eps=Field("span.epx", read_eps),
+    thumbnail=Field("img[src]", read_thumbnail, ""),
+    slug=Field("a[title]", read_slug, required=True),
+)
+
+# Cards of the anime and genre listings
+LISTING_CARD = CardSchema(
+    title=Field("div.tt", read_title, required=True),
+    type=Field("div.typez", read_text, "Unknown"),
+    headline=Field("div.tt", read_headline, "Unknown"),
+    status=Field("span.epx", read_text, "Unknown"),
+    thumbnail=Field("img[src]", read_thumbnail, ""),
+    slug=Field("a[title]", read_slug, required=True),
+)
+
+# Cards of the search results, which keep cards without a link
+SEARCH_CARD = CardSchema(
+    title=Field("div.tt", read_title, required=True),
+    type=Field("div.typez", read_text, "Unknown"),
+    headline=Field("div.tt", read_headline, "Unknown"),
+    status=Field("span.epx", read_text, "Unknown"),
+    thumbnail=Field("img[src]", read_thumbnail, ""),
+    slug=Field("a[title]", read_slug, "unknown"),
+)
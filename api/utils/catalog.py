@@ -0,0 +1,526 @@
+from dotenv import load_dotenv
+from os import getenv
+from threading import Lock, local
+from time import time
+from .listing import LISTING_PAGE_SIZE
+import json
+import re
+import sqlite3
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    slug TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    type TEXT,
+    headline TEXT,
+    badge TEXT,
+    thumbnail TEXT,
+    position INTEGER,
+    name TEXT,
+    status TEXT,
+    rating TEXT,
+    details TEXT,
+    sinopsis TEXT,
+    source TEXT,
+    episode_count INTEGER,
+    latest_episode INTEGER,
+    seen_at REAL NOT NULL,
+    crawled_at REAL
+);
+CREATE INDEX IF NOT EXISTS series_position ON series (position);
+CREATE INDEX IF NOT EXISTS series_title ON series (title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS series_status ON series (status, position);
+CREATE INDEX IF NOT EXISTS series_type ON series (type COLLATE NOCASE, position);
+
+CREATE TABLE IF NOT EXISTS genres (
+    slug TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS series_genres (
+    genre_slug TEXT NOT NULL REFERENCES genres (slug),
+    series_slug TEXT NOT NULL REFERENCES series (slug) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (genre_slug, series_slug)
+);
+CREATE INDEX IF NOT EXISTS series_genres_series ON series_genres (series_slug);
+
+CREATE TABLE IF NOT EXISTS episodes (
+    series_slug TEXT NOT NULL REFERENCES series (slug) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    slug TEXT NOT NULL,
+    episode TEXT,
+    subtitle TEXT,
+    date TEXT,
+    PRIMARY KEY (series_slug, position)
+);
+CREATE INDEX IF NOT EXISTS episodes_slug ON episodes (slug);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS series_search USING fts5 (
+    title, names, sinopsis,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+CREATE TRIGGER IF NOT EXISTS series_search_delete AFTER DELETE ON series BEGIN
+    DELETE FROM series_search WHERE rowid = old.rowid;
+END;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Listing orders the index can reproduce, by the upstream order parameter
+ORDERS: Dict[str, str] = {
+    "": "s.position",
+    "title": "s.title COLLATE NOCASE, s.position",
+    "titlereverse": "s.title COLLATE NOCASE DESC, s.position",
+}
+
+# Listing parameters the index can answer; any other sends the request upstream
+LISTING_PARAMS = {"page", "order", "status", "type", "genre[]"}
+
+# Column weights of the search ranking: title, names, synopsis
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0)
+
+_WORD = re.compile(r"\w+")
+
+
+def genre_slug(name: str) -> str:
+    """Get the slug of a genre name, the inverse of the genre list's naming."""
+    return "-".join(name.lower().split())
+
+
+def alternative_names(details: Dict[str, Any]) -> List[str]:
+    """Get the alternative titles among the info details of a series."""
+    return [
+        str(value)
+        for key, value in details.items()
+        if key.startswith("alter") or key.startswith("synonym")
+    ]
+
+
+def search_query(text: str) -> Optional[str]:
+    """Turn user input into an FTS5 query matching every word as a prefix.
+
+    A whole-word match also counts as its own phrase, so it ranks above
+    words that only start with it.
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+    return " AND ".join(f'("{word}" OR "{word}"*)' for word in words)
+
+
+def episode_number(value: Optional[str]) -> Optional[int]:
+    """Read the number of an episode label such as "12" or "Ep 12 END"."""
+    match = re.search(r"\d+", value or "")
+    return int(match.group()) if match else None
+
+
+class Catalog:
+    """SQLite index of the upstream catalog, filled by the crawler.
+
+    Each thread gets its own connection; writes are serialized so the crawler
+    workers can save series while API workers read.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.__local: local = local()
+        self.__write_lock: Lock = Lock()
+        with self.__write_lock, self.__connection() as connection:
+            connection.executescript(SCHEMA)
+            self.__backfill_search(connection)
+        logger.info(f"Initialized catalog index: {path}")
+
+    @classmethod
+    def from_env(cls) -> Optional["Catalog"]:
+        """Open the catalog at CATALOG_DB, or None when the index is not configured."""
+        path = getenv("CATALOG_DB")
+        if not path:
+            return None
+        try:
+            return cls(path)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to open catalog index {path}: {e}")
+            return None
+
+    def __connection(self) -> sqlite3.Connection:
+        """Get the connection of the calling thread."""
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.__local.connection = connection
+        return connection
+
+    def __query(self, sql: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
+        return self.__connection().execute(sql, tuple(params)).fetchall()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Get a value stored by the crawler, such as the last crawl time."""
+        rows = self.__query("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0]["value"] if rows else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Store a crawler value."""
+        with self.__write_lock, self.__connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    @property
+    def ready(self) -> bool:
+        """Whether a crawl has completed, so the index may serve requests."""
+        return self.get_meta("crawled_at") is not None
+
+    def count(self) -> int:
+        """Get the number of indexed series."""
+        return self.__query("SELECT COUNT(*) AS total FROM series")[0]["total"]
+
+    def latest_episodes(self, slugs: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Get the latest stored episode number of each crawled series among slugs."""
+        slugs = list(slugs)
+        if not slugs:
+            return {}
+        rows = self.__query(
+            f"""
+            SELECT slug, latest_episode FROM series
+            WHERE crawled_at IS NOT NULL AND slug IN ({", ".join("?" * len(slugs))})
+            """,
+            slugs,
+        )
+        return {row["slug"]: row["latest_episode"] for row in rows}
+
+    def has_episode(self, series: str, slug: str) -> bool:
+        """Whether the stored episode list of a series links to an episode slug."""
+        rows = self.__query(
+            "SELECT 1 FROM episodes WHERE series_slug = ? AND slug = ? LIMIT 1",
+            (series, slug),
+        )
+        return bool(rows)
+
+    def save_card(self, card: Dict[str, Any], position: Optional[int] = None) -> None:
+        """Store or refresh the listing card of a series."""
+        with self.__write_lock, self.__connection() as connection:
+            self.__save_card(connection, card, position)
+            self.__index_search(connection, card["slug"])
+
+    def __save_card(
+        self,
+        connection: sqlite3.Connection,
+        card: Dict[str, Any],
+        position: Optional[int],
+    ) -> None:
+        connection.execute(
+            """
+            INSERT INTO series
+                (slug, title, type, headline, badge, thumbnail, position, seen_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (slug) DO UPDATE SET
+                title = excluded.title,
+                type = excluded.type,
+                headline = excluded.headline,
+                badge = excluded.badge,
+                thumbnail = excluded.thumbnail,
+                position = COALESCE(excluded.position, series.position),
+                seen_at = excluded.seen_at
+            """,
+            (
+                card["slug"],
+                card.get("title") or "Unknown Title",
+                card.get("type"),
+                card.get("headline"),
+                card.get("status"),
+                card.get("thumbnail"),
+                position,
+                time(),
+            ),
+        )
+
+    def save_series(
+        self,
+        card: Dict[str, Any],
+        info: Optional[Dict[str, Any]],
+        position: Optional[int] = None,
+    ) -> None:
+        """Store a series from its listing card and the result of the Info extractor.
+
+        Without an info result only the card is stored, and /<slug> keeps
+        being scraped live.
+        """
+        with self.__write_lock, self.__connection() as connection:
+            self.__save_card(connection, card, position)
+            if info and info.get("result"):
+                self.__save_info(connection, card["slug"], info)
+            self.__index_search(connection, card["slug"])
+
+    def save_info(self, slug: str, info: Dict[str, Any]) -> bool:
+        """Replace the info of an indexed series, keeping its listing card.
+
+        Returns False when the series is not indexed or the info has no result.
+        """
+        if not info.get("result"):
+            return False
+        with self.__write_lock, self.__connection() as connection:
+            found = connection.execute(
+                "SELECT 1 FROM series WHERE slug = ?", (slug,)
+            ).fetchone()
+            if not found:
+                return False
+            self.__save_info(connection, slug, info)
+            self.__index_search(connection, slug)
+            return True
+
+    def __index_search(self, connection: sqlite3.Connection, slug: str) -> None:
+        """Replace the search document of a series with its stored text."""
+        row = connection.execute(
+            "SELECT rowid, title, name, details, sinopsis FROM series WHERE slug = ?",
+            (slug,),
+        ).fetchone()
+        if row is None:
+            return
+        details = json.loads(row["details"] or "{}")
+        sinopsis = json.loads(row["sinopsis"] or "null")
+        paragraphs = (
+            sinopsis.get("paragraphs", []) if isinstance(sinopsis, dict) else []
+        )
+        names = [row["name"] or "", *alternative_names(details)]
+
+        connection.execute("DELETE FROM series_search WHERE rowid = ?", (row["rowid"],))
+        connection.execute(
+            "INSERT INTO series_search (rowid, title, names, sinopsis) VALUES (?, ?, ?, ?)",
+            (row["rowid"], row["title"], "\n".join(names), "\n".join(paragraphs)),
+        )
+
+    def __backfill_search(self, connection: sqlite3.Connection) -> None:
+        """Index the series stored before the search index existed."""
+        missing = connection.execute("""
+            SELECT slug FROM series
+            WHERE rowid NOT IN (SELECT rowid FROM series_search)
+            """).fetchall()
+        for row in missing:
+            self.__index_search(connection, row["slug"])
+        if missing:
+            logger.info(f"Indexed {len(missing)} series for search")
+
+    def __save_info(
+        self, connection: sqlite3.Connection, slug: str, info: Dict[str, Any]
+    ) -> None:
+        """Store the result of the Info extractor for a series row."""
+        result = dict(info["result"])
+        episodes = result.pop("episode", None) or []
+        genres = result.pop("genre", None) or []
+        named = {key: result.pop(key, None) for key in ("name", "rating")}
+        sinopsis = result.pop("sinopsis", None)
+        thumbnail = result.pop("thumbnail", None)
+        numbers = [episode_number(row.get("episode")) for row in episodes]
+        numbers = [number for number in numbers if number is not None]
+
+        connection.execute(
+            """
+            UPDATE series SET
+                name = ?, status = ?, rating = ?, details = ?, sinopsis = ?,
+                thumbnail = COALESCE(?, thumbnail), source = ?,
+                episode_count = ?, latest_episode = ?, crawled_at = ?
+            WHERE slug = ?
+            """,
+            (
+                named["name"],
+                str(result.get("status") or "").lower() or None,
+                named["rating"],
+                json.dumps(result),
+                json.dumps(sinopsis),
+                thumbnail,
+                info.get("source"),
+                len(episodes),
+                max(numbers) if numbers else None,
+                time(),
+                slug,
+            ),
+        )
+
+        connection.execute("DELETE FROM series_genres WHERE series_slug = ?", (slug,))
+        for name in genres:
+            connection.execute(
+                "INSERT OR IGNORE INTO genres (slug, name) VALUES (?, ?)",
+                (genre_slug(name), name),
+            )
+            connection.execute(
+                """
+                INSERT OR IGNORE INTO series_genres (genre_slug, series_slug, position)
+                SELECT ?, slug, COALESCE(position, 0) FROM series WHERE slug = ?
+                """,
+                (genre_slug(name), slug),
+            )
+
+        connection.execute("DELETE FROM episodes WHERE series_slug = ?", (slug,))
+        connection.executemany(
+            """
+            INSERT INTO episodes
+                (slug, series_slug, position, episode, subtitle, date)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    row["slug"],
+                    slug,
+                    index,
+                    row.get("episode"),
+                    row.get("subtitle"),
+                    row.get("date"),
+                )
+                for index, row in enumerate(episodes)
+            ],
+        )
+
+    def prune(self, seen_before: float) -> int:
+        """Remove series no longer listed upstream since a completed crawl began."""
+        with self.__write_lock, self.__connection() as connection:
+            cursor = connection.execute(
+                "DELETE FROM series WHERE seen_at < ?", (seen_before,)
+            )
+            return cursor.rowcount
+
+    def get_info(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Get the Info result of a crawled series, or None if it is not indexed."""
+        rows = self.__query(
+            "SELECT * FROM series WHERE slug = ? AND crawled_at IS NOT NULL", (slug,)
+        )
+        if not rows:
+            return None
+
+        series = rows[0]
+        genres = self.__query(
+            """
+            SELECT g.name FROM series_genres sg JOIN genres g ON g.slug = sg.genre_slug
+            WHERE sg.series_slug = ? ORDER BY sg.rowid
+            """,
+            (slug,),
+        )
+        episodes = self.__query(
+            """
+            SELECT slug, subtitle, date, episode FROM episodes
+            WHERE series_slug = ? ORDER BY position
+            """,
+            (slug,),
+        )
+        thumbnail = series["thumbnail"]
+        result = {
+            **json.loads(series["details"] or "{}"),
+            "name": series["name"],
+            "thumbnail": thumbnail,
+            "genre": [row["name"] for row in genres],
+            "rating": series["rating"],
+            "sinopsis": json.loads(series["sinopsis"] or "null"),
+            "episode": [
+                {
+                    "slug": path,
+                    "subtitle": subtitle,
+                    "date": date,
+                    "episode": episode,
+                    "thumbnail": thumbnail,
+                }
+                for path, subtitle, date, episode in episodes
+            ],
+        }
+        return {"result": result, "source": series["source"]}
+
+    def list_series(
+        self, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Get one page of listing cards for /anime filter parameters.
+
+        Returns None for parameters the index cannot answer, or a page with no
+        indexed series, so the request goes upstream instead.
+        """
+        params = {key: value for key, value in (params or {}).items() if value}
+        if set(params) - LISTING_PARAMS:
+            return None
+        order = ORDERS.get(str(params.get("order", "")).lower())
+        page = str(params.get("page", "1"))
+        genre = params.get("genre[]")
+        if order is None or not page.isdigit() or isinstance(genre, list):
+            return None
+
+        sql = "SELECT s.* FROM series s"
+        where: List[str] = ["s.position IS NOT NULL"]
+        values: List[Any] = []
+        if genre:
+            sql += " JOIN series_genres sg ON sg.series_slug = s.slug"
+            where.append("sg.genre_slug = ?")
+            values.append(genre)
+        if params.get("status"):
+            where.append("s.status = ?")
+            values.append(str(params["status"]).lower())
+        if params.get("type"):
+            where.append("s.type = ? COLLATE NOCASE")
+            values.append(params["type"])
+
+        sql += f" WHERE {' AND '.join(where)} ORDER BY {order} LIMIT ? OFFSET ?"
+        values += [LISTING_PAGE_SIZE, (max(int(page), 1) - 1) * LISTING_PAGE_SIZE]
+        rows = self.__query(sql, values)
+        if not rows:
+            return None
+        return [self.__card(row) for row in rows]
+
+    def __card(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Build the listing card of a series row."""
+        return {
+            "title": row["title"],
+            "type": row["type"],
+            "headline": row["headline"],
+            "status": row["badge"],
+            "thumbnail": row["thumbnail"],
+            "slug": row["slug"],
+        }
+
+    def iter_titles(self) -> Iterator[Tuple[Dict[str, Any], List[str]]]:
+        """Yield the card of every indexed series with its name and alternative titles."""
+        for row in self.__connection().execute("SELECT * FROM series"):
+            names = [row["name"]] if row["name"] else []
+            for value in alternative_names(json.loads(row["details"] or "{}")):
+                names.extend(name.strip() for name in value.split(",") if name.strip())
+            yield self.__card(row), names
+
+    def search(
+        self, query: str, page: int = 1, size: int = LISTING_PAGE_SIZE
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """Get one page of ranked search cards and the number of matches.
+
+        Every word matches as a prefix of a title, alternative name or
+        synopsis word, titles weighing most. Returns None without matches on
+        the page, so the request goes upstream instead.
+        """
+        match = search_query(query)
+        if match is None:
+            return None
+        total = self.__query(
+            "SELECT COUNT(*) AS total FROM series_search WHERE series_search MATCH ?",
+            (match,),
+        )[0]["total"]
+        rows = self.__query(
+            f"""
+            SELECT s.* FROM series_search JOIN series s ON s.rowid = series_search.rowid
+            WHERE series_search MATCH ?
+            ORDER BY bm25(series_search, {", ".join(map(str, SEARCH_WEIGHTS))}),
+                s.position
+            LIMIT ? OFFSET ?
+            """,
+            (match, size, (max(page, 1) - 1) * size),
+        )
+        if not rows:
+            return None
+        return [self.__card(row) for row in rows], total
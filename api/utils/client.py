@@ -0,0 +1,136 @@
+from dotenv import load_dotenv
+from os import getenv
+from threading import Lock
+from weakref import WeakKeyDictionary
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import httpx
+import logging
+from typing import Optional
+
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_session: Optional[Session] = None
+_session_lock = Lock()
+
+# httpx clients are bound to the event loop that created them
+_async_clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    WeakKeyDictionary()
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment."""
+    try:
+        return int(getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a decimal setting from the environment."""
+    try:
+        return float(getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+TIMEOUT: float = _env_float("HTTP_TIMEOUT", 15)
+
+
+def _build_session() -> Session:
+    """Build a keep-alive session with a bounded connection pool."""
+    pool_connections = _env_int("HTTP_POOL_CONNECTIONS", 10)
+    pool_maxsize = _env_int("HTTP_POOL_MAXSIZE", 32)
+    retries = _env_int("HTTP_RETRIES", 2)
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=True,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=("GET", "HEAD"),
+        ),
+    )
+
+    session = Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+
+    logger.info(
+        f"Initialized shared HTTP session (hosts: {pool_connections}, "
+        f"connections per host: {pool_maxsize}, retries: {retries})"
+    )
+    return session
+
+
+def get_session() -> Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close_session() -> None:
+    """Close the shared session and drop its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+            logger.info("Closed shared HTTP session")
+
+
+def _build_async_client() -> httpx.AsyncClient:
+    """Build an async client able to multiplex many in-flight requests."""
+    max_connections = _env_int("HTTP_ASYNC_MAX_CONNECTIONS", 1000)
+    max_keepalive = _env_int("HTTP_ASYNC_MAX_KEEPALIVE", 100)
+    retries = _env_int("HTTP_RETRIES", 2)
+
+    client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+        ),
+        timeout=TIMEOUT,
+        transport=httpx.AsyncHTTPTransport(retries=retries),
+        follow_redirects=True,
+    )
+
+    logger.info(
+        f"Initialized async HTTP client (connections: {max_connections}, "
+        f"keep-alive: {max_keepalive}, retries: {retries})"
+    )
+    return client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the async client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _build_async_client()
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_client() -> None:
+    """Close the async client of the running event loop."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+        logger.info("Closed async HTTP client")
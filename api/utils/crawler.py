@@ -0,0 +1,164 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from dotenv import load_dotenv
+from os import getenv
+from threading import Lock
+from time import monotonic, sleep, time
+from .anime import Anime
+from .catalog import Catalog
+from .info import Info
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set, TypeVar
+
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Info pages fetched at the same time while crawling
+CRAWL_WORKERS: int = int(getenv("CRAWL_WORKERS", 4))
+
+# Least seconds between two upstream requests of a crawl
+CRAWL_DELAY: float = float(getenv("CRAWL_DELAY", 0.5))
+
+# Most /anime listing pages one crawl walks
+CRAWL_MAX_PAGES: int = int(getenv("CRAWL_MAX_PAGES", 500))
+
+T = TypeVar("T")
+
+
+class Throttle:
+    """Spaces calls at least interval seconds apart across threads."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval: float = interval
+        self.__next: float = 0.0
+        self.__lock: Lock = Lock()
+
+    def run(self, fn: Callable[[], T]) -> T:
+        """Wait for the next free slot, then call fn."""
+        with self.__lock:
+            now = monotonic()
+            start = max(now, self.__next)
+            self.__next = start + self.interval
+        if start > now:
+            sleep(start - now)
+        return fn()
+
+
+class Crawler:
+    """Walks the /anime listing and stores every series with its info page."""
+
+    def __init__(
+        self,
+        catalog: Catalog,
+        workers: int = CRAWL_WORKERS,
+        delay: float = CRAWL_DELAY,
+        max_pages: int = CRAWL_MAX_PAGES,
+    ) -> None:
+        self.catalog: Catalog = catalog
+        self.workers: int = workers
+        self.max_pages: int = max_pages
+        self.throttle: Throttle = Throttle(delay)
+        logger.info(
+            f"Initialized crawler (workers: {workers}, delay: {delay}s, "
+            f"max pages: {max_pages})"
+        )
+
+    def get_listing(self, page: int) -> Dict[str, Any]:
+        """Fetch one /anime listing page."""
+        params = {"page": str(page)} if page > 1 else {}
+        return self.throttle.run(lambda: Anime().get_details(params=params))
+
+    def get_info(self, slug: str) -> Dict[str, Any]:
+        """Fetch the info page of a series."""
+        return self.throttle.run(lambda: Info(slug).to_json())
+
+    def save_series(self, card: Dict[str, Any], position: int) -> bool:
+        """Fetch the info page of a listed series and store both."""
+        try:
+            info = self.get_info(card["slug"])
+            if info.get("error"):
+                logger.warning(f"Info of {card['slug']} failed: {info['error']}")
+                self.catalog.save_series(card, None, position)
+                return False
+            self.catalog.save_series(card, info, position)
+            return True
+        except Exception as e:
+            logger.error(f"Error crawling {card['slug']}: {e}")
+            return False
+
+    def crawl(self) -> Dict[str, Any]:
+        """Crawl the whole catalog into the index and return crawl statistics."""
+        started = time()
+        seen: Set[str] = set()
+        jobs: List[Future] = []
+        pages = 0
+        finished = False
+        error: Optional[str] = None
+
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="crawler"
+        ) as executor:
+            for page in range(1, self.max_pages + 1):
+                listing = self.get_listing(page)
+                if listing.get("error"):
+                    error = f"Listing page {page} failed: {listing['error']}"
+                    logger.warning(error)
+                    break
+
+                cards = [
+                    card for card in listing["results"] if card["slug"] not in seen
+                ]
+                if not cards:
+                    # Past the last page upstream repeats or empties the listing
+                    finished = True
+                    break
+
+                pages = page
+                for card in cards:
+                    seen.add(card["slug"])
+                    jobs.append(executor.submit(self.save_series, card, len(seen)))
+                logger.info(f"Listing page {page}: {len(cards)} new series")
+
+            saved = sum(1 for job in jobs if job.result())
+
+        stats: Dict[str, Any] = {
+            "pages": pages,
+            "series": len(seen),
+            "saved": saved,
+            "failed": len(seen) - saved,
+            "complete": finished,
+            "seconds": round(time() - started, 1),
+        }
+        if error:
+            stats["error"] = error
+        if finished:
+            # Only a walk that reached the end knows which series are gone
+            stats["removed"] = self.catalog.prune(started)
+        if saved or finished:
+            # Opens the index to requests; a crawl that saved nothing keeps it shut
+            self.catalog.set_meta("crawled_at", str(time()))
+        else:
+            logger.warning("Crawl saved no series, crawl time not recorded")
+        logger.info(f"Crawl finished: {stats}")
+        return stats
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Crawl the upstream catalog into SQLite")
+    parser.add_argument("--db", default=getenv("CATALOG_DB") or "catalog.db")
+    parser.add_argument("--workers", type=int, default=CRAWL_WORKERS)
+    parser.add_argument("--delay", type=float, default=CRAWL_DELAY)
+    parser.add_argument("--max-pages", type=int, default=CRAWL_MAX_PAGES)
+    args = parser.parse_args()
+
+    # Configure logging for the crawl
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    crawler = Crawler(Catalog(args.db), args.workers, args.delay, args.max_pages)
+    print(crawler.crawl())
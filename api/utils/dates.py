@@ -0,0 +1,69 @@
+from dotenv import load_dotenv
+from functools import lru_cache
+from os import getenv
+import re
+import logging
+from typing import Dict, Optional
+
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_ENGLISH = (
+    "january february march april may june july "
+    "august september october november december"
+).split()
+_INDONESIAN = (
+    "januari februari maret april mei juni juli "
+    "agustus september oktober november desember"
+).split()
+
+# Month names and their three-letter abbreviations, lowercased
+MONTHS: Dict[str, int] = {}
+for _names in (_ENGLISH, _INDONESIAN):
+    for _number, _name in enumerate(_names, 1):
+        MONTHS[_name] = _number
+        MONTHS.setdefault(_name[:3], _number)
+
+_DAYS_IN_MONTH = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# "July 31, 2023", "July 31 2023" or "31 July 2023"
+_DATE = re.compile(
+    r"^(?:(?P<month>[A-Za-z]+)\.?\s+(?P<day>\d{1,2}),?"
+    r"|(?P<day2>\d{1,2})\s+(?P<month2>[A-Za-z]+)\.?,?)\s+(?P<year>\d{4})$"
+)
+
+
+def _is_valid(year: int, month: int, day: int) -> bool:
+    if not 1 <= day <= _DAYS_IN_MONTH[month - 1]:
+        return False
+    if month == 2 and day == 29:
+        return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    return True
+
+
+@lru_cache(maxsize=int(getenv("DATE_CACHE_ENTRIES", 4096)))
+def _normalize(text: str) -> Optional[str]:
+    match = _DATE.match(text)
+    if not match:
+        return None
+
+    month = MONTHS.get((match["month"] or match["month2"]).lower())
+    day = int(match["day"] or match["day2"])
+    year = int(match["year"])
+    if month is None or not _is_valid(year, month, day):
+        return None
+    return f"{month}/{day}/{year}"
+
+
+def normalize_date(date_str: str) -> str:
+    """Format an upstream date as M/D/YYYY, or return it unchanged if unknown.
+
+    Results are memoized, since release dates repeat across rows and pages.
+    """
+    result = _normalize(date_str.strip())
+    if result is None:
+        logger.debug(f"Unrecognized date: '{date_str}'")
+        return date_str
+    return result
@@ -1,18 +1,52 @@
 from .parsing import Parsing
-from urllib.parse import urlparse, urlencode, parse_qsl
+from .backends import ParseProfile
+from .rows import RowSpec, iter_rows
+from .dates import normalize_date
+from .player import get_script_mirrors
+from urllib.parse import urlparse
 from dotenv import load_dotenv
-from base64 import b64decode
-from time import strptime, struct_time
 import re
 import logging
-from typing import Dict, List, Optional, Any, Union
-from bs4 import BeautifulSoup, Tag
+from typing import Dict, Iterator, List, Optional, Any, Union
+from bs4 import BeautifulSoup
 
 load_dotenv()
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Regions of the episode page read by the extractor, including the
+# script that writes the mirror list; the episode list is streamed from the
+# raw HTML instead
+PROFILE = ParseProfile(
+    "div.ts-breadcrumb",
+    "script",
+    'select[name="mirror"]',
+    "div.thumbnail",
+    "div.thumb",
+    "div.infox",
+    "span.year",
+    "div.mindes",
+)
+
+# Error of an episode page that could not be fetched
+FETCH_ERROR = "Failed to fetch data"
+
+# Rows of the episode list
+EPISODE_ROWS = RowSpec(
+    "div.episodelist ul",
+    "li",
+    {
+        "image": ("img.ts-post-image", "exists"),
+        "name": ("img.ts-post-image", "@title"),
+        "lazy_src": ("img.ts-post-image", "@data-lazy-src"),
+        "src": ("img.ts-post-image", "@src"),
+        "href": ("a", "@href"),
+        "playinfo": ("div.playinfo", "exists"),
+        "headline": ("div.playinfo span", "strings"),
+    },
+)
+
 
 class Episode(Parsing):
     def __init__(self, slug: str) -> None:
@@ -20,13 +54,9 @@ class Episode(Parsing):
         self.slug: str = slug
         logger.info(f"Initialized Episode scraper for slug: {slug}")
 
-    def __get_info(self) -> Optional[BeautifulSoup]:
-        """Get parsed HTML content for the episode page."""
-        try:
-            return self.get_parsed_html(self.slug)
-        except Exception as e:
-            logger.error(f"Failed to get episode info for slug {self.slug}: {e}")
-            return None
+    def upstream_url(self) -> str:
+        """Get the normalized upstream URL of the episode page."""
+        return self.get_upstream_url(self.slug)
 
     def __get_name(self, content: BeautifulSoup) -> str:
         """Extract episode name from the content."""
@@ -207,155 +237,74 @@ class Episode(Parsing):
             logger.error(f"Error extracting synopsis: {e}")
             return ""
 
-    def __parse_date(self, date_str: str) -> str:
-        """Parse and format date string safely."""
-        try:
-            # Expected format: "July 31, 2023"
-            clean_date = date_str.replace(",", "").strip()
-            parsed_date = strptime(clean_date, "%B %d %Y")
-            result = f"{parsed_date.tm_mon}/{parsed_date.tm_mday}/{parsed_date.tm_year}"
-            logger.debug(f"Parsed date '{date_str}' to '{result}'")
-            return result
-        except Exception as e:
-            logger.error(f"Error parsing date '{date_str}': {e}")
-            return date_str
+    def iter_episodes(self, html: str) -> Iterator[Dict[str, Union[str, None]]]:
+        """Lazily extract the episode list from the raw page HTML."""
+        for i, row in enumerate(iter_rows(html, EPISODE_ROWS)):
+            try:
+                if not row["image"]:
+                    logger.warning(f"Episode {i+1}: Image element not found, skipping")
+                    continue
 
-    def __get_episodes(self, data: BeautifulSoup) -> List[Dict[str, Union[str, None]]]:
-        """Extract episodes list from the content."""
-        result = []
-        try:
-            episodelist_div = data.find("div", {"class": "episodelist"})
-            if not episodelist_div:
-                logger.warning("Episode list section not found")
-                return result
+                name = row["name"] if row["name"] is not None else "Unknown"
+                thumbnail = row["lazy_src"] or row["src"] or ""
 
-            ul_element = episodelist_div.find("ul")
-            if not ul_element:
-                logger.warning("Episode list UL element not found")
-                return result
+                if not row["href"]:
+                    logger.warning(f"Episode {i+1}: Link not found, skipping")
+                    continue
 
-            episodes = ul_element.find_all("li")
-            logger.info(f"Found {len(episodes)} episodes")
+                slug = urlparse(row["href"]).path.strip("/")
 
-            for i, item in enumerate(episodes):
-                try:
-                    # Extract image info
-                    img_element = item.find("img", {"class": "ts-post-image"})
-                    if not img_element:
-                        logger.warning(
-                            f"Episode {i+1}: Image element not found, skipping"
-                        )
-                        continue
+                if not row["playinfo"]:
+                    logger.warning(f"Episode {i+1}: Playinfo not found, skipping")
+                    continue
 
-                    name = img_element.get("title", "Unknown")
-                    thumbnail = (
-                        img_element.get("data-lazy-src") or img_element.get("src") or ""
+                episode_headline = row["headline"]
+                eps = "Unknown"
+                subtitle = None
+                date = ""
+                if episode_headline is None:
+                    logger.warning(f"Episode {i+1}: Span element not found")
+                elif episode_headline.startswith("Ep"):
+                    parts = episode_headline.split(" - ")
+                    eps = re.sub("[^0-9]", "", parts[0]) if parts else "Unknown"
+                    subtitle = parts[1].strip() if len(parts) > 2 else None
+                    date_raw = (
+                        parts[2].strip()
+                        if len(parts) > 2
+                        else (parts[1].strip() if len(parts) > 1 else "")
                     )
+                    date = normalize_date(date_raw) if date_raw else ""
+
+                yield {
+                    "name": name,
+                    "thumbnail": thumbnail,
+                    "slug": slug,
+                    "subtitle": subtitle,
+                    "date": date,
+                    "episode": eps,
+                }
+            except Exception as episode_error:
+                logger.error(f"Error processing episode {i+1}: {episode_error}")
+                continue
 
-                    # Extract slug
-                    link = item.find("a")
-                    if not link or not link.get("href"):
-                        logger.warning(f"Episode {i+1}: Link not found, skipping")
-                        continue
-
-                    slug = urlparse(link["href"]).path.strip("/")
-
-                    # Extract playinfo
-                    playinfo_div = item.find("div", {"class": "playinfo"})
-                    if not playinfo_div:
-                        logger.warning(f"Episode {i+1}: Playinfo not found, skipping")
-                        continue
-
-                    span_element = playinfo_div.find("span")
-                    if span_element:
-                        episode_headline = span_element.get_text(strip=True)
-
-                        if episode_headline.startswith("Ep"):
-                            parts = episode_headline.split(" - ")
-                            eps = re.sub("[^0-9]", "", parts[0]) if parts else "Unknown"
-                            subtitle = parts[1].strip() if len(parts) > 2 else None
-                            date_raw = (
-                                parts[2].strip()
-                                if len(parts) > 2
-                                else (parts[1].strip() if len(parts) > 1 else "")
-                            )
-                            date = self.__parse_date(date_raw) if date_raw else ""
-                        else:
-                            eps = "Unknown"
-                            subtitle = None
-                            date = ""
-                    else:
-                        eps = "Unknown"
-                        subtitle = None
-                        date = ""
-                        logger.warning(f"Episode {i+1}: Span element not found")
-
-                    episode_data = {
-                        "name": name,
-                        "thumbnail": thumbnail,
-                        "slug": slug,
-                        "subtitle": subtitle,
-                        "date": date,
-                        "episode": eps,
-                    }
-
-                    result.append(episode_data)
-                    logger.debug(f"Successfully processed episode {i+1}: {slug}")
-
-                except Exception as episode_error:
-                    logger.error(f"Error processing episode {i+1}: {episode_error}")
-                    continue
-
+    def __get_episodes(self, html: str) -> List[Dict[str, Union[str, None]]]:
+        """Extract episodes list from the raw page HTML."""
+        try:
+            result = list(self.iter_episodes(html))
             logger.info(f"Successfully processed {len(result)} episodes")
             return result
-
         except Exception as e:
             logger.error(f"Error extracting episodes: {e}")
-            return result
-
-    def __execute_javascript_code(self, js_code: str) -> str:
-        """Execute and decode JavaScript code safely."""
-        try:
-            # Extract variable values and dynamic value from JavaScript code
-            matches = re.search(
-                r"var (\w+) = (\[[^\]]+\]);.*?\)\s*-\s*(\d+)", js_code, re.DOTALL
-            )
-
-            if matches:
-                variable_values = eval(
-                    matches.group(2)
-                )  # This is potentially unsafe but matches original
-                dynamic_value = int(matches.group(3))
-
-                # Decode and transform values
-                result = "".join(
-                    [
-                        chr(
-                            int(
-                                "".join(
-                                    filter(
-                                        str.isdigit, b64decode(value).decode("utf-8")
-                                    )
-                                )
-                            )
-                            - dynamic_value
-                        )
-                        for value in variable_values
-                    ]
-                )
-                logger.debug("Successfully executed JavaScript code")
-                return result
-            else:
-                logger.warning("No matches found in JavaScript code")
-                return ""
-        except Exception as e:
-            logger.error(f"Error executing JavaScript code: {e}")
-            return ""
+            return []
 
     def __get_video(
         self, data: BeautifulSoup
-    ) -> Union[List[Dict[str, str]], Dict[str, str]]:
-        """Extract video sources from the content."""
+    ) -> Union[List[Dict[str, Any]], Dict[str, str]]:
+        """Extract the mirrors of the player as encoded handles.
+
+        Handles are decoded on request with resolve_mirror, since most
+        clients only play one mirror.
+        """
         try:
             scripts = data.find_all("script")
             script_elements = [
@@ -364,72 +313,77 @@ class Episode(Parsing):
                 if "document.write(decodeURIComponent(escape(" in script.text
             ]
 
+            mirrors = None
             if script_elements:
-                script_text = script_elements[0].text
-                decoded_data = self.__execute_javascript_code(script_text)
-                if decoded_data:
-                    parsed_data = self.parsing(decoded_data)
-                    if parsed_data:
-                        data = parsed_data
-
-            video_select = data.find("select", {"name": "mirror"})
-            if video_select:
-                options = video_select.find_all("option")
-                videos = []
-                for option in options:
-                    value = option.get("value")
-                    text = option.text
-                    if value:
-                        video_info = self.__bs64(value, text)
-                        if video_info:
-                            videos.append(video_info)
-
-                logger.info(f"Found {len(videos)} video sources")
-                return videos
-            else:
-                logger.warning("Video select element not found")
-                return {"error": "Video not found"}
-
-        except Exception as e:
-            logger.error(f"Error extracting video sources: {e}")
-            return {"error": f"Video extraction failed: {str(e)}"}
-
-    def __bs64(self, data: str, name: str = "") -> Optional[Dict[str, str]]:
-        """Decode base64 video data safely."""
-        try:
-            if not data:
-                return None
-
-            decoded = b64decode(data).decode("utf-8")
-            parsed_content = self.parsing(decoded)
+                mirrors = get_script_mirrors(script_elements[0].text)
+
+            if mirrors is None:
+                video_select = data.find("select", {"name": "mirror"})
+                if not video_select:
+                    logger.warning("Video select element not found")
+                    return {"error": "Video not found"}
+                mirrors = [
+                    (option.get("value"), option.text)
+                    for option in video_select.find_all("option")
+                ]
 
-            if parsed_content:
-                iframe = parsed_content.find("iframe")
-                if iframe and iframe.get("src"):
-                    return {
-                        "name": name.strip(),
-                        "url": iframe["src"],
-                    }
+            handles = [(value, text) for value, text in mirrors if value]
+            videos = [
+                {"mirror": index, "name": text.strip(), "handle": value}
+                for index, (value, text) in enumerate(handles)
+            ]
 
-            logger.warning(f"Failed to decode video data for: {name}")
-            return None
+            logger.info(f"Found {len(videos)} video sources")
+            return videos
 
         except Exception as e:
-            logger.error(f"Error decoding base64 video data for {name}: {e}")
-            return None
+            logger.error(f"Error extracting video sources: {e}")
+            return {"error": f"Video extraction failed: {str(e)}"}
 
     def to_json(self) -> Dict[str, Any]:
         """Convert scraped data to JSON format."""
-        try:
-            logger.info(f"Starting to scrape episode data for slug: {self.slug}")
+        logger.info(f"Starting to scrape episode data for slug: {self.slug}")
+        return self.get_page_result(
+            "episode", self.slug, self.__to_json, profile=PROFILE
+        )
+
+    async def to_json_async(self) -> Dict[str, Any]:
+        """Convert scraped data to JSON format using the async fetch engine."""
+        logger.info(f"Starting to scrape episode data for slug: {self.slug}")
+        return await self.get_page_result_async(
+            "episode", self.slug, self.__to_json, profile=PROFILE
+        )
+
+    def get_players(self) -> Optional[List[Dict[str, Any]]]:
+        """Get the mirror handles of the episode player.
+
+        None when the page could not be fetched, and an empty list when it
+        was fetched but the player was not found.
+        """
+        return self.__players(self.to_json())
+
+    async def get_players_async(self) -> Optional[List[Dict[str, Any]]]:
+        """Get the mirror handles of the episode player without blocking."""
+        return self.__players(await self.to_json_async())
+
+    def __players(self, page: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Get the mirror handles out of an extracted episode page."""
+        if page.get("error") == FETCH_ERROR:
+            return None
+        players = (page.get("result") or {}).get("players")
+        return players if isinstance(players, list) else []
 
-            data = self.__get_info()
-            if not data:
+    def __to_json(
+        self, html: Optional[str], data: Optional[BeautifulSoup]
+    ) -> Dict[str, Any]:
+        """Extract the episode information from the parsed page."""
+        try:
+            if not html or not data:
                 logger.error("Failed to get initial data")
                 return {
                     "result": None,
                     "source": self.history_url,
-                    "error": "Failed to fetch data",
+                    "error": FETCH_ERROR,
                 }
 
             content = data.find("div", {"class": "infox"})
@@ -449,7 +403,7 @@ class Episode(Parsing):
             info_details = self.__get_info_details(content)
             rating = self.__get_rating(content)
             sinopsis = self.__get_sinopsis(data)
-            episodes = self.__get_episodes(data)
+            episodes = self.__get_episodes(html)
             root = self.__get_root(data)
 
             # Combine all information
@@ -0,0 +1,165 @@
+from dotenv import load_dotenv
+from os import getenv
+from collections import Counter
+from threading import Lock
+from unicodedata import combining, normalize
+from .cards import observe_cards, series_slug
+import math
+import re
+import logging
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Share of the query's trigrams a title must contain to match
+FUZZY_MIN_SIMILARITY: float = float(getenv("FUZZY_MIN_SIMILARITY", 0.45))
+
+# Results of one fuzzy lookup
+FUZZY_LIMIT: int = int(getenv("FUZZY_LIMIT", 20))
+
+# Titles kept by the index with their series; later titles are ignored
+FUZZY_MAX_TITLES: int = int(getenv("FUZZY_MAX_TITLES", 100000))
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Lowercase text and drop accents and punctuation."""
+    decomposed = normalize("NFKD", text.lower())
+    plain = "".join(char for char in decomposed if not combining(char))
+    return _NON_WORD.sub(" ", plain).strip()
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Get the trigrams of every word, padded so word edges count too."""
+    grams = set()
+    for word in fold(text).split():
+        padded = f" {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """In-memory trigram index of series titles for typo-tolerant lookups.
+
+    A title matches when it contains at least FUZZY_MIN_SIMILARITY of the
+    query's trigrams; the postings of the query's trigrams are counted per
+    title, so titles sharing none of them are never looked at.
+    """
+
+    def __init__(self, max_titles: int = FUZZY_MAX_TITLES) -> None:
+        self.max_titles: int = max_titles
+        self.__titles: Dict[Tuple[str, str], int] = {}
+        self.__entries: List[Tuple[str, int]] = []
+        self.__postings: Dict[str, List[int]] = {}
+        self.__cards: Dict[str, Dict[str, Any]] = {}
+        self.__lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def add(self, card: Dict[str, Any], names: Iterable[str] = ()) -> None:
+        """Index a series card under its title and any other names."""
+        slug = series_slug(card.get("slug") or "")
+        if not slug or slug == "unknown":
+            return
+
+        with self.__lock:
+            added = False
+            for title in [card.get("title") or "", *names]:
+                key = fold(title)
+                if not key or (key, slug) in self.__titles:
+                    continue
+                if len(self.__entries) >= self.max_titles:
+                    break
+                grams = trigrams(key)
+                entry = len(self.__entries)
+                self.__titles[(key, slug)] = entry
+                self.__entries.append((slug, len(grams)))
+                for gram in grams:
+                    self.__postings.setdefault(gram, []).append(entry)
+                added = True
+
+            # Only series with an indexed title keep a card, so the cards are
+            # bounded by max_titles too. Listing cards describe the series;
+            # home cards describe an episode
+            if slug in self.__cards:
+                if "eps" not in card:
+                    self.__cards[slug] = {**card, "slug": slug}
+            elif added:
+                self.__cards[slug] = {**card, "slug": slug}
+
+    def add_cards(self, cards: List[Dict[str, Any]]) -> None:
+        """Index a batch of scraped cards."""
+        for card in cards:
+            self.add(card)
+
+    def lookup(
+        self,
+        query: str,
+        limit: int = FUZZY_LIMIT,
+        min_similarity: float = FUZZY_MIN_SIMILARITY,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Get the best matching series cards with their similarity, best first."""
+        grams = trigrams(query)
+        if not grams:
+            return []
+
+        with self.__lock:
+            needed = max(math.ceil(len(grams) * min_similarity), 1)
+            shared: Counter = Counter()
+            for gram in grams:
+                shared.update(self.__postings.get(gram, ()))
+
+            best: Dict[str, float] = {}
+            for entry, count in shared.items():
+                if count < needed:
+                    continue
+                slug, size = self.__entries[entry]
+                # Coverage of the query, then closeness of the whole title
+                score = count / len(grams) + count / (len(grams) + size - count) / 10
+                if score > best.get(slug, 0.0):
+                    best[slug] = score
+
+            ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+            return [
+                (round(score, 3), self.__cards[slug]) for slug, score in ranked[:limit]
+            ]
+
+    def clear(self) -> None:
+        """Remove every title from the index."""
+        with self.__lock:
+            self.__titles.clear()
+            self.__entries.clear()
+            self.__postings.clear()
+            self.__cards.clear()
+
+
+# Titles of every series card the scrapers extract
+TITLE_INDEX: TrigramIndex = TrigramIndex()
+observe_cards(TITLE_INDEX.add_cards)
+
+
+def seed_titles(
+    index: TrigramIndex, titles: Iterable[Tuple[Dict[str, Any], List[str]]]
+) -> int:
+    """Index (card, names) pairs, such as the series of the catalog index."""
+    count = 0
+    for card, names in titles:
+        index.add(card, names)
+        count += 1
+    logger.info(f"Seeded title index with {count} series")
+    return count
+
+
+def fuzzy_result(
+    query: str, matches: List[Tuple[float, Dict[str, Any]]]
+) -> Optional[Dict[str, Any]]:
+    """Build a search result from fuzzy matches, or None without matches."""
+    if not matches:
+        return None
+    cards = [{**card, "score": score} for score, card in matches]
+    return {"results": cards, "query": query, "total": len(cards), "fuzzy": True}
@@ -1,13 +1,16 @@
 from .parsing import Parsing
-from urllib.parse import urlparse
-import re
+from .backends import ParseProfile
+from .cards import HOME_CARD
 import logging
 from typing import Dict, List, Optional, Any, Union
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Regions of the home page read by the extractor
+PROFILE = ParseProfile("div.bbnofrm")
+
 
 class Home(Parsing):
     def __init__(self, page: int = 1) -> None:
@@ -15,74 +18,6 @@ class Home(Parsing):
         self.__page: int = page
         logger.info(f"Initialized Home scraper for page: {page}")
 
-    def __get_card(self, item: Tag) -> Optional[Dict[str, Union[str, int, None]]]:
-        """Extract card information from a home page item."""
-        try:
-            # Extract title
-            title_div = item.find("div", {"class": "tt"})
-            if not title_div:
-                logger.warning("Title div not found in home item")
-                return None
-
-            # Extract headline
-            headline_element = title_div.find("h2")
-            headline = headline_element.text.strip() if headline_element else "Unknown"
-
-            # Clean title by removing child elements
-            for child in title_div.find_all():
-                child.extract()
-            title = title_div.text.strip() if title_div.text else "Unknown Title"
-
-            # Extract type
-            type_div = item.find("div", {"class": "typez"})
-            anime_type = type_div.text.strip() if type_div else "Unknown"
-
-            # Extract episode count
-            eps_span = item.find("span", {"class": "epx"})
-            eps = None
-            if eps_span:
-                eps_text = eps_span.text.strip()
-                eps_numbers = re.sub("[^0-9]", "", eps_text)
-                eps = int(eps_numbers) if eps_numbers else None
-
-            # Extract thumbnail
-            thumbnail_img = item.find("img", {"src": True})
-            thumbnail = ""
-            if thumbnail_img:
-                thumbnail = (
-                    thumbnail_img.get("data-lazy-src") or thumbnail_img.get("src") or ""
-                )
-
-            # Extract URL and slug
-            url_link = item.find("a", {"title": True})
-            if not url_link or not url_link.get("href"):
-                logger.warning("URL link not found in home item")
-                return None
-
-            url = url_link.get("href")
-            slug_path = urlparse(url).path
-            slug = (
-                slug_path.split("/")[-2]
-                if slug_path.endswith("/")
-                else slug_path.split("/")[-1]
-            )
-
-            card_data = {
-                "title": title,
-                "type": anime_type,
-                "headline": headline,
-                "eps": eps,
-                "thumbnail": thumbnail,
-                "slug": slug,
-            }
-
-            logger.debug(f"Successfully extracted card data for: {title}")
-            return card_data
-
-        except Exception as e:
-            logger.error(f"Error extracting card data: {e}")
-            return None
-
     def __get_home(
         self, data: BeautifulSoup
     ) -> Dict[str, Union[List[Dict[str, Any]], int, str]]:
@@ -108,18 +43,9 @@ class Home(Parsing):
 
                     # Extract articles
                     articles = section.find_all("article")
-                    section_items = []
-
-                    for article in articles:
-                        try:
-                            card = self.__get_card(article)
-                            if card:
-                                section_items.append(card)
-                        except Exception as card_error:
-                            logger.error(
-                                f"Error processing article in section {section_name}: {card_error}"
-                            )
-                            continue
+                    section_items = [
+                        card for card in HOME_CARD.extract_all(articles) if card
+                    ]
 
                     if section_items:
                         cards.append({"section": section_name, "cards": section_items})
@@ -153,38 +79,72 @@ class Home(Parsing):
                 "error": str(e),
             }
 
-    def get_details(self) -> Dict[str, Union[List[Dict[str, Any]], int, str]]:
-        """Get home page details."""
-        try:
-            logger.info(f"Starting to fetch home page for page: {self.__page}")
+    def __get_url(self) -> str:
+        """Get the upstream path of the requested home page."""
+        if self.__page > 1:
+            return f"/page/{self.__page}/"
+        return ""
 
-            url = ""
-            if self.__page > 1:
-                url = f"/page/{self.__page}/"
+    @property
+    def endpoint(self) -> str:
+        """Get the cache endpoint name; later pages change less often."""
+        return "home" if self.__page <= 1 else "home_page"
 
-            data = self.get_parsed_html(url)
-            if not data:
-                logger.error("Failed to get home page data")
-                return {
-                    "results": [],
-                    "page": self.__page,
-                    "total": 0,
-                    "source": self.history_url,
-                    "error": "Failed to fetch home page",
-                }
+    def upstream_url(self) -> str:
+        """Get the normalized upstream URL of the requested home page."""
+        return self.get_upstream_url(self.__get_url())
 
-            return self.__get_home(data)
-
-        except Exception as e:
-            logger.error(f"Error in get_details for page {self.__page}: {e}")
+    def __get_details(
+        self, data: Optional[BeautifulSoup]
+    ) -> Dict[str, Union[List[Dict[str, Any]], int, str]]:
+        """Extract home page details from the parsed page."""
+        if not data:
+            logger.error("Failed to get home page data")
             return {
                 "results": [],
                 "page": self.__page,
                 "total": 0,
                 "source": self.history_url,
-                "error": str(e),
+                "error": "Failed to fetch home page",
             }
 
+        return self.__get_home(data)
+
+    def __get_error(
+        self, error: Exception
+    ) -> Dict[str, Union[List[Dict[str, Any]], int, str]]:
+        """Build the error payload for a failed home page request."""
+        logger.error(f"Error in get_details for page {self.__page}: {error}")
+        return {
+            "results": [],
+            "page": self.__page,
+            "total": 0,
+            "source": self.history_url,
+            "error": str(error),
+        }
+
+    def get_details(self) -> Dict[str, Union[List[Dict[str, Any]], int, str]]:
+        """Get home page details."""
+        try:
+            logger.info(f"Starting to fetch home page for page: {self.__page}")
+            return self.get_parsed_result(
+                "home", self.__get_url(), self.__get_details, profile=PROFILE
+            )
+        except Exception as e:
+            return self.__get_error(e)
+
+    async def get_details_async(
+        self,
+    ) -> Dict[str, Union[List[Dict[str, Any]], int, str]]:
+        """Get home page details using the async fetch engine."""
+        try:
+            logger.info(f"Starting to fetch home page for page: {self.__page}")
+            return await self.get_parsed_result_async(
+                "home", self.__get_url(), self.__get_details, profile=PROFILE
+            )
+        except Exception as e:
+            return self.__get_error(e)
+
 
 if __name__ == "__main__":
     # Configure logging for testing
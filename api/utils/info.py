@@ -1,14 +1,44 @@
 from .parsing import Parsing
+from .backends import ParseProfile, is_element
+from .rows import RowSpec, iter_rows
+from .dates import normalize_date
 from urllib.parse import urlparse
-import re
+from itertools import islice
 import logging
-from time import strptime, struct_time
-from typing import Dict, List, Optional, Any, Union
-from bs4 import BeautifulSoup, Tag
+from typing import Dict, Iterator, List, Optional, Any, Union
+from bs4 import BeautifulSoup
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Regions of the info page read by the extractor; the episode list is
+# streamed from the raw HTML instead
+PROFILE = ParseProfile(
+    "div.thumb",
+    "div.rating",
+    "div.infox",
+    'div[itemprop="description"]',
+)
+
+# Rows of the episode list
+EPISODE_ROWS = RowSpec(
+    "div.eplister ul",
+    "li",
+    {
+        "href": ("a", "@href"),
+        "subtitle": ("div.epl-title", "text"),
+        "date": ("div.epl-date", "text"),
+        "episode": ("div.epl-num", "text"),
+    },
+)
+
+# The series thumbnail shown on every episode row
+THUMBNAIL_ROWS = RowSpec(
+    "div.thumb",
+    "img",
+    {"lazy_src": ("", "@data-lazy-src"), "src": ("", "@src")},
+)
+
 
 class Info(Parsing):
     def __init__(self, slug: str) -> None:
@@ -17,15 +47,15 @@ class Info(Parsing):
         self.slug: str = slug
         logger.info(f"Initialized Info scraper for slug: {slug}")
 
-    def __get_info(self) -> Optional[BeautifulSoup]:
-        """Get parsed HTML content for the anime info page."""
-        try:
-            if "anixverse" in self.url:
-                return self.get_parsed_html(f"anime/{self.slug}")
-            return self.get_parsed_html(self.slug)
-        except Exception as e:
-            logger.error(f"Failed to get info for slug {self.slug}: {e}")
-            return None
+    def __get_path(self) -> str:
+        """Get the upstream path of the anime info page."""
+        if "anixverse" in self.url:
+            return f"anime/{self.slug}"
+        return self.slug
+
+    def upstream_url(self) -> str:
+        """Get the normalized upstream URL of the anime info page."""
+        return self.get_upstream_url(self.__get_path())
 
     def __get_name(self, content: BeautifulSoup) -> str:
         """Extract anime name from the content."""
@@ -44,6 +74,16 @@ class Info(Parsing):
             logger.error(f"Error extracting anime name: {e}")
             return "Unknown Title"
 
+    def __get_alternative(self, content: BeautifulSoup) -> Optional[str]:
+        """Extract the alternative titles shown under the anime name."""
+        try:
+            alter = content.find("span", {"class": "alter"})
+            text = alter.text.strip() if alter else ""
+            return text or None
+        except Exception as e:
+            logger.error(f"Error extracting alternative titles: {e}")
+            return None
+
     def __get_thumbnail(self, content: BeautifulSoup) -> str:
         """Extract thumbnail URL from the content."""
         try:
@@ -166,108 +206,122 @@ class Info(Parsing):
                 logger.warning("No paragraphs found in synopsis")
                 paragraphs = [synopsis]
             return {
-                "paragraphs": [
-                    p.text.strip() for p in paragraphs if isinstance(p, Tag)
-                ],
+                "paragraphs": [p.text.strip() for p in paragraphs if is_element(p)],
                 "title": title.strip(),
             }
         except Exception as e:
             logger.error(f"Error extracting synopsis: {e}")
             return ""
 
-    def __parse_date(self, date_str: str) -> str:
-        """Parse and format date string safely."""
-        try:
-            # Expected format: "January 01, 2023"
-            # Convert to "01 January 2023" format for parsing
-            formatted_date = re.sub(
-                r"(\w+)\s+(\d{1,2}),\s+(\d{4})", r"\2 \1 \3", date_str.strip()
-            )
-
-            # Parse the date
-            parsed_date = strptime(formatted_date, "%d %B %Y")
+    def iter_episodes(self, html: str) -> Iterator[Dict[str, Union[str, None]]]:
+        """Lazily extract the episode list from the raw page HTML."""
+        for i, row in enumerate(iter_rows(html, EPISODE_ROWS)):
+            try:
+                if not row["href"]:
+                    logger.warning(f"Episode {i+1}: Link not found, skipping")
+                    continue
 
-            # Format as MM/DD/YYYY
-            result = f"{parsed_date.tm_mon}/{parsed_date.tm_mday}/{parsed_date.tm_year}"
-            logger.debug(f"Parsed date '{date_str}' to '{result}'")
-            return result
-        except Exception as e:
-            logger.error(f"Error parsing date '{date_str}': {e}")
-            return date_str  # Return original string if parsing fails
+                slug = urlparse(row["href"]).path.strip("/")
+                subtitle = row["subtitle"]
+                if subtitle is None:
+                    subtitle = f"Episode {i+1}"
+                date = row["date"]
+                date = normalize_date(date) if date is not None else "Unknown Date"
+
+                yield {
+                    "slug": slug,
+                    "subtitle": subtitle,
+                    "date": date,
+                    "episode": row["episode"],
+                    "thumbnail": self.__thumbnail,
+                }
+            except Exception as episode_error:
+                logger.error(f"Error processing episode {i+1}: {episode_error}")
+                continue
 
-    def __get_episodes(self, data: BeautifulSoup) -> List[Dict[str, Union[str, None]]]:
-        """Extract episodes list from the content."""
-        result = []
+    def __get_episodes(self, html: str) -> List[Dict[str, Union[str, None]]]:
+        """Extract episodes list from the raw page HTML."""
         try:
-            episodelist_div = data.find("div", {"class": "eplister"})
-            if not episodelist_div:
-                logger.warning("Episode list section not found")
-                return result
-
-            ul_element = episodelist_div.find("ul")
-            if not ul_element:
-                logger.warning("Episode list UL element not found")
-                return result
-
-            episodes = ul_element.find_all("li")
-            logger.info(f"Found {len(episodes)} episodes")
-
-            for i, item in enumerate(episodes):
-                try:
-                    # Extract slug
-                    link = item.find("a")
-                    if not link or not link.get("href"):
-                        logger.warning(f"Episode {i+1}: Link not found, skipping")
-                        continue
-
-                    slug = urlparse(link["href"]).path.strip("/")
-                    subtitle = item.find("div", {"class": "epl-title"})
-                    if subtitle:
-                        subtitle = subtitle.text.strip()
-                    else:
-                        subtitle = f"Episode {i+1}"
-                    date = item.find("div", {"class": "epl-date"})
-                    if date:
-                        date_text = date.text.strip()
-                        date = self.__parse_date(date_text)
-                    else:
-                        date = "Unknown Date"
-                    eps = item.find("div", {"class": "epl-num"})
-                    if eps:
-                        eps_text = eps.text.strip()
-                        eps = eps_text
-                    else:
-                        eps = None
-
-                    episode_data = {
-                        "slug": slug,
-                        "subtitle": subtitle,
-                        "date": date,
-                        "episode": eps,
-                        "thumbnail": self.__thumbnail,
-                    }
-
-                    result.append(episode_data)
-                    logger.debug(f"Successfully processed episode {i+1}: {slug}")
-
-                except Exception as episode_error:
-                    logger.error(f"Error processing episode {i+1}: {episode_error}")
-                    continue
-
+            result = list(self.iter_episodes(html))
             logger.info(f"Successfully processed {len(result)} episodes")
             return result
-
         except Exception as e:
             logger.error(f"Error extracting episodes: {e}")
-            return result
+            return []
+
+    def __read_thumbnail(self, html: str) -> None:
+        """Read the series thumbnail from the raw page HTML."""
+        image = next(iter_rows(html, THUMBNAIL_ROWS), None)
+        if image and (image["lazy_src"] or image["src"]):
+            self.__thumbnail = image["lazy_src"] or image["src"]
+
+    def __get_episode_page(
+        self, html: Optional[str], page: int, limit: int
+    ) -> Dict[str, Any]:
+        """Extract one page of the episode list, stopping after its last row."""
+        result = {
+            "results": [],
+            "slug": self.slug,
+            "page": page,
+            "limit": limit,
+            "has_next": False,
+            "source": self.history_url,
+        }
+        if not html:
+            logger.error("Failed to get initial data")
+            return {**result, "error": "Failed to fetch data"}
+
+        try:
+            self.__read_thumbnail(html)
+            start = (page - 1) * limit
+            # One extra row tells whether another page follows
+            rows = list(islice(self.iter_episodes(html), start, start + limit + 1))
+            logger.info(f"Extracted {len(rows[:limit])} episodes of page {page}")
+            return {**result, "results": rows[:limit], "has_next": len(rows) > limit}
+        except Exception as e:
+            logger.error(f"Error extracting episode page {page}: {e}")
+            return {**result, "error": str(e)}
+
+    def get_episodes(self, page: int = 1, limit: int = 50) -> Dict[str, Any]:
+        """Get one page of the episode list."""
+        logger.info(f"Getting episodes of {self.slug} page {page} (limit {limit})")
+        return self.get_raw_result(
+            f"episodes:{page}:{limit}",
+            self.__get_path(),
+            lambda html: self.__get_episode_page(html, page, limit),
+        )
+
+    async def get_episodes_async(
+        self, page: int = 1, limit: int = 50
+    ) -> Dict[str, Any]:
+        """Get one page of the episode list using the async fetch engine."""
+        logger.info(f"Getting episodes of {self.slug} page {page} (limit {limit})")
+        return await self.get_raw_result_async(
+            f"episodes:{page}:{limit}",
+            self.__get_path(),
+            lambda html: self.__get_episode_page(html, page, limit),
+        )
 
     def to_json(self) -> Dict[str, Any]:
         """Convert scraped data to JSON format."""
+        logger.info(f"Starting to scrape data for slug: {self.slug}")
+        return self.get_page_result(
+            "info", self.__get_path(), self.__to_json, profile=PROFILE
+        )
+
+    async def to_json_async(self) -> Dict[str, Any]:
+        """Convert scraped data to JSON format using the async fetch engine."""
+        logger.info(f"Starting to scrape data for slug: {self.slug}")
+        return await self.get_page_result_async(
+            "info", self.__get_path(), self.__to_json, profile=PROFILE
+        )
+
+    def __to_json(
+        self, html: Optional[str], data: Optional[BeautifulSoup]
+    ) -> Dict[str, Any]:
+        """Extract the anime information from the parsed page."""
         try:
-            logger.info(f"Starting to scrape data for slug: {self.slug}")
-
-            data = self.__get_info()
-            if not data:
+            if not html or not data:
                 logger.error("Failed to get initial data")
                 return {
                     "result": None,
@@ -289,9 +343,12 @@ class Info(Parsing):
             thumbnail = self.__get_thumbnail(data)
             genres = self.__get_genres(content)
             info_details = self.__get_info_details(content)
+            alternative = self.__get_alternative(content)
+            if alternative:
+                info_details.setdefault("alternative", alternative)
             rating = self.__get_rating(data)
             sinopsis = self.__get_sinopsis(data)
-            episodes = self.__get_episodes(data)
+            episodes = self.__get_episodes(html)
 
             # Combine all information
             result_info = {
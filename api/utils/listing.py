@@ -0,0 +1,109 @@
+from dotenv import load_dotenv
+from os import getenv
+import math
+import re
+import logging
+from typing import Any, Dict, List, Optional
+
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Most upstream pages one listing request may span
+MAX_LISTING_PAGES: int = int(getenv("MAX_LISTING_PAGES", 10))
+
+# Upstream pages of one listing request fetched at the same time
+LISTING_WORKERS: int = int(getenv("LISTING_WORKERS", 5))
+
+# Cards per upstream listing page, used to turn a card limit into pages
+LISTING_PAGE_SIZE: int = int(getenv("LISTING_PAGE_SIZE", 20))
+
+_PAGES = re.compile(r"^(\d+)(?:-(\d+))?$")
+_PAGE_PATH = re.compile(r"/page/(\d+)/?")
+
+
+def parse_pages(
+    pages: Optional[str], limit: Optional[str], page: int = 1
+) -> Optional[List[int]]:
+    """Get the upstream pages of a "pages=1-5" or "limit=" listing request.
+
+    Returns None for a plain single-page request, and raises ValueError for
+    a malformed or too wide range.
+    """
+    if pages:
+        numbers: List[int] = []
+        for part in pages.split(","):
+            match = _PAGES.match(part.strip())
+            if not match:
+                raise ValueError("Pages parameter must look like 1-5 or 1,3")
+            first = int(match.group(1))
+            last = int(match.group(2) or first)
+            if first < 1 or last < first:
+                raise ValueError("Pages parameter must be an ascending range from 1")
+            if last - first + 1 > MAX_LISTING_PAGES:
+                raise ValueError(f"At most {MAX_LISTING_PAGES} pages per request")
+            numbers.extend(range(first, last + 1))
+
+        numbers = list(dict.fromkeys(numbers))
+        if len(numbers) > MAX_LISTING_PAGES:
+            raise ValueError(f"At most {MAX_LISTING_PAGES} pages per request")
+        return numbers
+
+    if limit:
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValueError("Limit parameter must be a positive number")
+        count = min(math.ceil(int(limit) / LISTING_PAGE_SIZE), MAX_LISTING_PAGES)
+        return list(range(page, page + count))
+
+    return None
+
+
+def read_page_count(content: Any, current: int = 1) -> int:
+    """Read the number of result pages from the pagination links of a listing.
+
+    Themes show either numbered links (div.pagination) or only previous and
+    next links (div.hpage); the highest page seen is the best known count.
+    """
+    count = current
+    for wrapper in content.find_all("div", {"class": "pagination"}) + content.find_all(
+        "div", {"class": "hpage"}
+    ):
+        for link in wrapper.find_all("a") + wrapper.find_all("span"):
+            text = link.text.strip().replace(",", "").replace(".", "")
+            if text.isdigit():
+                count = max(count, int(text))
+            match = _PAGE_PATH.search(link.get("href") or "")
+            if match:
+                count = max(count, int(match.group(1)))
+    return count
+
+
+def merge_listing(
+    results: List[Dict[str, Any]], pages: List[int], limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """Merge listing pages in page order, dropping cards seen on an earlier page."""
+    seen = set()
+    cards: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    for page, result in zip(pages, results):
+        if result.get("error"):
+            errors.append({"page": page, "error": result["error"]})
+            continue
+        for card in result.get("results", []):
+            key = card.get("slug") or card.get("title")
+            if key in seen:
+                continue
+            seen.add(key)
+            cards.append(card)
+
+    if limit:
+        cards = cards[:limit]
+
+    merged: Dict[str, Any] = {"results": cards, "pages": pages, "total": len(cards)}
+    if errors:
+        logger.warning(f"{len(errors)} of {len(pages)} listing pages failed")
+        merged["errors"] = errors
+        if len(errors) == len(pages):
+            merged["error"] = errors[0]["error"]
+    return merged
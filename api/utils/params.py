@@ -0,0 +1,113 @@
+from .listing import parse_pages
+from .search import DEEP_SEARCH_MAX_PAGES
+from .suggest import SUGGEST_LIMIT, SUGGEST_MAX_LIMIT
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Episodes per page of the /<slug>/episodes route, by default and at most
+EPISODES_LIMIT: int = 50
+EPISODES_MAX_LIMIT: int = 500
+
+
+class ParamError(ValueError):
+    """A request parameter is missing or malformed; answered with HTTP 400."""
+
+
+def require(value: Optional[str], message: str) -> str:
+    """Get a stripped path or query value, or raise when it is empty."""
+    if not value or not value.strip():
+        logger.warning(message)
+        raise ParamError(message)
+    return value.strip()
+
+
+def number(
+    args: Mapping[str, str],
+    name: str,
+    endpoint: str,
+    default: Optional[int] = None,
+    minimum: int = 0,
+) -> Optional[int]:
+    """Get a numeric query parameter, or default when it is not given."""
+    value = args.get(name)
+    if not value:
+        return default
+    if not value.isdigit() or int(value) < minimum:
+        logger.warning(f"Invalid {name} parameter for {endpoint}: {value}")
+        kind = "a positive number" if minimum > 0 else "a number"
+        label = name.replace("_", " ").capitalize()
+        raise ParamError(f"{label} parameter must be {kind}")
+    return int(value)
+
+
+def choice(
+    args: Mapping[str, str], name: str, endpoint: str, choices: Tuple[str, ...]
+) -> str:
+    """Get a query parameter limited to choices, the first being the default."""
+    value = args.get(name, choices[0])
+    if value not in choices:
+        logger.warning(f"Invalid {name} parameter for {endpoint}: {value}")
+        raise ParamError(
+            f"{name.capitalize()} parameter must be {' or '.join(choices)}"
+        )
+    return value
+
+
+def search_params(query: Optional[str], args: Mapping[str, str]) -> Dict[str, Any]:
+    """Read the parameters of a /search request."""
+    params: Dict[str, Any] = {
+        "query": require(query, "Search query cannot be empty"),
+        "page": number(args, "page", "search", 1),
+        "deep": choice(args, "deep", "search", ("0", "1")) == "1",
+        "fuzzy": choice(args, "fuzzy", "search", ("0", "1")) == "1",
+    }
+    if params["deep"]:
+        max_pages = number(args, "max_pages", "search", DEEP_SEARCH_MAX_PAGES, 1)
+        params["max_pages"] = min(max_pages, DEEP_SEARCH_MAX_PAGES)
+    return params
+
+
+def suggest_params(args: Mapping[str, str]) -> Tuple[str, int]:
+    """Read the query and limit of a /suggest request."""
+    query = require(args.get("q"), "Suggest query cannot be empty")
+    limit = number(args, "limit", "suggest", SUGGEST_LIMIT, 1)
+    return query, min(limit, SUGGEST_MAX_LIMIT)
+
+
+def episodes_params(
+    slug: Optional[str], args: Mapping[str, str]
+) -> Tuple[str, int, int]:
+    """Read the slug, page and limit of a /<slug>/episodes request."""
+    slug = require(slug, "Slug cannot be empty")
+    page = max(number(args, "page", "episodes", 1), 1)
+    limit = number(args, "limit", "episodes", EPISODES_LIMIT)
+    return slug, page, min(max(limit, 1), EPISODES_MAX_LIMIT)
+
+
+def episode_params(
+    slug: Optional[str], args: Mapping[str, str]
+) -> Tuple[str, bool, bool]:
+    """Read the slug and the resolve and video flags of an /episode request."""
+    slug = require(slug, "Episode slug cannot be empty")
+    players = choice(args, "players", "episode", ("handles", "resolve"))
+    video = choice(args, "video", "episode", ("0", "1"))
+    return slug, players == "resolve", video == "1"
+
+
+def listing_pages(
+    args: Mapping[str, str], endpoint: str, page: int = 1
+) -> Tuple[Optional[List[int]], Optional[int]]:
+    """Read the pages and card limit of a multi-page listing request.
+
+    The pages are None for a plain single-page request.
+    """
+    limit = args.get("limit")
+    try:
+        pages = parse_pages(args.get("pages"), limit, page)
+    except ValueError as e:
+        logger.warning(f"Invalid pages parameter for {endpoint}: {e}")
+        raise ParamError(str(e)) from e
+    return pages, int(limit) if limit else None
@@ -2,62 +2,390 @@ from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from os import getenv
 from requests import Session, Response
+from .client import get_session, get_async_client, TIMEOUT
+from .singleflight import normalize_url
+from .cache import MemoryCache
+from .backends import ParseProfile, parse_html
+from hashlib import blake2b
+from time import time
+import asyncio
+import httpx
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, TypeVar
 
 load_dotenv()
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-class Parsing(Session):
+# Upstream pages kept for conditional revalidation (ETag / Last-Modified)
+PAGE_CACHE_TTL: int = int(getenv("PAGE_CACHE_TTL", 86400))
+
+
+# Extraction results keyed by page type, URL and a hash of the page body
+RESULT_CACHE_TTL: int = int(getenv("RESULT_CACHE_TTL", 86400))
+
+
+def content_hash(html: str) -> str:
+    """Hash a page body; equal hashes mean the extraction can be reused."""
+    return blake2b(html.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class _CachedPage:
+    """An upstream page body with its validators and content hash."""
+
+    def __init__(
+        self, html: str, etag: Optional[str], last_modified: Optional[str]
+    ) -> None:
+        self.html: str = html
+        self.etag: Optional[str] = etag
+        self.last_modified: Optional[str] = last_modified
+        self.digest: str = content_hash(html)
+
+
+# Fetched pages reused without a request when scrapers read the same page
+# close together, such as an episode and its video sources
+DOCUMENT_CACHE_TTL: float = float(getenv("DOCUMENT_CACHE_TTL", 30))
+
+_pages: MemoryCache = MemoryCache(int(getenv("PAGE_CACHE_ENTRIES", 256)))
+_documents: MemoryCache = MemoryCache(int(getenv("DOCUMENT_CACHE_ENTRIES", 64)))
+_results: MemoryCache = MemoryCache(int(getenv("RESULT_CACHE_ENTRIES", 512)))
+
+
+def _is_reusable(result: Any) -> bool:
+    """Check whether an extraction result is complete enough to reuse."""
+    if not result:
+        return False
+    if isinstance(result, dict):
+        if result.get("error"):
+            return False
+        if "result" in result and result["result"] is None:
+            return False
+    return True
+
+
+class Parsing:
     def __init__(self) -> None:
-        super().__init__()
+        self.session: Session = get_session()
         self.url: str = "https://anichin.club"
         self.history_url: Optional[str] = None
-        logger.info(f"Initialized Parsing session with URL: {self.url}")
+        self.not_modified: bool = False
+        self.__page: Optional[_CachedPage] = None
+        self.__key: Optional[str] = None
+        logger.debug(f"Initialized Parsing extractor with URL: {self.url}")
 
-    def __get_html(self, slug: str, **kwargs: Any) -> Optional[str]:
-        """Get HTML content from the specified slug."""
-        try:
-            if slug.startswith("/"):
-                url = f"{self.url}{slug}"
-            else:
-                url = f"{self.url}/{slug}"
+    def get_upstream_url(
+        self, slug: str, params: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Get the normalized upstream URL of a slug, used as a request key."""
+        return normalize_url(f"{self.url}/{slug.lstrip('/')}", params)
 
-            cookies = "cf_clearance=XIBMo7QdecdvAcdM8uzEOnK_2UnaTHJJ8RieN.AoMY4-1748586290-1.2.1.1-UH.LSXh9BmHpSLaJS_QMPgFflT778PdhoLS1KmyRjdmD6fyvBCwlbktmnaZXXzHZkrmtk.LqI2A6LBAMEeSIjUiSkZOoleahDZ5cEEE1IM9hpSYAVSNFikWmc1UscY6NdDU_BNsHdRklnGzIKXkZ.Sbynw3BuFQmjHEgcq53BG9OQRl4BOHmZIQ4KZnfqu1IBc8o0WDYBkW_fKQgcVrLD81HY_1sObt1jDOV1cfSHMvTUoKOaVyJjASKrps90RTeM0QJtZmbFE8MBynNbZeZipOueDnYCEqaNjbI5BakFWEIEQ.t8ymqTVH37ZI0BGmacY.UwliDAFTYbPahtY6_Ac0xJbuH8BbrK_5dW3cjuswE_25hq1m0s.uuTc68owr1"
+    def get(self, url: str, **kwargs: Any) -> Response:
+        """Send a GET request through the shared connection pool."""
+        kwargs.setdefault("timeout", TIMEOUT)
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Response:
+        """Send a POST request through the shared connection pool."""
+        kwargs.setdefault("timeout", TIMEOUT)
+        return self.session.post(url, **kwargs)
+
+    async def get_async(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a GET request through the event loop's async client."""
+        return await get_async_client().get(url, **kwargs)
+
+    async def post_async(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a POST request through the event loop's async client."""
+        return await get_async_client().post(url, **kwargs)
+
+    def __prepare_request(self, slug: str, kwargs: Dict[str, Any]) -> str:
+        """Build the upstream URL and merge the default request headers."""
+        if slug.startswith("/"):
+            url = f"{self.url}{slug}"
+        else:
+            url = f"{self.url}/{slug}"
+
+        cookies = "cf_clearance=XIBMo7QdecdvAcdM8uzEOnK_2UnaTHJJ8RieN.AoMY4-1748586290-1.2.1.1-UH.LSXh9BmHpSLaJS_QMPgFflT778PdhoLS1KmyRjdmD6fyvBCwlbktmnaZXXzHZkrmtk.LqI2A6LBAMEeSIjUiSkZOoleahDZ5cEEE1IM9hpSYAVSNFikWmc1UscY6NdDU_BNsHdRklnGzIKXkZ.Sbynw3BuFQmjHEgcq53BG9OQRl4BOHmZIQ4KZnfqu1IBc8o0WDYBkW_fKQgcVrLD81HY_1sObt1jDOV1cfSHMvTUoKOaVyJjASKrps90RTeM0QJtZmbFE8MBynNbZeZipOueDnYCEqaNjbI5BakFWEIEQ.t8ymqTVH37ZI0BGmacY.UwliDAFTYbPahtY6_Ac0xJbuH8BbrK_5dW3cjuswE_25hq1m0s.uuTc68owr1"
+
+        headers: Dict[str, str] = {
+            "User-Agent": getenv(
+                "USER_AGENT",
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3",
+            ),
+            "Cookie": cookies,
+        }
+
+        if kwargs.get("headers"):
+            headers.update(kwargs["headers"])
+        kwargs["headers"] = headers
+        return url
+
+    def __add_validators(self, key: str, kwargs: Dict[str, Any]) -> None:
+        """Make the request conditional when the page has been seen before."""
+        self.__key = key
+        entry = _pages.get(key)
+        self.__page = entry[2] if entry is not None else None
+        self.not_modified = False
+        if self.__page is None:
+            return
+
+        page = self.__page
+        if page.etag:
+            kwargs["headers"]["If-None-Match"] = page.etag
+        if page.last_modified:
+            kwargs["headers"]["If-Modified-Since"] = page.last_modified
+
+    def __store_page(self, key: str, page: _CachedPage) -> None:
+        """Keep a page for revalidation for PAGE_CACHE_TTL seconds."""
+        expires_at = time() + PAGE_CACHE_TTL
+        _pages.set(key, page, expires_at, expires_at)
+
+    def __read_response(self, key: str, url: str, response: Any) -> str:
+        """Read the page body, falling back to the stored body on 304."""
+        self.history_url = url
+
+        if response.status_code == 304 and self.__page is not None:
+            page = self.__page
+            self.__store_page(key, page)
+            self.not_modified = True
+            logger.debug(f"Upstream page not modified: {url}")
+            return page.html
+
+        response.raise_for_status()  # Raise an exception for bad status codes
+
+        html = response.text
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self.__page = _CachedPage(html, etag, last_modified)
+            self.__store_page(key, self.__page)
+        else:
+            self.__page = None
+
+        logger.debug(f"Successfully fetched content from: {url}")
+        return html
+
+    def __reuse_document(self, key: str, url: str) -> Optional[str]:
+        """Get a page fetched moments ago, without a request."""
+        entry = _documents.get(key)
+        if entry is None:
+            return None
 
-            headers: Dict[str, str] = {
-                "User-Agent": getenv(
-                    "USER_AGENT",
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3",
-                ),
-                "Cookie": cookies,
-            }
+        self.__key = key
+        self.__page = entry[2]
+        self.not_modified = False
+        self.history_url = url
+        logger.debug(f"Reusing recently fetched page: {url}")
+        return self.__page.html
 
-            if kwargs.get("headers"):
-                headers.update(kwargs["headers"])
-            kwargs["headers"] = headers
+    def __store_document(self, key: str, html: str) -> None:
+        """Share a fetched page for DOCUMENT_CACHE_TTL seconds."""
+        if DOCUMENT_CACHE_TTL <= 0:
+            return
+        if self.__page is None or self.__page.html is not html:
+            self.__page = _CachedPage(html, None, None)
+        expires_at = time() + DOCUMENT_CACHE_TTL
+        _documents.set(key, self.__page, expires_at, expires_at)
+
+    def __get_html(self, slug: str, **kwargs: Any) -> Optional[str]:
+        """Get HTML content from the specified slug."""
+        try:
+            url = self.__prepare_request(slug, kwargs)
+            key = normalize_url(url, kwargs.get("params"))
+            document = self.__reuse_document(key, url)
+            if document is not None:
+                return document
+            self.__add_validators(key, kwargs)
 
             logger.debug(f"Making request to: {url}")
             response: Response = self.get(url, **kwargs)
-            response.raise_for_status()  # Raise an exception for bad status codes
+            html = self.__read_response(key, url, response)
+            self.__store_document(key, html)
+            return html
 
-            self.history_url = url
-            logger.debug(f"Successfully fetched content from: {url}")
-            return response.text
+        except Exception as e:
+            logger.error(f"Failed to fetch HTML from {slug}: {e}")
+            return None
+
+    async def __get_html_async(self, slug: str, **kwargs: Any) -> Optional[str]:
+        """Get HTML content from the specified slug without blocking."""
+        try:
+            url = self.__prepare_request(slug, kwargs)
+            key = normalize_url(url, kwargs.get("params"))
+            document = self.__reuse_document(key, url)
+            if document is not None:
+                return document
+            self.__add_validators(key, kwargs)
+
+            logger.debug(f"Making async request to: {url}")
+            response = await self.get_async(url, **kwargs)
+            html = self.__read_response(key, url, response)
+            self.__store_document(key, html)
+            return html
 
         except Exception as e:
             logger.error(f"Failed to fetch HTML from {slug}: {e}")
             return None
 
+    def __extract(
+        self,
+        page_type: str,
+        url: str,
+        html: Optional[str],
+        extract: Callable[[Any], T],
+        parse: Callable[[str], Any],
+    ) -> T:
+        """Extract a result from the page, reusing it when the body is unchanged."""
+        if not html:
+            logger.warning(f"No HTML content to parse for: {url}")
+            return extract(None)
+
+        if self.__page is not None and self.__page.html is html:
+            digest = self.__page.digest
+        else:
+            digest = content_hash(html)
+
+        # Results embed URL-derived fields (source, page, slug), so scope by URL
+        key = f"{page_type}:{self.__key}:{digest}"
+        entry = _results.get(key)
+        if entry is not None:
+            logger.info(f"Reusing {page_type} result of unchanged page: {url}")
+            return entry[2]
+
+        result = extract(parse(html))
+
+        if _is_reusable(result):
+            expires_at = time() + RESULT_CACHE_TTL
+            _results.set(key, result, expires_at, expires_at)
+        return result
+
+    def get_parsed_result(
+        self,
+        page_type: str,
+        url: str,
+        extract: Callable[[Optional[BeautifulSoup]], T],
+        profile: Optional[ParseProfile] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Fetch a page and extract it, skipping the parse when it is unchanged.
+
+        With a profile only the regions the extractor reads are parsed.
+        """
+        html = self.__get_html(url, **kwargs)
+        return self.__extract(
+            page_type, url, html, extract, lambda data: self.parsing(data, profile)
+        )
+
+    async def get_parsed_result_async(
+        self,
+        page_type: str,
+        url: str,
+        extract: Callable[[Optional[BeautifulSoup]], T],
+        profile: Optional[ParseProfile] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Fetch a page without blocking and extract it unless it is unchanged."""
+        html = await self.__get_html_async(url, **kwargs)
+        # Parsing takes tens of milliseconds, too long to hold the event loop
+        return await asyncio.to_thread(
+            self.__extract,
+            page_type,
+            url,
+            html,
+            extract,
+            lambda data: self.parsing(data, profile),
+        )
+
+    def get_page_result(
+        self,
+        page_type: str,
+        url: str,
+        extract: Callable[[Optional[str], Optional[BeautifulSoup]], T],
+        profile: Optional[ParseProfile] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Fetch a page and extract it from both its raw HTML and parsed tree.
+
+        For extractors that stream part of the page from the HTML instead of
+        parsing it; both are None when the page could not be fetched.
+        """
+        html = self.__get_html(url, **kwargs)
+        return self.__extract(
+            page_type,
+            url,
+            html,
+            lambda page: extract(*(page or (None, None))),
+            lambda data: (data, self.parsing(data, profile)),
+        )
+
+    async def get_page_result_async(
+        self,
+        page_type: str,
+        url: str,
+        extract: Callable[[Optional[str], Optional[BeautifulSoup]], T],
+        profile: Optional[ParseProfile] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Fetch a page without blocking and extract it from its HTML and tree."""
+        html = await self.__get_html_async(url, **kwargs)
+        return await asyncio.to_thread(
+            self.__extract,
+            page_type,
+            url,
+            html,
+            lambda page: extract(*(page or (None, None))),
+            lambda data: (data, self.parsing(data, profile)),
+        )
+
+    def get_raw_result(
+        self,
+        page_type: str,
+        url: str,
+        extract: Callable[[Optional[str]], T],
+        **kwargs: Any,
+    ) -> T:
+        """Fetch a page and extract it from the raw HTML, without building a tree."""
+        html = self.__get_html(url, **kwargs)
+        return self.__extract(page_type, url, html, extract, lambda data: data)
+
+    async def get_raw_result_async(
+        self,
+        page_type: str,
+        url: str,
+        extract: Callable[[Optional[str]], T],
+        **kwargs: Any,
+    ) -> T:
+        """Fetch a page without blocking and extract it from the raw HTML."""
+        html = await self.__get_html_async(url, **kwargs)
+        return await asyncio.to_thread(
+            self.__extract, page_type, url, html, extract, lambda data: data
+        )
+
     def get_parsed_html(self, url: str, **kwargs: Any) -> Optional[BeautifulSoup]:
-        """Get parsed HTML content using BeautifulSoup."""
+        """Get parsed HTML content using the configured parser backend."""
         try:
             html_content = self.__get_html(url, **kwargs)
             if html_content:
-                parsed = BeautifulSoup(html_content, "html.parser")
+                parsed = parse_html(html_content)
+                logger.debug(f"Successfully parsed HTML content for: {url}")
+                return parsed
+            else:
+                logger.warning(f"No HTML content to parse for: {url}")
+                return None
+        except Exception as e:
+            logger.error(f"Failed to parse HTML for {url}: {e}")
+            return None
+
+    async def get_parsed_html_async(
+        self, url: str, **kwargs: Any
+    ) -> Optional[BeautifulSoup]:
+        """Get parsed HTML content using the async fetch engine."""
+        try:
+            html_content = await self.__get_html_async(url, **kwargs)
+            if html_content:
+                parsed = await asyncio.to_thread(parse_html, html_content)
                 logger.debug(f"Successfully parsed HTML content for: {url}")
                 return parsed
             else:
@@ -67,14 +395,16 @@ class Parsing(Session):
             logger.error(f"Failed to parse HTML for {url}: {e}")
             return None
 
-    def parsing(self, data: str) -> Optional[BeautifulSoup]:
-        """Parse HTML data using BeautifulSoup."""
+    def parsing(
+        self, data: str, profile: Optional[ParseProfile] = None
+    ) -> Optional[BeautifulSoup]:
+        """Parse HTML data, or only the regions of a profile, into a tree."""
         try:
             if not data:
                 logger.warning("Empty data provided for parsing")
                 return None
 
-            parsed = BeautifulSoup(data, "html.parser")
+            parsed = parse_html(data, profile=profile)
             logger.debug("Successfully parsed provided HTML data")
             return parsed
         except Exception as e:
@@ -0,0 +1,161 @@
+from dotenv import load_dotenv
+from os import getenv
+from binascii import a2b_base64
+from html import unescape
+from .backends import ParseProfile, parse_html
+from .cache import MemoryCache
+from .parsing import content_hash
+from time import time
+import json
+import re
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Decoded mirror lists keyed by a hash of the player script
+PLAYER_CACHE_TTL: int = int(getenv("PLAYER_CACHE_TTL", 86400))
+
+_mirrors: MemoryCache = MemoryCache(int(getenv("PLAYER_CACHE_ENTRIES", 1024)))
+
+MIRROR_PROFILE = ParseProfile('select[name="mirror"]')
+
+# var ZmK = ["...", ...]; ... - 77824757
+_SCRIPT = re.compile(r"var (\w+) = (\[[^\]]+\]);.*?\)\s*-\s*(\d+)", re.DOTALL)
+
+# One quoted string of an array literal, with the separator that follows it
+_ITEM = re.compile(r"""\s*(?:"((?:[^"\\]|\\.)*)"|'((?:[^'\\]|\\.)*)')\s*(,|$)""")
+
+# Bytes removed before reading the numbers of the decoded values, which are
+# joined with commas
+_NON_DIGITS = bytes(b for b in range(256) if not 0x30 <= b <= 0x39 and b != 0x2C)
+
+
+def parse_string_array(literal: str) -> List[str]:
+    """Read a JavaScript array literal of plain strings without evaluating it."""
+    try:
+        values = json.loads(literal)
+        if isinstance(values, list) and all(isinstance(v, str) for v in values):
+            return values
+    except ValueError:
+        pass  # Single quotes or a trailing comma, read it item by item
+
+    body = literal.strip()
+    if not body.startswith("[") or not body.endswith("]"):
+        raise ValueError("Not an array literal")
+    body = body[1:-1].strip()
+
+    values: List[str] = []
+    position = 0
+    while position < len(body):
+        match = _ITEM.match(body, position)
+        if not match:
+            raise ValueError(f"Unsupported array item at offset {position}")
+        value = match.group(1) if match.group(1) is not None else match.group(2)
+        if "\\" in value:
+            value = re.sub(r"\\(.)", r"\1", value)
+        values.append(value)
+        position = match.end()
+    return values
+
+
+def decode_player_script(js_code: str) -> str:
+    """Decode the HTML written by the obfuscated player script."""
+    match = _SCRIPT.search(js_code)
+    if not match:
+        logger.warning("No matches found in JavaScript code")
+        return ""
+
+    values = parse_string_array(match.group(2))
+    offset = int(match.group(3))
+    # Every value is a base64 string whose digits are a character code + offset,
+    # so all values are decoded and filtered at once and then split again
+    numbers = b",".join(map(a2b_base64, values)).translate(None, _NON_DIGITS)
+    codes = numbers.split(b",")
+    if len(codes) != len(values):
+        # A decoded value contained a comma of its own
+        codes = [a2b_base64(value).translate(None, b",") for value in values]
+        codes = [code.translate(None, _NON_DIGITS) for code in codes]
+    written = "".join([chr(int(code) - offset) for code in codes])
+    try:
+        # decodeURIComponent(escape(...)) reads the characters as UTF-8 bytes
+        return written.encode("latin-1").decode("utf-8")
+    except UnicodeError:
+        return written
+
+
+def _read_mirrors(html: str) -> Optional[List[Tuple[str, str]]]:
+    """Read the (value, name) pairs of the mirror select in a decoded fragment."""
+    data = parse_html(html, profile=MIRROR_PROFILE)
+    select = data.find("select", {"name": "mirror"})
+    if not select:
+        return None
+    return [
+        (option.get("value") or "", option.text) for option in select.find_all("option")
+    ]
+
+
+def get_script_mirrors(js_code: str) -> Optional[List[Tuple[str, str]]]:
+    """Get the mirror options written by a player script, decoding it once.
+
+    Returns None when the script cannot be decoded or writes no mirror select.
+    """
+    key = content_hash(js_code)
+    entry = _mirrors.get(key)
+    if entry is not None:
+        logger.debug("Reusing decoded player script")
+        return entry[2]
+
+    try:
+        decoded = decode_player_script(js_code)
+        mirrors = _read_mirrors(decoded) if decoded else None
+    except Exception as e:
+        logger.error(f"Error decoding player script: {e}")
+        return None
+
+    if mirrors is not None:
+        expires_at = time() + PLAYER_CACHE_TTL
+        _mirrors.set(key, mirrors, expires_at, expires_at)
+    return mirrors
+
+
+# src of the first iframe in a decoded mirror fragment
+_IFRAME_SRC = re.compile(
+    r"""<iframe\b[^>]*?\ssrc\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""",
+    re.IGNORECASE,
+)
+
+
+def iframe_src(fragment: str) -> Optional[str]:
+    """Get the src of the first iframe in an HTML fragment without parsing it."""
+    match = _IFRAME_SRC.search(fragment)
+    if not match:
+        return None
+    src = next(group for group in match.groups() if group is not None)
+    return unescape(src) or None
+
+
+def resolve_mirror(mirror: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Decode the handle of a mirror into its name and embed URL."""
+    try:
+        src = iframe_src(a2b_base64(mirror["handle"]).decode("utf-8"))
+        if src:
+            return {"name": mirror["name"], "url": src}
+        logger.warning(f"Failed to decode video data for: {mirror['name']}")
+        return None
+    except Exception as e:
+        logger.error(f"Error decoding video data for {mirror.get('name')}: {e}")
+        return None
+
+
+def resolve_mirrors(mirrors: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Decode the handles of all mirrors, leaving out the ones that fail."""
+    players = []
+    for mirror in mirrors:
+        player = resolve_mirror(mirror)
+        if player:
+            players.append(player)
+    return players
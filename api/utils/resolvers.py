@@ -0,0 +1,452 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeout
+from dotenv import load_dotenv
+from os import getenv
+from datetime import datetime, timezone
+from html import unescape
+from urllib.parse import urlparse, urlencode, parse_qsl
+from .client import get_session, get_async_client, TIMEOUT
+from .cache import MemoryCache
+from time import time
+import asyncio
+import re
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Video API resolving OK.ru and Dailymotion embeds into media URLs
+VIDEO_API_URL: str = getenv(
+    "VIDEO_API_URL", "https://fastsavenow.com/wp-json/aio-dl/video-data/"
+)
+VIDEO_API_TOKEN: str = getenv(
+    "VIDEO_API_TOKEN",
+    "a9c0082f6f8e3d7d5a00924c93ffe2deb6a42080ae9a8d25af54dc0b0d46e458",
+)
+
+# Hosts whose embed pages carry <video>/<source> tags to read directly
+EMBED_PAGE_HOSTS: Tuple[str, ...] = tuple(
+    host.strip()
+    for host in getenv("EMBED_PAGE_HOSTS", "anichin.club").split(",")
+    if host.strip()
+)
+
+# Seconds to wait for mirrors, and how many resolved mirrors to return
+RESOLVE_DEADLINE: float = float(getenv("RESOLVE_DEADLINE", 10))
+RESOLVE_MAX_SOURCES: int = int(getenv("RESOLVE_MAX_SOURCES", 3))
+
+# Rank of quality labels without a resolution
+QUALITY_LABELS: Dict[str, int] = {
+    "uhd": 2160,
+    "4k": 2160,
+    "fhd": 1080,
+    "full hd": 1080,
+    "hd": 720,
+    "sd": 480,
+    "low": 240,
+    "mobile": 144,
+}
+
+_RESOLUTION = re.compile(r"(\d{3,4})")
+
+# Query parameters carrying the expiry time of a signed media URL
+EXPIRY_PARAMS: Tuple[str, ...] = (
+    "expires",
+    "expire",
+    "expiry",
+    "exp",
+    "e",
+    "validto",
+    "valid_to",
+    "deadline",
+)
+_TOKEN_EXPIRY = re.compile(r"(?:^|[~&,;:])exp=(\d{10,13})(?!\d)")
+
+# Seconds before a link's expiry that it stops being served from the cache,
+# and how long links without an expiry are kept
+MEDIA_EXPIRY_MARGIN: int = int(getenv("MEDIA_EXPIRY_MARGIN", 120))
+MEDIA_CACHE_TTL: int = int(getenv("MEDIA_CACHE_TTL", 300))
+
+# Resolved media per resolver and embed URL, kept until the links expire
+_media: MemoryCache = MemoryCache(int(getenv("MEDIA_CACHE_ENTRIES", 1024)))
+
+
+def quality_score(media: Dict[str, Any]) -> int:
+    """Rank a media entry by its resolution or quality label."""
+    label = str(media.get("quality") or media.get("label") or "").strip().lower()
+    match = _RESOLUTION.search(label)
+    if match:
+        return int(match.group(1))
+    return QUALITY_LABELS.get(label, 0)
+
+
+def _timestamp(value: str) -> Optional[float]:
+    """Read a Unix timestamp in seconds or milliseconds."""
+    if not value.isdigit():
+        return None
+    stamp = int(value)
+    if stamp > 10**11:
+        stamp //= 1000
+    # Anything before 2001 is a duration or an ID, not an expiry time
+    return float(stamp) if stamp > 10**9 else None
+
+
+def media_expiry(url: str) -> Optional[float]:
+    """Get the time a signed media URL expires, from its query parameters."""
+    expiries: List[float] = []
+    amz_date: Optional[str] = None
+    amz_expires: Optional[str] = None
+    for key, value in parse_qsl(urlparse(url).query):
+        name = key.lower()
+        if name in EXPIRY_PARAMS:
+            stamp = _timestamp(value)
+        elif name == "x-amz-date":
+            amz_date, stamp = value, None
+        elif name == "x-amz-expires":
+            amz_expires, stamp = value, None
+        else:
+            # Tokens such as hdnts=st=...~exp=1700000000~acl=...
+            match = _TOKEN_EXPIRY.search(value)
+            stamp = _timestamp(match.group(1)) if match else None
+        if stamp is not None:
+            expiries.append(stamp)
+
+    if amz_date and amz_expires and amz_expires.isdigit():
+        try:
+            signed_at = datetime.strptime(amz_date, "%Y%m%dT%H%M%SZ")
+            expiries.append(
+                signed_at.replace(tzinfo=timezone.utc).timestamp() + int(amz_expires)
+            )
+        except ValueError:
+            pass
+    return min(expiries) if expiries else None
+
+
+def media_ttl(result: Dict[str, Any], default: float = MEDIA_CACHE_TTL) -> float:
+    """Get how long resolved media stay playable, minus MEDIA_EXPIRY_MARGIN.
+
+    Every media of the result and of its ranked sources is considered; a
+    result without expiring links gets the default.
+    """
+    medias = list(result.get("medias") or [])
+    for source in result.get("sources") or []:
+        medias.extend(source.get("medias") or [])
+
+    expiries = [
+        expiry
+        for expiry in (media_expiry(str(media.get("url", ""))) for media in medias)
+        if expiry is not None
+    ]
+    if not expiries:
+        return default
+    return max(min(expiries) - MEDIA_EXPIRY_MARGIN - time(), 0)
+
+
+def _headers() -> Dict[str, str]:
+    return {
+        "User-Agent": getenv(
+            "USER_AGENT",
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+        )
+    }
+
+
+def add_query(url: str, query_string: str) -> str:
+    """Add query parameters such as "ct=4" to a media URL."""
+    url_parts = urlparse(url)
+    query = dict(parse_qsl(url_parts.query))
+    query.update(
+        dict(param.split("=", 1) for param in query_string.split("&") if "=" in param)
+    )
+    return url_parts._replace(query=urlencode(query)).geturl()
+
+
+class Resolver:
+    """Turns the embed URL of a mirror host into media URLs.
+
+    Subclasses describe one HTTP request and how to read its response, so
+    the same resolver runs on the pooled session and on the async client.
+    """
+
+    name: str = "resolver"
+
+    def __init__(self, *hosts: str) -> None:
+        self.hosts: Tuple[str, ...] = hosts
+
+    def matches(self, url: str) -> bool:
+        """Check whether the embed URL is served by one of the hosts."""
+        hostname = (urlparse(url).hostname or "").lower()
+        return any(
+            hostname == host or hostname.endswith(f".{host}") for host in self.hosts
+        )
+
+    def build_request(self, url: str) -> Tuple[str, str, Dict[str, Any]]:
+        """Get the method, URL and request arguments resolving an embed URL."""
+        raise NotImplementedError
+
+    def read_response(self, response: Any) -> Optional[Dict[str, Any]]:
+        """Read the media of a response as {"medias": [...], ...}, or None."""
+        raise NotImplementedError
+
+    def resolve(self, url: str, timeout: float = TIMEOUT) -> Optional[Dict[str, Any]]:
+        """Resolve an embed URL through the pooled session, reusing live links."""
+        cached = self.__cached(url)
+        if cached is not None:
+            return cached
+        try:
+            method, target, kwargs = self.build_request(url)
+            response = get_session().request(method, target, timeout=timeout, **kwargs)
+            return self.__read(url, response)
+        except Exception as e:
+            logger.error(f"{self.name} failed to resolve {url}: {e}")
+            return None
+
+    async def resolve_async(
+        self, url: str, timeout: float = TIMEOUT
+    ) -> Optional[Dict[str, Any]]:
+        """Resolve an embed URL through the async client, reusing live links."""
+        cached = self.__cached(url)
+        if cached is not None:
+            return cached
+        try:
+            method, target, kwargs = self.build_request(url)
+            response = await get_async_client().request(
+                method, target, timeout=timeout, **kwargs
+            )
+            return self.__read(url, response)
+        except Exception as e:
+            logger.error(f"{self.name} failed to resolve {url}: {e}")
+            return None
+
+    def __read(self, url: str, response: Any) -> Optional[Dict[str, Any]]:
+        if response.status_code != 200:
+            logger.error(
+                f"{self.name} request failed with status code: {response.status_code}"
+            )
+            return None
+        result = self.read_response(response)
+        if not result or not result.get("medias"):
+            logger.warning(f"{self.name} found no media for {url}")
+            return None
+
+        ttl = media_ttl(result)
+        if ttl > 0:
+            expires_at = time() + ttl
+            _media.set(f"{self.name}:{url}", result, expires_at, expires_at)
+        return result
+
+    def __cached(self, url: str) -> Optional[Dict[str, Any]]:
+        entry = _media.get(f"{self.name}:{url}")
+        if entry is None:
+            return None
+        logger.debug(f"Reusing resolved media of {url}")
+        return entry[2]
+
+
+class VideoApiResolver(Resolver):
+    """Resolves embeds through the aio-dl video API (VIDEO_API_URL)."""
+
+    name = "video-api"
+
+    def __init__(
+        self,
+        *hosts: str,
+        rewrite: Optional[Tuple[str, str]] = None,
+        media_query: str = "",
+    ) -> None:
+        super().__init__(*hosts)
+        self.rewrite: Optional[Tuple[str, str]] = rewrite
+        self.media_query: str = media_query
+
+    def build_request(self, url: str) -> Tuple[str, str, Dict[str, Any]]:
+        if self.rewrite:
+            url = url.replace(*self.rewrite)
+        return (
+            "POST",
+            VIDEO_API_URL,
+            {
+                "data": {"url": url, "token": VIDEO_API_TOKEN},
+                "headers": _headers(),
+            },
+        )
+
+    def read_response(self, response: Any) -> Optional[Dict[str, Any]]:
+        results = response.json()
+        if not isinstance(results, dict) or not isinstance(results.get("medias"), list):
+            logger.warning("Invalid results format from video API")
+            return None
+
+        medias = [media for media in results["medias"] if isinstance(media, dict)]
+        if self.media_query:
+            for media in medias:
+                if "url" in media:
+                    media["url"] = add_query(media["url"], self.media_query)
+        return {**results, "medias": medias}
+
+
+# <source src="..." size="720"> or <video src="...">
+_SOURCE_TAG = re.compile(r"<(?:source|video)\b[^>]*>", re.IGNORECASE)
+_TAG_ATTR = re.compile(
+    r"""\s([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE
+)
+
+
+class EmbedPageResolver(Resolver):
+    """Reads the media tags of embed pages that play the video themselves."""
+
+    name = "embed-page"
+
+    def build_request(self, url: str) -> Tuple[str, str, Dict[str, Any]]:
+        return "GET", url, {"headers": _headers()}
+
+    def read_response(self, response: Any) -> Optional[Dict[str, Any]]:
+        medias = []
+        for tag in _SOURCE_TAG.findall(response.text):
+            attrs = {
+                match.group(1).lower(): unescape(
+                    next(g for g in match.groups()[1:] if g is not None)
+                )
+                for match in _TAG_ATTR.finditer(tag)
+            }
+            if not attrs.get("src"):
+                continue
+            filename = urlparse(attrs["src"]).path.rsplit("/", 1)[-1]
+            medias.append(
+                {
+                    "url": attrs["src"],
+                    "quality": attrs.get("size") or attrs.get("label") or "",
+                    "extension": filename.rsplit(".", 1)[-1] if "." in filename else "",
+                }
+            )
+        return {"medias": medias}
+
+
+# One resolver per mirror host, tried in order
+RESOLVERS: List[Resolver] = [
+    VideoApiResolver("ok.ru", rewrite=("videoembed", "video"), media_query="ct=4"),
+    VideoApiResolver("dailymotion.com", rewrite=("/embed/video/", "/video/")),
+    EmbedPageResolver(*EMBED_PAGE_HOSTS),
+]
+
+_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+    max_workers=int(getenv("RESOLVE_WORKERS", 8)), thread_name_prefix="resolver"
+)
+
+
+def register_resolver(resolver: Resolver, first: bool = False) -> None:
+    """Add a resolver, optionally ahead of the built-in ones."""
+    if first:
+        RESOLVERS.insert(0, resolver)
+    else:
+        RESOLVERS.append(resolver)
+
+
+def find_resolver(url: str) -> Optional[Resolver]:
+    """Get the first resolver handling an embed URL."""
+    for resolver in RESOLVERS:
+        if resolver.matches(url):
+            return resolver
+    return None
+
+
+def _jobs(mirrors: List[Dict[str, str]]) -> List[Tuple[Dict[str, str], Resolver]]:
+    jobs = []
+    for mirror in mirrors:
+        resolver = find_resolver(mirror.get("url", ""))
+        if resolver:
+            jobs.append((mirror, resolver))
+        else:
+            logger.debug(f"No resolver for mirror {mirror.get('name')}")
+    return jobs
+
+
+def _source(mirror: Dict[str, str], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine a mirror with its resolved media, best quality first."""
+    medias = sorted(result["medias"], key=quality_score, reverse=True)
+    return {**result, "name": mirror["name"], "url": mirror["url"], "medias": medias}
+
+
+def rank_sources(
+    sources: List[Dict[str, Any]], mirrors: List[Dict[str, str]]
+) -> List[Dict[str, Any]]:
+    """Order resolved mirrors by their best media, then by their page order."""
+    positions = {mirror["url"]: index for index, mirror in enumerate(mirrors)}
+    return sorted(
+        sources,
+        key=lambda source: (
+            -max(map(quality_score, source["medias"]), default=0),
+            positions.get(source["url"], len(positions)),
+        ),
+    )
+
+
+def resolve_sources(
+    mirrors: List[Dict[str, str]],
+    limit: int = RESOLVE_MAX_SOURCES,
+    deadline: float = RESOLVE_DEADLINE,
+) -> List[Dict[str, Any]]:
+    """Resolve mirrors concurrently, keeping the first successes in the deadline."""
+    jobs = _jobs(mirrors)
+    timeout = min(TIMEOUT, deadline)
+    futures = {
+        _executor.submit(resolver.resolve, mirror["url"], timeout): mirror
+        for mirror, resolver in jobs
+    }
+
+    sources: List[Dict[str, Any]] = []
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            result = future.result()
+            if result:
+                sources.append(_source(futures[future], result))
+                if len(sources) >= limit:
+                    break
+    except FutureTimeout:
+        logger.warning(f"Mirror resolution deadline of {deadline}s reached")
+    finally:
+        for future in futures:
+            future.cancel()
+
+    logger.info(f"Resolved {len(sources)} of {len(jobs)} mirrors")
+    return rank_sources(sources, mirrors)
+
+
+async def resolve_sources_async(
+    mirrors: List[Dict[str, str]],
+    limit: int = RESOLVE_MAX_SOURCES,
+    deadline: float = RESOLVE_DEADLINE,
+) -> List[Dict[str, Any]]:
+    """Resolve mirrors concurrently without blocking, within the deadline."""
+    jobs = _jobs(mirrors)
+    timeout = min(TIMEOUT, deadline)
+    tasks = {
+        asyncio.ensure_future(resolver.resolve_async(mirror["url"], timeout)): mirror
+        for mirror, resolver in jobs
+    }
+
+    loop = asyncio.get_running_loop()
+    ends_at = loop.time() + deadline
+    pending = set(tasks)
+    sources: List[Dict[str, Any]] = []
+    try:
+        while pending and len(sources) < limit:
+            remaining = ends_at - loop.time()
+            if remaining <= 0:
+                logger.warning(f"Mirror resolution deadline of {deadline}s reached")
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                result = task.result()
+                if result and len(sources) < limit:
+                    sources.append(_source(tasks[task], result))
+    finally:
+        for task in pending:
+            task.cancel()
+
+    logger.info(f"Resolved {len(sources)} of {len(jobs)} mirrors")
+    return rank_sources(sources, mirrors)
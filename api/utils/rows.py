@@ -0,0 +1,246 @@
+from .backends import Selector
+from html.parser import HTMLParser
+import re
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Elements that never have an end tag
+VOID_ELEMENTS = frozenset(
+    ("area base br col embed hr img input link meta param source track wbr").split()
+)
+
+
+class RowSpec:
+    """Where the rows of a list block are, and which fields each row has.
+
+    ``container`` is a path of selectors such as ``"div.eplister ul"``: the
+    first element matching each selector inside the previous one. Each row is
+    an element matching ``rows`` inside it. Fields map a name to a
+    ``(path, read)`` pair, where the path is relative to the row ("" is the
+    row itself) and read is ``"text"`` (the stripped text), ``"strings"``
+    (every text node stripped, then joined), ``"exists"`` or ``"@attr"``.
+    Like find(), each step of a path only looks inside the first match of the
+    previous step. A field whose element or attribute is missing is None.
+    """
+
+    def __init__(
+        self, container: str, rows: str, fields: Dict[str, Tuple[str, str]]
+    ) -> None:
+        self.container: Tuple[Selector, ...] = tuple(
+            Selector(s) for s in container.split()
+        )
+        self.rows: Selector = Selector(rows)
+        self.fields: List[Tuple[str, Tuple[Selector, ...], str]] = [
+            (name, tuple(Selector(s) for s in path.split()), read)
+            for name, (path, read) in fields.items()
+        ]
+
+        # Rows are looked for from the first opening tag of the outer container
+        first = self.container[0]
+        if first.key == "class":
+            pattern = (
+                rf"<{first.name}\b[^>]*\bclass\s*=\s*[\"']?[^\"'>]*"
+                rf"(?<![\w-]){re.escape(first.value)}(?![\w-])"
+            )
+        elif first.key is not None and first.value is not None:
+            pattern = (
+                rf"<{first.name}\b[^>]*\b{first.key}\s*=\s*[\"']?"
+                rf"{re.escape(first.value)}[\"'\s>]"
+            )
+        else:
+            pattern = rf"<{first.name}\b"
+        self.start: "re.Pattern[str]" = re.compile(pattern, re.IGNORECASE)
+
+
+class _Field:
+    """Progress of one field through the current row."""
+
+    __slots__ = (
+        "name",
+        "path",
+        "read",
+        "step",
+        "scope",
+        "selected",
+        "capture",
+        "pieces",
+        "value",
+    )
+
+    def __init__(self, name: str, path: Tuple[Selector, ...], read: str) -> None:
+        self.name = name
+        self.path = path
+        self.read = read
+        self.step = 0  # Path selectors matched so far, -1 once not found
+        self.scope = 0  # Depth of the element the next step looks inside
+        self.selected = False
+        self.capture = 0  # Depth of the element whose text is collected
+        self.pieces: List[str] = []
+        self.value: Any = None
+
+
+class _RowParser(HTMLParser):
+    """Event-driven parser emitting the rows of a RowSpec as they close."""
+
+    def __init__(self, spec: RowSpec) -> None:
+        super().__init__(convert_charrefs=True)
+        self.spec = spec
+        self.rows: List[Dict[str, Any]] = []
+        self.finished = False
+        self.__stack: List[str] = []
+        self.__container_step = 0
+        self.__container_depth: List[int] = []
+        self.__row_depth = 0
+        self.__fields: Optional[List[_Field]] = None
+        # Whether the last event was text, so more text continues the same node
+        self.__in_text = False
+
+    def __start_row(self, depth: int, attrs: Dict[str, Any]) -> None:
+        self.__row_depth = depth
+        self.__fields = []
+        for name, path, read in self.spec.fields:
+            field = _Field(name, path, read)
+            field.scope = depth
+            if not path:
+                self.__select(field, depth, attrs)
+            self.__fields.append(field)
+
+    def __select(self, field: _Field, depth: int, attrs: Dict[str, Any]) -> None:
+        """The last step of a field's path matched the element at depth."""
+        field.selected = True
+        if field.read == "exists":
+            field.value = True
+        elif field.read.startswith("@"):
+            field.value = attrs.get(field.read[1:])
+            if field.value is None and field.read[1:] in attrs:
+                field.value = ""
+        else:
+            field.capture = depth
+
+    def __finish_row(self) -> None:
+        row: Dict[str, Any] = {}
+        for field in self.__fields or []:
+            if field.selected and field.read == "text":
+                field.value = "".join(field.pieces).strip()
+            elif field.selected and field.read == "strings":
+                field.value = "".join(p.strip() for p in field.pieces)
+            row[field.name] = field.value
+        self.rows.append(row)
+        self.__fields = None
+
+    def handle_starttag(self, tag: str, attrs_list: List[Tuple[str, Any]]) -> None:
+        self.__in_text = False
+        void = tag in VOID_ELEMENTS
+        depth = len(self.__stack) + 1
+        if not void:
+            self.__stack.append(tag)
+        if self.finished:
+            return
+
+        attrs = dict(attrs_list)
+        if self.__container_step < len(self.spec.container):
+            selector = self.spec.container[self.__container_step]
+            if selector.matches(tag, attrs) and not void:
+                self.__container_step += 1
+                self.__container_depth.append(depth)
+            return
+
+        if self.__fields is None:
+            if self.spec.rows.matches(tag, attrs):
+                self.__start_row(depth, attrs)
+                if void:
+                    self.__finish_row()
+            return
+
+        for field in self.__fields:
+            if field.selected or field.step < 0:
+                continue
+            if field.path[field.step].matches(tag, attrs):
+                field.step += 1
+                if field.step == len(field.path):
+                    self.__select(field, depth, attrs)
+                elif void:
+                    field.step = -1
+                else:
+                    field.scope = depth
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Any]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        self.__in_text = False
+        if tag not in self.__stack:
+            return
+        while self.__stack:
+            depth = len(self.__stack)
+            closed = self.__stack.pop()
+            self.__close(depth)
+            if closed == tag:
+                break
+
+    def __close(self, depth: int) -> None:
+        if self.finished:
+            return
+
+        if self.__fields is not None:
+            if depth == self.__row_depth:
+                self.__finish_row()
+                return
+            for field in self.__fields:
+                if field.capture == depth:
+                    field.capture = 0
+                elif not field.selected and field.scope == depth:
+                    # The first match of a step closed without the next step
+                    field.step = -1
+
+        if self.__container_depth and depth == self.__container_depth[-1]:
+            # Only the first match of each container step is searched
+            self.finished = True
+
+    def handle_comment(self, data: str) -> None:
+        self.__in_text = False
+
+    def handle_data(self, data: str) -> None:
+        # A text node cut by a chunk boundary arrives in several calls
+        joined = self.__in_text
+        self.__in_text = True
+        if self.__fields is None:
+            return
+        for field in self.__fields:
+            if not field.capture:
+                continue
+            if joined and field.pieces:
+                field.pieces[-1] += data
+            else:
+                field.pieces.append(data)
+
+
+def iter_rows(
+    html: str, spec: RowSpec, chunk_size: int = 16384
+) -> Iterator[Dict[str, Any]]:
+    """Lazily yield the rows of a list block straight from the page HTML.
+
+    Parsing starts at the block and stops as soon as the block is closed or
+    the caller stops iterating, so no tree is ever built.
+    """
+    match = spec.start.search(html)
+    if not match:
+        logger.debug("List block not found in page")
+        return
+
+    parser = _RowParser(spec)
+    position = match.start()
+    while position < len(html) and not parser.finished:
+        parser.feed(html[position : position + chunk_size])
+        position += chunk_size
+        yield from parser.rows
+        parser.rows.clear()
+
+    if not parser.finished:
+        parser.close()
+        yield from parser.rows
@@ -1,82 +1,38 @@
 from .parsing import Parsing
-from urllib.parse import urlparse
+from .backends import ParseProfile
+from .cards import SEARCH_CARD
+from .listing import read_page_count
+from dotenv import load_dotenv
+from os import getenv
 import logging
-from typing import Dict, List, Optional, Any, Union
-from bs4 import BeautifulSoup, Tag
+from typing import Dict, List, Optional, Union
+from bs4 import BeautifulSoup
+
+load_dotenv()
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Regions of the search page read by the extractor
+PROFILE = ParseProfile("div.bixbox")
+
+# Most result pages, and seconds, a deep search may spend
+DEEP_SEARCH_MAX_PAGES: int = int(getenv("DEEP_SEARCH_MAX_PAGES", 10))
+DEEP_SEARCH_DEADLINE: float = float(getenv("DEEP_SEARCH_DEADLINE", 15))
+
 
 class Search(Parsing):
-    def __init__(self, query: str) -> None:
+    def __init__(self, query: str, page: int = 1) -> None:
         super().__init__()
         self.__query: str = query
-        logger.info(f"Initialized Search for query: {query}")
-
-    def __get_card(self, item: Tag) -> Dict[str, str]:
-        """Extract card information from a search result item."""
-        try:
-            # Extract title
-            title_div = item.find("div", {"class": "tt"})
-            if not title_div:
-                logger.warning("Title div not found in search item")
-                return self.__get_default_card()
-
-            # Extract headline
-            headline_element = title_div.find("h2")
-            headline = headline_element.text.strip() if headline_element else "Unknown"
-
-            # Clean title by removing child elements
-            for child in title_div.find_all():
-                child.extract()
-            title = title_div.text.strip() if title_div.text else "Unknown Title"
-
-            # Extract type
-            type_div = item.find("div", {"class": "typez"})
-            anime_type = type_div.text.strip() if type_div else "Unknown"
-
-            # Extract status
-            status_span = item.find("span", {"class": "epx"})
-            status = status_span.text.strip() if status_span else "Unknown"
-
-            # Extract thumbnail
-            thumbnail_img = item.find("img", {"src": True})
-            thumbnail = ""
-            if thumbnail_img:
-                thumbnail = (
-                    thumbnail_img.get("data-lazy-src") or thumbnail_img.get("src") or ""
-                )
-
-            # Extract URL and slug
-            url_link = item.find("a", {"title": True})
-            if not url_link or not url_link.get("href"):
-                logger.warning("URL link not found in search item")
-                slug = "unknown"
-            else:
-                url = url_link.get("href")
-                slug_path = urlparse(url).path
-                slug = (
-                    slug_path.split("/")[-2]
-                    if slug_path.endswith("/")
-                    else slug_path.split("/")[-1]
-                )
-
-            card_data = {
-                "title": title,
-                "type": anime_type,
-                "headline": headline,
-                "status": status,
-                "thumbnail": thumbnail,
-                "slug": slug,
-            }
+        self.__page: int = page
+        logger.info(f"Initialized Search for query: {query}, page: {page}")
 
-            logger.debug(f"Successfully extracted card data for: {title}")
-            return card_data
-
-        except Exception as e:
-            logger.error(f"Error extracting card data: {e}")
-            return self.__get_default_card()
+    def __get_path(self) -> str:
+        """Get the upstream path of the search result page."""
+        if self.__page > 1:
+            return f"/page/{self.__page}/?s={self.__query}"
+        return f"/?s={self.__query}"
 
     def __get_default_card(self) -> Dict[str, str]:
         """Return default card data when extraction fails."""
@@ -119,19 +75,17 @@ class Search(Parsing):
             articles = wrapper.find_all("article")
             logger.info(f"Found {len(articles)} search results")
 
-            cards = []
-            for i, article in enumerate(articles):
-                try:
-                    card = self.__get_card(article)
-                    cards.append(card)
-                except Exception as card_error:
-                    logger.error(f"Error processing article {i+1}: {card_error}")
-                    continue
+            cards = [
+                card or self.__get_default_card()
+                for card in SEARCH_CARD.extract_all(articles)
+            ]
 
             result = {
                 "results": cards,
                 "query": self.__query,
                 "total": len(cards),
+                "page": self.__page,
+                "total_pages": read_page_count(content, self.__page),
                 "source": self.history_url,
             }
 
@@ -150,36 +104,61 @@ class Search(Parsing):
                 "error": str(e),
             }
 
-    def get_details(self) -> Dict[str, Union[List[Dict[str, str]], str, int]]:
-        """Get search details for the query."""
-        try:
-            logger.info(f"Starting search for query: {self.__query}")
-
-            url = f"/?s={self.__query}"
-            data = self.get_parsed_html(url)
-
-            if not data:
-                logger.error("Failed to get search page data")
-                return {
-                    "results": [],
-                    "query": self.__query,
-                    "total": 0,
-                    "source": self.history_url,
-                    "error": "Failed to fetch search page",
-                }
-
-            return self.__get_home(data)
+    def upstream_url(self) -> str:
+        """Get the normalized upstream URL of the search page."""
+        return self.get_upstream_url(self.__get_path())
 
-        except Exception as e:
-            logger.error(f"Error in get_details for query {self.__query}: {e}")
+    def __get_details(
+        self, data: Optional[BeautifulSoup]
+    ) -> Dict[str, Union[List[Dict[str, str]], str, int]]:
+        """Extract search details from the parsed page."""
+        if not data:
+            logger.error("Failed to get search page data")
             return {
                 "results": [],
                 "query": self.__query,
                 "total": 0,
                 "source": self.history_url,
-                "error": str(e),
+                "error": "Failed to fetch search page",
             }
 
+        return self.__get_home(data)
+
+    def __get_error(
+        self, error: Exception
+    ) -> Dict[str, Union[List[Dict[str, str]], str, int]]:
+        """Build the error payload for a failed search."""
+        logger.error(f"Error in get_details for query {self.__query}: {error}")
+        return {
+            "results": [],
+            "query": self.__query,
+            "total": 0,
+            "source": self.history_url,
+            "error": str(error),
+        }
+
+    def get_details(self) -> Dict[str, Union[List[Dict[str, str]], str, int]]:
+        """Get search details for the query."""
+        try:
+            logger.info(f"Starting search for query: {self.__query}")
+            return self.get_parsed_result(
+                "search", self.__get_path(), self.__get_details, profile=PROFILE
+            )
+        except Exception as e:
+            return self.__get_error(e)
+
+    async def get_details_async(
+        self,
+    ) -> Dict[str, Union[List[Dict[str, str]], str, int]]:
+        """Get search details for the query using the async fetch engine."""
+        try:
+            logger.info(f"Starting search for query: {self.__query}")
+            return await self.get_parsed_result_async(
+                "search", self.__get_path(), self.__get_details, profile=PROFILE
+            )
+        except Exception as e:
+            return self.__get_error(e)
+
 
 if __name__ == "__main__":
     # Configure logging for testing
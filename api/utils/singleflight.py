@@ -0,0 +1,113 @@
+from threading import Event, Lock
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from weakref import WeakKeyDictionary
+import asyncio
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def normalize_url(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Normalize an upstream URL so equivalent requests share one key."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if not path.startswith("/"):
+        path = f"/{path}"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((str(key), str(value)) for key, value in params.items())
+    query_string = urlencode(sorted(query))
+
+    return urlunsplit((scheme, host, path, query_string, ""))
+
+
+class _Call:
+    """A fetch in flight and the result shared with its waiters."""
+
+    def __init__(self) -> None:
+        self.event: Event = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters: int = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key across threads."""
+
+    def __init__(self) -> None:
+        self.__lock: Lock = Lock()
+        self.__calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run fn once per key; concurrent callers wait for and share its result."""
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self.__calls[key] = call
+            else:
+                call.waiters += 1
+
+        if not leader:
+            logger.debug(f"Joined in-flight request for: {key}")
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                self.__calls.pop(key, None)
+            call.event.set()
+            if call.waiters:
+                logger.info(f"Shared result of {key} with {call.waiters} waiters")
+
+
+class AsyncSingleFlight:
+    """Coalesce concurrent coroutine calls with the same key on an event loop."""
+
+    def __init__(self) -> None:
+        # Futures can only be awaited on the loop that created them
+        self.__calls: (
+            "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]"
+        ) = WeakKeyDictionary()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn once per key; concurrent callers await the same task."""
+        calls = self.__calls.setdefault(asyncio.get_running_loop(), {})
+
+        task = calls.get(key)
+        if task is not None:
+            logger.debug(f"Joined in-flight request for: {key}")
+        else:
+            task = asyncio.ensure_future(fn())
+            calls[key] = task
+
+            def _done(finished: asyncio.Future) -> None:
+                if calls.get(key) is finished:
+                    del calls[key]
+
+            task.add_done_callback(_done)
+
+        # A cancelled waiter must not cancel the fetch shared by the others
+        return await asyncio.shield(task)
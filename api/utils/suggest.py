@@ -0,0 +1,138 @@
+from bisect import bisect_left, insort
+from dotenv import load_dotenv
+from os import getenv
+from threading import Lock
+from .cards import observe_cards, series_slug
+from .fuzzy import fold
+import logging
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Suggestions returned by default, and at most
+SUGGEST_LIMIT: int = int(getenv("SUGGEST_LIMIT", 10))
+SUGGEST_MAX_LIMIT: int = int(getenv("SUGGEST_MAX_LIMIT", 50))
+
+Key = Tuple[str, str]
+
+
+class PrefixIndex:
+    """Sorted arrays of series titles and slugs searched by binary search.
+
+    Whole titles and slugs are matched first, in alphabetical order so a
+    shorter title comes before the longer ones it starts; then titles with a
+    later word starting with the query ("sky" for "Against the Sky").
+    """
+
+    def __init__(self) -> None:
+        self.__heads: List[Key] = []
+        self.__words: List[Key] = []
+        self.__cards: Dict[str, Dict[str, Any]] = {}
+        self.__lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.__cards)
+
+    def __keys(
+        self, card: Dict[str, Any], names: Iterable[str], slug: str
+    ) -> Tuple[Set[Key], Set[Key]]:
+        """Get the (head, word) keys of a series."""
+        # Slugs are folded like titles, so "against-the-s" matches as typed
+        heads: Set[Key] = {(fold(slug), slug)}
+        words: Set[Key] = set()
+        for title in [card.get("title") or "", *names]:
+            folded = fold(title)
+            if not folded:
+                continue
+            heads.add((folded, slug))
+            parts = folded.split()
+            words.update((" ".join(parts[i:]), slug) for i in range(1, len(parts)))
+        return heads, words
+
+    def add(self, card: Dict[str, Any], names: Iterable[str] = ()) -> None:
+        """Index a series card under its title, slug and any other names."""
+        self.add_many([(card, list(names))])
+
+    def add_cards(self, cards: List[Dict[str, Any]]) -> None:
+        """Index a batch of scraped cards."""
+        self.add_many([(card, []) for card in cards])
+
+    def add_many(self, titles: Iterable[Tuple[Dict[str, Any], List[str]]]) -> int:
+        """Index (card, names) pairs, keeping the arrays sorted."""
+        heads: Set[Key] = set()
+        words: Set[Key] = set()
+        cards: Dict[str, Dict[str, Any]] = {}
+        for card, names in titles:
+            slug = series_slug(card.get("slug") or "")
+            if not slug or slug == "unknown":
+                continue
+            cards[slug] = {**card, "slug": slug}
+            card_heads, card_words = self.__keys(card, names, slug)
+            heads |= card_heads
+            words |= card_words
+
+        with self.__lock:
+            for slug, card in cards.items():
+                # Listing cards describe the series; home cards describe an episode
+                if slug not in self.__cards or "eps" not in card:
+                    self.__cards[slug] = card
+            self.__merge(self.__heads, heads)
+            self.__merge(self.__words, words)
+        return len(cards)
+
+    def __merge(self, keys: List[Key], new: Set[Key]) -> None:
+        """Add new keys to a sorted array, skipping the ones already in it."""
+        new = {key for key in new if not self.__contains(keys, key)}
+        if len(new) * 8 < len(keys):
+            for key in new:
+                insort(keys, key)
+        else:
+            keys.extend(new)
+            keys.sort()
+
+    def __contains(self, keys: List[Key], key: Key) -> bool:
+        position = bisect_left(keys, key)
+        return position < len(keys) and keys[position] == key
+
+    def __scan(
+        self, keys: List[Key], prefix: str, limit: int, found: List[str]
+    ) -> None:
+        """Add the slugs of keys starting with prefix until limit are found."""
+        position = bisect_left(keys, (prefix, ""))
+        while position < len(keys) and len(found) < limit:
+            key, slug = keys[position]
+            if not key.startswith(prefix):
+                break
+            if slug not in found:
+                found.append(slug)
+            position += 1
+
+    def lookup(self, query: str, limit: int = SUGGEST_LIMIT) -> List[Dict[str, Any]]:
+        """Get up to limit series whose title, slug or a title word starts with query."""
+        prefix = fold(query)
+        if not prefix:
+            return []
+
+        found: List[str] = []
+        with self.__lock:
+            self.__scan(self.__heads, prefix, limit, found)
+            self.__scan(self.__words, prefix, limit, found)
+            cards = [self.__cards[slug] for slug in found]
+
+        return [
+            {
+                "title": card.get("title"),
+                "slug": card["slug"],
+                "type": card.get("type"),
+                "thumbnail": card.get("thumbnail"),
+            }
+            for card in cards
+        ]
+
+
+# Titles and slugs of every series card the scrapers extract
+SUGGEST_INDEX: PrefixIndex = PrefixIndex()
+observe_cards(SUGGEST_INDEX.add_cards)
@@ -0,0 +1,147 @@
+from dotenv import load_dotenv
+from os import getenv
+from time import sleep, time
+from .cards import series_slug
+from .catalog import Catalog
+from .crawler import Crawler
+from .home import Home
+import logging
+from typing import Any, Dict, List, Optional
+
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Seconds between two sync cycles
+SYNC_INTERVAL: float = float(getenv("SYNC_INTERVAL", 300))
+
+# Home pages read per cycle; page 1 lists the latest releases
+SYNC_HOME_PAGES: int = int(getenv("SYNC_HOME_PAGES", 1))
+
+
+class Sync:
+    """Keeps the catalog index current from the episode counts on the home page.
+
+    Each cycle reads the home sections, compares the episode badge of every
+    card with the latest episode stored for its series, and refetches only
+    the series that moved on or are not indexed yet.
+    """
+
+    def __init__(self, crawler: Crawler, pages: int = SYNC_HOME_PAGES) -> None:
+        self.crawler: Crawler = crawler
+        self.catalog: Catalog = crawler.catalog
+        self.pages: int = pages
+        logger.info(f"Initialized catalog sync (home pages: {pages})")
+
+    def get_cards(self) -> Dict[str, Dict[str, Any]]:
+        """Get the home card with the highest episode of every listed series."""
+        latest: Dict[str, Dict[str, Any]] = {}
+        for page in range(1, self.pages + 1):
+            home = self.crawler.throttle.run(lambda: Home(page).get_details())
+            if home.get("error"):
+                raise RuntimeError(f"Home page {page} failed: {home['error']}")
+            for section in home["results"]:
+                for card in section["cards"]:
+                    if card.get("eps") is None:
+                        continue
+                    slug = series_slug(card["slug"])
+                    if slug not in latest or card["eps"] > latest[slug]["eps"]:
+                        latest[slug] = {
+                            **card,
+                            "slug": slug,
+                            "episode_slug": card["slug"],
+                        }
+        return latest
+
+    def get_changed(self, cards: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Get the cards whose series has an episode the index does not."""
+        stored = self.catalog.latest_episodes(cards)
+        return [
+            card
+            for slug, card in cards.items()
+            if slug not in stored or self.__is_newer(card, stored[slug])
+        ]
+
+    def __is_newer(self, card: Dict[str, Any], latest: Optional[int]) -> bool:
+        """Whether a home card shows an episode after the stored latest one."""
+        if latest is not None:
+            return card["eps"] > latest
+        # Episode labels without a number: compare the episode the card links to
+        return not self.catalog.has_episode(card["slug"], card["episode_slug"])
+
+    def update(self, card: Dict[str, Any]) -> bool:
+        """Refetch the info of a changed series, adding it if it is new."""
+        slug = card["slug"]
+        try:
+            info = self.crawler.get_info(slug)
+            if info.get("error"):
+                logger.warning(f"Info of {slug} failed: {info['error']}")
+                return False
+            if self.catalog.save_info(slug, info):
+                return True
+            # Not listed by the last crawl yet, so it has no listing position
+            listing_card = {
+                "slug": slug,
+                "title": card.get("title"),
+                "type": card.get("type"),
+                "headline": card.get("headline"),
+                "status": info["result"].get("status"),
+                "thumbnail": card.get("thumbnail"),
+            }
+            self.catalog.save_series(listing_card, info)
+            return True
+        except Exception as e:
+            logger.error(f"Error syncing {slug}: {e}")
+            return False
+
+    def run_once(self) -> Dict[str, Any]:
+        """Run one sync cycle and return its statistics."""
+        started = time()
+        try:
+            cards = self.get_cards()
+        except Exception as e:
+            logger.error(f"Sync skipped: {e}")
+            return {"cards": 0, "changed": [], "updated": 0, "error": str(e)}
+
+        changed = self.get_changed(cards)
+        updated = sum(1 for card in changed if self.update(card))
+        stats: Dict[str, Any] = {
+            "cards": len(cards),
+            "changed": [card["slug"] for card in changed],
+            "updated": updated,
+            "requests": self.pages + len(changed),
+            "seconds": round(time() - started, 1),
+        }
+        self.catalog.set_meta("synced_at", str(time()))
+        logger.info(f"Sync finished: {stats}")
+        return stats
+
+    def run_forever(self, interval: float = SYNC_INTERVAL) -> None:
+        """Run sync cycles every interval seconds."""
+        while True:
+            self.run_once()
+            sleep(interval)
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Sync the catalog index from the home page")
+    parser.add_argument("--db", default=getenv("CATALOG_DB") or "catalog.db")
+    parser.add_argument("--pages", type=int, default=SYNC_HOME_PAGES)
+    parser.add_argument("--interval", type=float, default=SYNC_INTERVAL)
+    parser.add_argument("--once", action="store_true")
+    args = parser.parse_args()
+
+    # Configure logging for the sync
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    sync = Sync(Crawler(Catalog(args.db)), args.pages)
+    if args.once:
+        print(sync.run_once())
+    else:
+        sync.run_forever(args.interval)
@@ -1,7 +1,7 @@
 from .parsing import Parsing
 from urllib.parse import urlparse
 import re
-from time import strptime
+from .dates import normalize_date
 
 
 class Info(Parsing):
@@ -63,8 +63,7 @@ class Info(Parsing):
             subtitle = item.find("div", {"class": "epl-title"}).get_text(strip=True)
             eps = item.find("div", {"class": "epl-num"}).get_text(strip=True)
             date = item.find("div", {"class": "epl-date"}).get_text(strip=True)
-            date = strptime(date.replace(",", ""), "%B %d %Y")
-            date = f"{date.tm_mon}/{date.tm_mday}/{date.tm_year}"
+            date = normalize_date(date)
             res = dict(
                 slug=slug,
                 subtitle=subtitle,
@@ -0,0 +1,378 @@
+import logging
+import sys
+from typing import Text, Dict, Any, Tuple
+import json
+from quart import Quart, Response, jsonify, request
+from quart_cors import cors
+from api import Main
+from api.utils.params import (
+    ParamError,
+    episode_params,
+    episodes_params,
+    listing_pages,
+    number,
+    require,
+    search_params,
+    suggest_params,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[
+        logging.FileHandler("anichin_api.log"),
+        logging.StreamHandler(sys.stdout),
+    ],
+)
+
+logger = logging.getLogger(__name__)
+
+app = Quart(__name__)
+main = Main()
+
+# Configure CORS
+app = cors(app, allow_origin="*")
+
+
+@app.after_serving
+async def shutdown() -> None:
+    """Close pooled upstream connections when the server stops."""
+    await main.close_async()
+
+
+@app.get("/")
+async def read_root() -> Tuple[Dict[str, Any], int]:
+    """
+    Get home page
+    params: page (optional) - int
+    return: JSON
+    """
+    try:
+        page_num = number(request.args, "page", "home", 1)
+        logger.info(f"Home page request with page: {page_num}")
+        result = await main.get_home_async(page_num)
+        logger.info(f"Successfully served home page {page_num}")
+        return result, 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in read_root: {err}")
+        return jsonify(message=str(err)), 500
+
+
+@app.get("/search/<query>")
+async def search(query: str) -> Tuple[Dict[str, Any], int]:
+    """
+    Search donghua by query
+    params: query - string (required)
+    query: page (optional) - int, deep (optional) - 1 to stream every result
+           page as NDJSON, max_pages (optional) - int, pages a deep search reads,
+           fuzzy (optional) - 1 to match known titles despite typos
+    return: JSON, or NDJSON lines for a deep search
+    """
+    try:
+        params = search_params(query, request.args)
+        query = params["query"]
+
+        if params["fuzzy"]:
+            logger.info(f"Fuzzy search request for query: {query}")
+            result = await main.search_fuzzy_async(query)
+            logger.info(f"Successfully served fuzzy search results for: {query}")
+            return result, 200
+
+        if params["deep"]:
+            max_pages = params["max_pages"]
+            logger.info(
+                f"Deep search request for query: {query}, max pages: {max_pages}"
+            )
+            lines = main.search_deep_async(query, max_pages)
+
+            async def generate():
+                async for line in lines:
+                    yield json.dumps(line) + "\n"
+
+            return Response(generate(), mimetype="application/x-ndjson"), 200
+
+        page_num = params["page"]
+        logger.info(f"Search request for query: {query}, page: {page_num}")
+        result = await main.search_async(query, page_num)
+        logger.info(f"Successfully served search results for: {query}")
+        return result, 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in search for query '{query}': {err}")
+        return jsonify(message=str(err)), 500
+
+
+@app.get("/suggest")
+async def suggest() -> Tuple[Dict[str, Any], int]:
+    """
+    Suggest donghua titles for a search box
+    query: q - string (required), prefix of a title or slug,
+           limit (optional) - int, number of suggestions
+    return: JSON
+    """
+    try:
+        query, limit_num = suggest_params(request.args)
+        result = await main.suggest_async(query, limit_num)
+        logger.info(f"Served {result['total']} suggestions for: {query}")
+        return result, 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in suggest for query '{request.args.get('q')}': {err}")
+        return jsonify(message=str(err)), 500
+
+
+@app.get("/<slug>")
+async def get_info(slug: Text) -> Tuple[Dict[str, Any], int]:
+    """
+    Show detail of donghua
+    params: slug name of donghua - string (required)
+    return: JSON
+    """
+    try:
+        slug = require(slug, "Slug cannot be empty")
+        logger.info(f"Info request for slug: {slug}")
+        data = await main.get_info_async(slug)
+
+        if data.get("result") is None and data.get("error"):
+            logger.warning(f"Info not found for slug: {slug}")
+            return jsonify(message="Anime not found"), 404
+
+        logger.info(f"Successfully served info for: {slug}")
+        return data, 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in get_info for slug '{slug}': {err}")
+        return jsonify(message=str(err)), 500
+
+
+@app.get("/<slug>/episodes")
+async def get_episodes(slug: Text) -> Tuple[Dict[str, Any], int]:
+    """
+    Show the episode list of donghua, one page at a time
+    params: slug name of donghua - string (required)
+    query: page (optional) - int, limit (optional) - int, max 500
+    return: JSON
+    """
+    try:
+        slug, page_num, limit_num = episodes_params(slug, request.args)
+        logger.info(f"Episodes request for slug: {slug}, page: {page_num}")
+        data = await main.get_episodes_async(slug, page_num, limit_num)
+
+        if data.get("error"):
+            logger.warning(f"Episodes not found for slug: {slug}")
+            return jsonify(message="Anime not found"), 404
+
+        logger.info(f"Successfully served episodes of {slug} page {page_num}")
+        return jsonify(data), 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in get_episodes for slug '{slug}': {err}")
+        return jsonify(message=str(err)), 500
+
+
+@app.get("/genres")
+async def list_genres() -> Tuple[Dict[str, Any], int]:
+    """
+    Show list of genres
+    return: JSON
+    """
+    try:
+        logger.info("Genres list request")
+        data = await main.genres_async()
+        logger.info("Successfully served genres list")
+        return data, 200
+
+    except Exception as err:
+        logger.error(f"Error in list_genres: {err}")
+        return jsonify(message=str(err)), 500
+
+
+@app.get("/genre/<slug>")
+async def get_genres(slug: str) -> Tuple[Dict[str, Any], int]:
+    """
+    Show list of donghua by genre
+    params: slug genre - string (required)
+    query: page (optional) - int, pages (optional) - range such as 1-5,
+           limit (optional) - int, number of cards from page onwards
+    return: JSON
+    """
+    try:
+        slug = require(slug, "Genre slug cannot be empty")
+        page_num = number(request.args, "page", "genre", 1)
+        pages, limit = listing_pages(request.args, "genre", page_num)
+
+        if pages:
+            logger.info(f"Genre request for slug: {slug}, pages: {pages}")
+            data = await main.genre_pages_async(slug, pages, limit)
+            logger.info(f"Successfully served genre {slug} pages {pages}")
+            return jsonify(data), 200
+
+        logger.info(f"Genre request for slug: {slug}, page: {page_num}")
+
+        data = await main.genres_async(slug, page_num)
+        logger.info(f"Successfully served genre {slug} page {page_num}")
+        return jsonify(data), 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in get_genres for slug '{slug}': {err}")
+        return jsonify(message=str(err)), 500
+
+
+@app.get("/episode/<slug>")
+async def get_episode(slug: Text) -> Tuple[Dict[str, Any], int]:
+    """
+    Get detail of episode
+    params: slug episode - string (required)
+    query: players (optional) - "handles" (default) or "resolve",
+           video (optional) - 1 to include resolved video sources
+    return: JSON
+    """
+    try:
+        slug, resolve, video = episode_params(slug, request.args)
+        logger.info(f"Episode request for slug: {slug}")
+        data = await main.get_episode_async(slug, resolve=resolve, video=video)
+
+        if data.get("result") is None and data.get("error"):
+            logger.warning(f"Episode not found for slug: {slug}")
+            return jsonify(message="Episode not found"), 404
+
+        logger.info(f"Successfully served episode: {slug}")
+        return jsonify(data), 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in get_episode for slug '{slug}': {err}")
+        return jsonify(message=str(err)), 500
+
+
+@app.get("/episode/<slug>/mirror/<int:mirror>")
+async def get_episode_mirror(slug: Text, mirror: int) -> Tuple[Dict[str, Any], int]:
+    """
+    Get the embed URL of one mirror of an episode
+    params: slug episode - string (required), mirror - int (required)
+    return: JSON
+    """
+    try:
+        slug = require(slug, "Episode slug cannot be empty")
+        logger.info(f"Mirror {mirror} request for episode: {slug}")
+        data = await main.get_episode_mirror_async(slug, mirror)
+
+        if data.get("result") is None:
+            logger.warning(f"Mirror {mirror} not found for episode: {slug}")
+            return jsonify(message="Mirror not found"), 404
+
+        logger.info(f"Successfully served mirror {mirror} of episode: {slug}")
+        return jsonify(data), 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in get_episode_mirror for slug '{slug}': {err}")
+        return jsonify(message=str(err)), 500
+
+
+@app.get("/video-source/<slug>")
+async def get_video(slug: Text) -> Tuple[Dict[str, Any], int]:
+    """
+    Show list of video source
+    params: slug - string (required)
+    return: JSON
+    """
+    try:
+        slug = require(slug, "Video slug cannot be empty")
+        logger.info(f"Video source request for slug: {slug}")
+        data = await main.get_video_source_async(slug)
+
+        if not data:
+            logger.warning(f"Video source not found for slug: {slug}")
+            return jsonify(message="Video source not found"), 404
+
+        logger.info(f"Successfully served video source: {slug}")
+        return jsonify(data), 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in get_video for slug '{slug}': {err}")
+        return jsonify(message=str(err)), 500
+
+
+@app.get("/anime")
+async def anime() -> Tuple[Dict[str, Any], int]:
+    """
+    Show list of anime
+    query: upstream filters (optional), pages (optional) - range such as 1-5,
+           limit (optional) - int, number of cards from page onwards
+    return: JSON
+    """
+    try:
+        logger.info("Anime list request")
+        req = request.args
+        params_dict = {k: v for k, v in req.items() if k not in ("pages", "limit")}
+
+        page = req.get("page")
+        start = int(page) if page and page.isdigit() else 1
+        pages, limit = listing_pages(req, "anime list", start)
+
+        if pages:
+            logger.debug(f"Anime list parameters: {params_dict}, pages: {pages}")
+            data = await main.anime_pages_async(pages, limit, params=params_dict)
+            logger.info(f"Successfully served anime list pages {pages}")
+            return jsonify(data), 200
+
+        logger.debug(f"Anime list parameters: {params_dict}")
+        data = await main.anime_async(params=params_dict)
+        logger.info("Successfully served anime list")
+        return jsonify(data), 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in anime: {err}")
+        return jsonify(message=str(err)), 500
+
+
+@app.errorhandler(404)
+async def not_found(error) -> Tuple[Dict[str, str], int]:
+    """Handle 404 errors."""
+    logger.warning(f"404 error: {request.url}")
+    return jsonify(message="Endpoint not found"), 404
+
+
+@app.errorhandler(500)
+async def internal_error(error) -> Tuple[Dict[str, str], int]:
+    """Handle 500 errors."""
+    logger.error(f"500 error: {error}")
+    return jsonify(message="Internal server error"), 500
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    logger.info("Starting Anichin API ASGI server")
+    uvicorn.run(app, host="0.0.0.0", port=5000)
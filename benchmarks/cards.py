@@ -0,0 +1,101 @@
+"""Compare per-card extraction cost of the card engine with per-field find() calls.
+
+Usage: python -m benchmarks.cards [--rounds N]
+"""
+
+from argparse import ArgumentParser
+from time import perf_counter
+from urllib.parse import urlparse
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from api.utils import backends
+from api.utils.cards import LISTING_CARD
+from . import fixtures
+
+
+def find_card(item: Any) -> Optional[Dict[str, str]]:
+    """Extract a card with one find() per field and a destructive title cleanup."""
+    title_div = item.find("div", {"class": "tt"})
+    if not title_div:
+        return None
+
+    headline_element = title_div.find("h2")
+    headline = headline_element.text.strip() if headline_element else "Unknown"
+    for child in title_div.find_all():
+        child.extract()
+    title = title_div.text.strip() if title_div.text else "Unknown Title"
+
+    type_div = item.find("div", {"class": "typez"})
+    status_span = item.find("span", {"class": "epx"})
+    thumbnail_img = item.find("img", {"src": True})
+    thumbnail = ""
+    if thumbnail_img:
+        thumbnail = thumbnail_img.get("data-lazy-src") or thumbnail_img.get("src") or ""
+
+    url_link = item.find("a", {"title": True})
+    if not url_link or not url_link.get("href"):
+        return None
+    slug_path = urlparse(url_link.get("href")).path
+    slug = (
+        slug_path.split("/")[-2]
+        if slug_path.endswith("/")
+        else slug_path.split("/")[-1]
+    )
+
+    return {
+        "title": title,
+        "type": type_div.text.strip() if type_div else "Unknown",
+        "headline": headline,
+        "status": status_span.text.strip() if status_span else "Unknown",
+        "thumbnail": thumbnail,
+        "slug": slug,
+    }
+
+
+def _articles(html: str, backend: str) -> List[Any]:
+    return backends.parse_html(html, backend).find("div", "listupd").find_all("article")
+
+
+def _time_per_card(
+    html: str, backend: str, extract: Callable[[Any], Any], rounds: int
+) -> float:
+    """Get the mean extraction time per card in microseconds, excluding parsing."""
+    elapsed = 0.0
+    cards = 0
+    for _ in range(rounds):
+        # find_card mutates the tree, so every round extracts from a fresh parse
+        articles = _articles(html, backend)
+        start = perf_counter()
+        for article in articles:
+            extract(article)
+        elapsed += perf_counter() - start
+        cards += len(articles)
+    return elapsed / cards * 1_000_000
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'backend':<12} {'cards':>5} {'find() us':>10} {'engine us':>10}  output")
+    for backend, available in backends.BACKENDS.items():
+        if not available:
+            continue
+        for count in (20, 40):
+            html = fixtures.listing_page(n=count)
+            same = [find_card(a) for a in _articles(html, backend)] == [
+                LISTING_CARD.extract(a) for a in _articles(html, backend)
+            ]
+            legacy = _time_per_card(html, backend, find_card, args.rounds)
+            engine = _time_per_card(html, backend, LISTING_CARD.extract, args.rounds)
+            print(
+                f"{backend:<12} {count:>5} {legacy:>10.1f} {engine:>10.1f}  "
+                f"{'same' if same else 'DIFFERS'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare episode-list extraction from a parsed tree with the streaming extractor.
+
+Usage: python -m benchmarks.episodes [--episodes N] [--rounds N]
+"""
+
+from argparse import ArgumentParser
+from itertools import islice
+from time import perf_counter
+from urllib.parse import urlparse
+import logging
+from typing import Any, Callable, Dict, List
+
+from api.utils import backends
+from api.utils.dates import normalize_date
+from api.utils.info import Info
+from . import fixtures
+
+
+def find_rows(info: Info, data: Any) -> List[Dict[str, Any]]:
+    """Extract the episode rows with four find() calls per row."""
+    rows = []
+    for i, item in enumerate(data.find("div", {"class": "eplister"}).find_all("li")):
+        link = item.find("a")
+        if not link or not link.get("href"):
+            continue
+        subtitle = item.find("div", {"class": "epl-title"})
+        date = item.find("div", {"class": "epl-date"})
+        eps = item.find("div", {"class": "epl-num"})
+        rows.append(
+            {
+                "slug": urlparse(link["href"]).path.strip("/"),
+                "subtitle": subtitle.text.strip() if subtitle else f"Episode {i+1}",
+                "date": normalize_date(date.text.strip()) if date else "Unknown Date",
+                "episode": eps.text.strip() if eps else None,
+                "thumbnail": None,
+            }
+        )
+    return rows
+
+
+def _time(fn: Callable[[], Any], rounds: int) -> float:
+    """Get the mean run time of fn in milliseconds."""
+    start = perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (perf_counter() - start) / rounds * 1000
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    html = fixtures.info_page(n_episodes=args.episodes)
+    info = Info("bench")
+    streamed = list(info.iter_episodes(html))
+    print(f"{args.episodes} episodes, mean of {args.rounds} rounds")
+
+    for backend, available in backends.BACKENDS.items():
+        if not available:
+            continue
+        same = find_rows(info, backends.parse_html(html, backend)) == streamed
+        tree = _time(
+            lambda: find_rows(info, backends.parse_html(html, backend)), args.rounds
+        )
+        print(
+            f"  {backend:<12} parse + find() per row: {tree:8.2f} ms  "
+            f"{'same' if same else 'DIFFERS'}"
+        )
+
+    every = _time(lambda: list(info.iter_episodes(html)), args.rounds)
+    first = _time(lambda: list(islice(info.iter_episodes(html), 50)), args.rounds)
+    print(f"  {'streaming':<12} all rows:               {every:8.2f} ms")
+    print(f"  {'streaming':<12} first 50 rows:          {first:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
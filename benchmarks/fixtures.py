@@ -0,0 +1,220 @@
+"""Synthetic pages shaped like the upstream markup, used by the benchmarks."""
+
+import base64
+
+MONTHS = [
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+]
+
+HEAD = (
+    """<!DOCTYPE html><html><head><title>Anichin</title>
+<script>var x = 1; function f(){return x;}</script>
+<style>body{color:red}</style></head><body>
+<div id="header"><nav><ul>"""
+    + "".join(f'<li><a href="/m{i}">Menu {i}</a></li>' for i in range(30))
+    + """</ul></nav></div>
+"""
+)
+
+SIDEBAR = (
+    '<div id="sidebar">'
+    + "".join(
+        f'<div class="section"><h3>Popular {i}</h3><ul>'
+        + "".join(
+            f'<li><a href="https://anichin.club/pop-{i}-{j}/"><img src="https://img/p{j}.jpg"/>Pop {i}-{j}</a><span>Genre</span></li>'
+            for j in range(10)
+        )
+        + "</ul></div>"
+        for i in range(4)
+    )
+    + "</div>"
+)
+
+FOOT = (
+    '<div id="footer">'
+    + "<p>footer text</p>" * 20
+    + "</div><script>console.log('x')</script></body></html>"
+)
+
+
+def card(i, eps=True, episode_link=False):
+    slug = f"series-{i}"
+    href = (
+        f"https://anichin.club/{slug}-episode-{i % 50 + 1}-subtitle-indonesia/"
+        if episode_link
+        else f"https://anichin.club/anime/{slug}/"
+    )
+    epx = (
+        f'<span class="epx">Ep {i % 50 + 1}</span>'
+        if eps
+        else '<span class="epx">Ongoing</span>'
+    )
+    return f"""<article class="bs"><div class="bsx"><a href="{href}" itemprop="url" title="Series {i} Title" class="tip" rel="{i}">
+<div class="limit"><div class="typez Donghua">Donghua</div><div class="ply"><i class="far fa-play-circle"></i></div>
+<div class="bt">{epx}<span class="sb Sub">Sub</span></div>
+<img src="https://anichin.club/img/{i}.jpg" class="ts-post-image" loading="lazy" title="Series {i}" alt="Series {i}"/></div>
+<div class="tt"> Series {i} Title <h2 itemprop="headline">Series {i} Title Episode {i % 50 + 1}</h2></div></a></div></article>"""
+
+
+def pagination(page, total):
+    links = "".join(
+        f'<a class="page-numbers" href="/page/{p}/">{p}</a>'
+        for p in range(1, total + 1)
+        if p != page
+    )
+    return f'<div class="pagination"><span aria-current="page" class="page-numbers current">{page}</span>{links}<a class="next page-numbers" href="/page/{page + 1}/">Next »</a></div>'
+
+
+def home_page(page=1, n=24, offset=0):
+    sections = ""
+    for s, name in enumerate(["Latest Release", "Recommendation", "Completed"]):
+        sections += f'<div class="bixbox bbnofrm"><div class="releases latesthome"><h3>{name}</h3></div><div class="listupd normal">'
+        sections += "".join(
+            card(offset + s * 100 + i, episode_link=(s == 0)) for i in range(n)
+        )
+        sections += "</div></div>"
+    return (
+        HEAD
+        + f'<div id="content"><div class="postbody">{sections}</div>{SIDEBAR}</div>'
+        + FOOT
+    )
+
+
+def listing_page(n=20, offset=0, page=1, total_pages=1, form=True):
+    form_html = ""
+    if form:
+        form_html = (
+            '<div class="filter"><form>'
+            + "".join(
+                f'<li><input type="checkbox" name="genre[]" value="{g}"/>{g}</li>'
+                for g in [
+                    "action",
+                    "adventure",
+                    "comedy",
+                    "cultivation",
+                    "fantasy",
+                    "martial-arts",
+                    "romance",
+                    "sci-fi",
+                ]
+            )
+            + "</form></div>"
+        )
+    body = f'<div class="bixbox"><div class="releases"><h1>List</h1></div>{form_html}<div class="listupd">'
+    body += "".join(card(offset + i, eps=False) for i in range(n))
+    body += (
+        "</div>" + (pagination(page, total_pages) if total_pages > 1 else "") + "</div>"
+    )
+    return (
+        HEAD
+        + f'<div id="content"><div class="postbody">{body}</div>{SIDEBAR}</div>'
+        + FOOT
+    )
+
+
+def info_page(n_episodes=200, status="Ongoing"):
+    eps = "".join(
+        f'<li data-index="{i}"><a href="https://anichin.club/series-x-episode-{n_episodes - i}-subtitle-indonesia/">'
+        f'<div class="epl-num">{n_episodes - i}</div><div class="epl-title">Series X Episode {n_episodes - i} Subtitle Indonesia</div>'
+        f'<div class="epl-sub"><span class="status Sub">Sub</span></div>'
+        f'<div class="epl-date">{MONTHS[i % 12]} {i % 28 + 1}, {2020 + i % 5}</div></a></li>'
+        for i in range(n_episodes)
+    )
+    body = f"""<article id="post-1" class="hentry"><div class="bixbox animefull"><div class="bigcontent">
+<div class="thumbook"><div class="thumb"><img src="https://anichin.club/img/x.jpg" class="ts-post-image" title="Series X"/></div>
+<div class="rt"><div class="rating"><strong>Rating 8.5</strong><div class="numscore">8.5</div></div></div></div>
+<div class="infox"><h1 class="entry-title" itemprop="name">Series X</h1>
+<div class="ninfo"><span class="alter">Xi Lie, Series Ex</span><div class="info-content"><div class="spe">
+<span><b>Status:</b> {status}</span><span><b>Network:</b> Bilibili</span><span><b>Studio:</b> Studio X</span>
+<span><b>Released:</b> 2020</span><span><b>Duration:</b> 20 min</span><span><b>Season:</b> Fall</span>
+<span><b>Country:</b> China</span><span><b>Type:</b> Donghua</span><span><b>Episodes:</b> {n_episodes}</span>
+</div><div class="genxed"><a href="/genres/action/">Action</a><a href="/genres/cultivation/">Cultivation</a><a href="/genres/fantasy/">Fantasy</a></div>
+<div class="desc mindes">Short description</div></div></div></div></div></div>
+<div class="bixbox synp"><div class="releases"><h2>Synopsis</h2></div><div class="entry-content" itemprop="description">
+<p>Once upon a time there was a cultivator.</p><p>He became very strong.</p></div></div>
+<div class="bixbox bxcl epcheck"><div class="releases"><h2>Episodes</h2></div><div class="eplister"><ul>{eps}</ul></div></div>
+</article>"""
+    return (
+        HEAD
+        + f'<div id="content"><div class="postbody">{body}</div>{SIDEBAR}</div>'
+        + FOOT
+    )
+
+
+def encode_mirror_script(html, offset=77824757):
+    values = []
+    for ch in html:
+        n = ord(ch) + offset
+        values.append(base64.b64encode(f"ab{n}Cd".encode()).decode())
+    arr = ",".join(f'"{v}"' for v in values)
+    return (
+        f'var HyV = ""; var ZmK = [{arr}];\n'
+        f"ZmK.forEach(function WdX(value) {{ HyV += String.fromCharCode(parseInt(atob(value).replace(/\\D/g,'')) - {offset}); }} );\n"
+        "document.write(decodeURIComponent(escape(HyV)));"
+    )
+
+
+MIRRORS = [
+    ("OK.ru", "https://ok.ru/videoembed/12345"),
+    ("Dailymotion", "https://www.dailymotion.com/embed/video/x8abc"),
+    ("Rumble", "https://rumble.com/embed/v4xyz/"),
+    ("Direct", "https://anichin.club/embed/direct"),
+]
+
+
+def _iframe(src):
+    html = (
+        '<iframe width="100%" height="100%" src="'
+        + src
+        + '" frameborder="0" allowfullscreen></iframe>'
+    )
+    return base64.b64encode(html.encode()).decode()
+
+
+def mirror_select():
+    opts = '<option value="">Select Video Server</option>' + "".join(
+        f'<option value="{_iframe(src)}" data-index="{i}">{name}</option>'
+        for i, (name, src) in enumerate(MIRRORS)
+    )
+    return f'<select class="mirror" name="mirror" onchange="loadMirror(this)">{opts}</select>'
+
+
+def episode_page(n_episodes=50, obfuscated=True):
+    eplist = "".join(
+        f'<li><a href="https://anichin.club/series-x-episode-{n_episodes - i}-subtitle-indonesia/">'
+        f'<div class="thumbnel"><img src="https://anichin.club/img/e{i}.jpg" class="ts-post-image" title="Series X Episode {n_episodes - i}"/></div>'
+        f'<div class="playinfo"><h3>Series X</h3><span>Eps {n_episodes - i} - {MONTHS[i % 12]} {i % 28 + 1}, {2020 + i % 5}</span></div></a></li>'
+        for i in range(n_episodes)
+    )
+    select = mirror_select()
+    if obfuscated:
+        player = f"<script>{encode_mirror_script(select)}</script>" + select
+    else:
+        player = select
+    body = f"""<article id="post-2"><div class="ts-breadcrumb bixbox"><ol><li><a href="https://anichin.club/"><span>Anichin</span></a></li>
+<li><a href="https://anichin.club/anime/series-x/"><span>Series X</span></a></li><li><span>Episode 12</span></li></ol></div>
+<div class="megavid"><div class="mvelement"><div class="item video-nav"><div class="mobius">{player}</div></div>
+<div class="player-embed" id="pembed"><iframe src="https://ok.ru/videoembed/12345"></iframe></div></div></div>
+<div class="single-info bixbox"><div class="thumb"><img src="https://anichin.club/img/x.jpg"/></div>
+<div class="infox"><div class="infolimit"><h2 itemprop="partOfSeries">Series X</h2></div>
+<div class="rating"><strong>Rating 8.5</strong></div><div class="info-content"><div class="spe">
+<span><b>Status:</b> Ongoing</span><span><b>Network:</b> Bilibili</span><span class="year"><a href="https://anichin.club/anime/series-x/">Series X</a></span></div>
+<div class="genxed"><a href="/genres/action/">Action</a><a href="/genres/fantasy/">Fantasy</a></div>
+<div class="desc mindes">A cultivator rises. <span class="colap">more</span></div></div></div></div>
+<div class="bixbox"><div class="episodelist"><ul>{eplist}</ul></div></div></article>"""
+    return (
+        HEAD
+        + f'<div id="content"><div class="postbody">{body}</div>{SIDEBAR}</div>'
+        + FOOT
+    )
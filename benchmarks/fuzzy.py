@@ -0,0 +1,86 @@
+"""Compare trigram fuzzy lookups with scoring every known title.
+
+Usage: python -m benchmarks.fuzzy [--titles N] [--rounds N]
+"""
+
+from argparse import ArgumentParser
+from difflib import SequenceMatcher
+from random import Random
+from time import perf_counter
+import logging
+from typing import Any, Callable, Dict, List
+
+from api.utils.fuzzy import TrigramIndex
+
+WORDS = (
+    "against the sky supreme perfect world battle through heavens soul land "
+    "martial universe swallowed star renegade immortal tales of demons and gods "
+    "legend of xianwu jade dynasty throne seal wan jie du zun spirit sword "
+    "sovereign peerless martial god lord of all realms shrouding heavens"
+).split()
+
+# Syllables of transliterated titles such as "Wan Jie Du Zun"
+SYLLABLES = (
+    "wan jie du zun xian long tian shen huang di jian mo xue feng yun hun ling "
+    "zhan shi dao xing chen wu dong qian kun yuan lei bing huo jin mu shui tu"
+).split()
+
+QUERIES = ["agaisnt the sky", "perfct wrld", "battle thru heavens", "renegade imortal"]
+
+
+def make_titles(count: int) -> List[Dict[str, Any]]:
+    """Build series cards from English title words and pinyin-like names."""
+    rng = Random(7)
+    cards = []
+    for i in range(count):
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        words += [
+            "".join(rng.sample(SYLLABLES, rng.randint(1, 2)))
+            for _ in range(rng.randint(1, 3))
+        ]
+        rng.shuffle(words)
+        cards.append({"title": " ".join(words).title(), "slug": f"series-{i}"})
+    return cards
+
+
+def scan(cards: List[Dict[str, Any]], query: str) -> List[str]:
+    """Score every title with difflib and keep the best 20."""
+    scored = [
+        (SequenceMatcher(None, query, card["title"].lower()).ratio(), card["slug"])
+        for card in cards
+    ]
+    return [slug for _, slug in sorted(scored, reverse=True)[:20]]
+
+
+def _time(lookup: Callable[[str], Any], rounds: int) -> float:
+    """Get the mean time of one lookup in milliseconds."""
+    start = perf_counter()
+    for _ in range(rounds):
+        for query in QUERIES:
+            lookup(query)
+    return (perf_counter() - start) / (rounds * len(QUERIES)) * 1000
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=30000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    cards = make_titles(args.titles)
+    index = TrigramIndex()
+    start = perf_counter()
+    index.add_cards(cards)
+    built = perf_counter() - start
+
+    print(f"{args.titles} titles, index built in {built:.2f} s")
+    print(f"  trigram index: {_time(index.lookup, args.rounds):>9.2f} ms")
+    print(f"  difflib scan:  {_time(lambda q: scan(cards, q), 1):>9.2f} ms")
+    for query in QUERIES:
+        matches = index.lookup(query, limit=1)
+        print(f"  {query!r} -> {matches[0][1]['title'] if matches else None}")
+
+
+if __name__ == "__main__":
+    main()
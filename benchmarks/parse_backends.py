@@ -0,0 +1,129 @@
+"""Time parsing and extraction of each page type with every parser backend.
+
+Usage: python -m benchmarks.parse_backends [--rounds N] [--profile]
+"""
+
+from argparse import ArgumentParser
+from time import perf_counter
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api.utils import anime, backends, episode, genre, home, info, search, video
+from api.utils.backends import ParseProfile
+from . import fixtures
+
+# (page type, html, extractor taking the raw html and parsed document, profile)
+PAGES: List[Tuple[str, str, Callable[[str, Any], Any], ParseProfile]] = [
+    (
+        "home",
+        fixtures.home_page(),
+        lambda _, doc: home.Home(1)._Home__get_details(doc),
+        home.PROFILE,
+    ),
+    (
+        "listing",
+        fixtures.listing_page(),
+        lambda _, doc: search.Search("q")._Search__get_details(doc),
+        search.PROFILE,
+    ),
+    (
+        "anime",
+        fixtures.listing_page(),
+        lambda _, doc: anime.Anime()._Anime__get_details(doc),
+        anime.PROFILE,
+    ),
+    (
+        "genres",
+        fixtures.listing_page(),
+        lambda _, doc: genre.Genres()._Genres__get_genre_list(doc),
+        genre.GENRES_PROFILE,
+    ),
+    (
+        "info",
+        fixtures.info_page(),
+        lambda html, doc: info.Info("x")._Info__to_json(html, doc),
+        info.PROFILE,
+    ),
+    (
+        "episode",
+        fixtures.episode_page(),
+        lambda html, doc: episode.Episode("x")._Episode__to_json(html, doc),
+        episode.PROFILE,
+    ),
+    (
+        "video",
+        fixtures.episode_page(),
+        lambda _, doc: video.Video("x")._Video__get_mirrors(doc),
+        video.PROFILE,
+    ),
+]
+
+
+def _time(fn: Callable[[], Any], rounds: int) -> float:
+    """Get the mean run time of fn in milliseconds."""
+    start = perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (perf_counter() - start) / rounds * 1000
+
+
+def run(
+    rounds: int, use_profiles: bool = False
+) -> Dict[str, Dict[str, Tuple[float, float, int, bool]]]:
+    """Get (parse ms, parse + extract ms, elements, same output) per page type.
+
+    Outputs are compared with a full html.parser parse of the same page.
+    """
+    expected = {
+        page_type: extract(html, backends.parse_html(html, "html.parser"))
+        for page_type, html, extract, _ in PAGES
+    }
+    results: Dict[str, Dict[str, Tuple[float, float, int, bool]]] = {}
+    for backend, available in backends.BACKENDS.items():
+        if not available:
+            print(f"{backend}: not installed, skipped")
+            continue
+
+        # Extractors parse decoded fragments with the configured backend
+        backends.BACKEND = backend
+        results[backend] = {}
+        for page_type, html, extract, page_profile in PAGES:
+            profile: Optional[ParseProfile] = page_profile if use_profiles else None
+
+            def parse() -> Any:
+                return backends.parse_html(html, backend, profile)
+
+            results[backend][page_type] = (
+                _time(parse, rounds),
+                _time(lambda: extract(html, parse()), rounds),
+                len(parse().find_all(True)),
+                extract(html, parse()) == expected[page_type],
+            )
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument(
+        "--profile", action="store_true", help="parse only the regions each page uses"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    results = run(args.rounds, args.profile)
+
+    print(
+        f"{'backend':<12} {'page':<8} {'parse ms':>10} {'+extract ms':>12} "
+        f"{'elements':>9}  output"
+    )
+    for backend, pages in results.items():
+        for page_type, (parse, total, elements, same) in pages.items():
+            print(
+                f"{backend:<12} {page_type:<8} {parse:>10.2f} {total:>12.2f} "
+                f"{elements:>9}  {'same' if same else 'DIFFERS'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
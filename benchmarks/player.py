@@ -0,0 +1,81 @@
+"""Compare decoding the obfuscated player script per request with the cached decoder.
+
+Usage: python -m benchmarks.player [--rounds N]
+"""
+
+from argparse import ArgumentParser
+from ast import literal_eval
+from base64 import b64decode
+from time import perf_counter
+import logging
+import re
+from typing import Any, Callable, List, Optional, Tuple
+
+from api.utils import backends, player
+from . import fixtures
+
+
+def decode_per_character(js_code: str) -> str:
+    """Decode the script the way the scraper did: per value, per character."""
+    matches = re.search(
+        r"var (\w+) = (\[[^\]]+\]);.*?\)\s*-\s*(\d+)", js_code, re.DOTALL
+    )
+    values = literal_eval(matches.group(2))
+    offset = int(matches.group(3))
+    return "".join(
+        [
+            chr(
+                int("".join(filter(str.isdigit, b64decode(value).decode("utf-8"))))
+                - offset
+            )
+            for value in values
+        ]
+    )
+
+
+def legacy_mirrors(js_code: str) -> Optional[List[Tuple[str, str]]]:
+    """Decode the script and parse the whole decoded fragment on every call."""
+    select = backends.parse_html(decode_per_character(js_code)).find(
+        "select", {"name": "mirror"}
+    )
+    if not select:
+        return None
+    return [
+        (option.get("value") or "", option.text) for option in select.find_all("option")
+    ]
+
+
+def _time(extract: Callable[[str], Any], js_code: str, rounds: int) -> float:
+    """Get the mean time of one call in microseconds."""
+    start = perf_counter()
+    for _ in range(rounds):
+        extract(js_code)
+    return (perf_counter() - start) / rounds * 1_000_000
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    js_code = fixtures.encode_mirror_script(fixtures.mirror_select())
+    same = legacy_mirrors(js_code) == player.get_script_mirrors(js_code)
+
+    print(f"script of {len(js_code)} bytes, mean of {args.rounds} rounds")
+    print(
+        f"  per-character decode + parse: {_time(legacy_mirrors, js_code, args.rounds):>9.1f} us"
+    )
+    print(
+        f"  bulk decode only:             "
+        f"{_time(player.decode_player_script, js_code, args.rounds):>9.1f} us"
+    )
+    print(
+        f"  cached decoder (hit):         "
+        f"{_time(player.get_script_mirrors, js_code, args.rounds):>9.1f} us  "
+        f"{'same' if same else 'DIFFERS'}"
+    )
+
+
+if __name__ == "__main__":
+    main()
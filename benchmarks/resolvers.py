@@ -0,0 +1,122 @@
+"""Check mirror resolution against local stand-ins: one fast, one slow, one failing.
+
+Usage: python -m benchmarks.resolvers [--deadline SECONDS]
+"""
+
+from argparse import ArgumentParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from time import perf_counter, sleep
+import asyncio
+import logging
+import sys
+from typing import Any, Callable, Dict, List
+
+from api.utils import resolvers
+from api.utils.client import close_async_client
+
+HOST = "127.0.0.1"
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Embed pages answering by path: /fast-*, /slow-* or /fail-*."""
+
+    slow: float = 3.0
+
+    def do_GET(self) -> None:
+        kind = self.path.lstrip("/").split("-", 1)[0]
+        if kind == "slow":
+            sleep(self.slow)
+        if kind == "fail":
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = f'<video><source src="http://{HOST}/media{self.path}.mp4" size="720">'
+        payload = f"<html><body>{body}</video></body></html>".encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except OSError:
+            # The resolver gave up on a slow page before it was answered
+            pass
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+def mirrors(port: int, run: str) -> List[Dict[str, str]]:
+    """Build the mirrors of one run; unique URLs skip the media cache."""
+    return [
+        {"name": name, "url": f"http://{HOST}:{port}/{name}-{run}"}
+        for name in ("fast", "slow", "fail", "fast-2")
+    ]
+
+
+def check(
+    label: str,
+    resolve: Callable[..., List[Dict[str, Any]]],
+    port: int,
+    limit: int,
+    deadline: float,
+    expected: List[str],
+    max_seconds: float,
+) -> bool:
+    start = perf_counter()
+    sources = resolve(mirrors(port, label), limit=limit, deadline=deadline)
+    elapsed = perf_counter() - start
+    names = [source["name"] for source in sources]
+    ok = sorted(names) == sorted(expected) and elapsed <= max_seconds
+    print(
+        f"  {label:<14} limit {limit}: {names} in {elapsed:.2f}s "
+        f"(within {max_seconds:.2f}s) {'ok' if ok else 'FAILED'}"
+    )
+    return ok
+
+
+def run_async(mirrors: List[Dict[str, str]], **kwargs: Any) -> List[Dict[str, Any]]:
+    async def resolve() -> List[Dict[str, Any]]:
+        try:
+            return await resolvers.resolve_sources_async(mirrors, **kwargs)
+        finally:
+            await close_async_client()
+
+    return asyncio.run(resolve())
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deadline", type=float, default=1.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    StandIn.slow = args.deadline * 3
+    server = ThreadingHTTPServer((HOST, 0), StandIn)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    resolvers.register_resolver(resolvers.EmbedPageResolver(HOST), first=True)
+
+    # The slow mirror is cut at the deadline and the failing one is dropped;
+    # with a limit of 2 the fast mirrors answer without waiting for it
+    expected = ["fast", "fast-2"]
+    within = args.deadline + 0.5
+    cases = [
+        ("sync", resolvers.resolve_sources, 3, within),
+        ("sync-limit", resolvers.resolve_sources, 2, 0.5),
+        ("async", run_async, 3, within),
+        ("async-limit", run_async, 2, 0.5),
+    ]
+
+    failed = 0
+    for label, resolve, limit, max_seconds in cases:
+        ok = check(label, resolve, port, limit, args.deadline, expected, max_seconds)
+        failed += not ok
+    server.shutdown()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
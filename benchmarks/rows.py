@@ -0,0 +1,104 @@
+"""Check that streamed list rows match a BeautifulSoup extraction at any chunk size.
+
+Usage: python -m benchmarks.rows [--episodes N]
+"""
+
+from argparse import ArgumentParser
+import logging
+import sys
+from typing import Any, Dict, List
+
+from api.utils import backends, episode, info
+from api.utils.rows import iter_rows
+from . import fixtures
+
+# Small sizes cut nearly every text node; the last one is the default
+CHUNK_SIZES = [*range(1, 65), 97, 211, 509, 1021, 4093, 16384]
+
+
+def episode_rows(html: str) -> List[Dict[str, Any]]:
+    """Read the rows of Episode's list the way its tree extractor did."""
+    rows = []
+    items = backends.parse_html(html, "html.parser").find(
+        "div", {"class": "episodelist"}
+    )
+    for item in items.find("ul").find_all("li"):
+        image = item.find("img", {"class": "ts-post-image"})
+        link = item.find("a")
+        playinfo = item.find("div", {"class": "playinfo"})
+        span = playinfo.find("span") if playinfo else None
+        rows.append(
+            {
+                "image": True if image else None,
+                "name": image.get("title") if image else None,
+                "lazy_src": image.get("data-lazy-src") if image else None,
+                "src": image.get("src") if image else None,
+                "href": link.get("href") if link else None,
+                "playinfo": True if playinfo else None,
+                "headline": span.get_text(strip=True) if span else None,
+            }
+        )
+    return rows
+
+
+def info_rows(html: str) -> List[Dict[str, Any]]:
+    """Read the rows of Info's list the way its tree extractor did."""
+    rows = []
+    items = backends.parse_html(html, "html.parser").find("div", {"class": "eplister"})
+    for item in items.find("ul").find_all("li"):
+        link = item.find("a")
+        fields = {
+            name: item.find("div", {"class": f"epl-{name}"})
+            for name in ("title", "date", "num")
+        }
+        text = {name: tag.text.strip() if tag else None for name, tag in fields.items()}
+        rows.append(
+            {
+                "href": link.get("href") if link else None,
+                "subtitle": text["title"],
+                "date": text["date"],
+                "episode": text["num"],
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    pages = [
+        (
+            "episode",
+            fixtures.episode_page(n_episodes=args.episodes),
+            episode.EPISODE_ROWS,
+            episode_rows,
+        ),
+        (
+            "info",
+            fixtures.info_page(n_episodes=args.episodes),
+            info.EPISODE_ROWS,
+            info_rows,
+        ),
+    ]
+
+    failed = 0
+    for page_type, html, spec, extract in pages:
+        expected = extract(html)
+        differs = [
+            size
+            for size in CHUNK_SIZES
+            if list(iter_rows(html, spec, chunk_size=size)) != expected
+        ]
+        failed += len(differs)
+        print(
+            f"  {page_type:<8} {len(expected)} rows, {len(CHUNK_SIZES)} chunk sizes: "
+            f"{'same' if not differs else f'DIFFERS at {differs}'}"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare prefix index suggestions with filtering every known title.
+
+Usage: python -m benchmarks.suggest [--titles N] [--rounds N]
+"""
+
+from argparse import ArgumentParser
+from time import perf_counter
+import logging
+from typing import Any, Callable, Dict, List
+
+from api.utils.fuzzy import fold
+from api.utils.suggest import PrefixIndex
+from .fuzzy import make_titles
+
+# What a search box sends while "against the sky" is typed
+QUERIES = ["a", "ag", "aga", "again", "against t", "against the s", "sky", "xianl"]
+
+
+def scan(cards: List[Dict[str, Any]], query: str) -> List[str]:
+    """Filter every title by prefix and keep the first 10 alphabetically."""
+    prefix = fold(query)
+    return sorted(
+        card["slug"] for card in cards if fold(card["title"]).startswith(prefix)
+    )[:10]
+
+
+def _time(suggest: Callable[[str], Any], rounds: int) -> float:
+    """Get the mean time of one suggestion in microseconds."""
+    start = perf_counter()
+    for _ in range(rounds):
+        for query in QUERIES:
+            suggest(query)
+    return (perf_counter() - start) / (rounds * len(QUERIES)) * 1_000_000
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=30000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    cards = make_titles(args.titles)
+    index = PrefixIndex()
+    start = perf_counter()
+    index.add_cards(cards)
+    built = perf_counter() - start
+
+    start = perf_counter()
+    for card in cards[:100]:
+        index.add_cards([{**card, "slug": f"{card['slug']}-new"}])
+    added = (perf_counter() - start) / 100 * 1_000_000
+
+    print(
+        f"{args.titles} titles, index built in {built:.2f} s, {added:.0f} us per new card"
+    )
+    print(f"  prefix index: {_time(index.lookup, args.rounds):>10.1f} us")
+    print(f"  title scan:   {_time(lambda q: scan(cards, q), 1):>10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,20 @@
 import logging
 import sys
-from typing import Text, Dict, Any, Tuple, Union
-from flask import Flask, jsonify, request
+from typing import Text, Dict, Any, Tuple
+import json
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
 from api import Main
+from api.utils.params import (
+    ParamError,
+    episode_params,
+    episodes_params,
+    listing_pages,
+    number,
+    require,
+    search_params,
+    suggest_params,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -32,18 +43,15 @@ def read_root() -> Tuple[Dict[str, Any], int]:
     return: JSON
     """
     try:
-        page = request.args.get("page")
-        logger.info(f"Home page request with page: {page}")
-
-        if page and not page.isdigit():
-            logger.warning(f"Invalid page parameter: {page}")
-            return jsonify(message="Page parameter must be a number"), 400
-
-        page_num = int(page) if page else 1
+        page_num = number(request.args, "page", "home", 1)
+        logger.info(f"Home page request with page: {page_num}")
         result = main.get_home(page_num)
         logger.info(f"Successfully served home page {page_num}")
         return result, 200
 
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
     except Exception as err:
         logger.error(f"Error in read_root: {err}")
         return jsonify(message=str(err)), 500
@@ -54,23 +62,71 @@ def search(query: str) -> Tuple[Dict[str, Any], int]:
     """
     Search donghua by query
     params: query - string (required)
-    return: JSON
+    query: page (optional) - int, deep (optional) - 1 to stream every result
+           page as NDJSON, max_pages (optional) - int, pages a deep search reads,
+           fuzzy (optional) - 1 to match known titles despite typos
+    return: JSON, or NDJSON lines for a deep search
     """
     try:
-        if not query or not query.strip():
-            logger.warning("Empty search query received")
-            return jsonify(message="Search query cannot be empty"), 400
-
-        logger.info(f"Search request for query: {query}")
-        result = main.search(query.strip())
+        params = search_params(query, request.args)
+        query = params["query"]
+
+        if params["fuzzy"]:
+            logger.info(f"Fuzzy search request for query: {query}")
+            result = main.search_fuzzy(query)
+            logger.info(f"Successfully served fuzzy search results for: {query}")
+            return result, 200
+
+        if params["deep"]:
+            max_pages = params["max_pages"]
+            logger.info(
+                f"Deep search request for query: {query}, max pages: {max_pages}"
+            )
+            lines = main.search_deep(query, max_pages)
+            generate = (json.dumps(line) + "\n" for line in lines)
+            return (
+                Response(
+                    stream_with_context(generate), mimetype="application/x-ndjson"
+                ),
+                200,
+            )
+
+        page_num = params["page"]
+        logger.info(f"Search request for query: {query}, page: {page_num}")
+        result = main.search(query, page_num)
         logger.info(f"Successfully served search results for: {query}")
         return result, 200
 
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
     except Exception as err:
         logger.error(f"Error in search for query '{query}': {err}")
         return jsonify(message=str(err)), 500
 
 
+@app.get("/suggest")
+def suggest() -> Tuple[Dict[str, Any], int]:
+    """
+    Suggest donghua titles for a search box
+    query: q - string (required), prefix of a title or slug,
+           limit (optional) - int, number of suggestions
+    return: JSON
+    """
+    try:
+        query, limit_num = suggest_params(request.args)
+        result = main.suggest(query, limit_num)
+        logger.info(f"Served {result['total']} suggestions for: {query}")
+        return result, 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in suggest for query '{request.args.get('q')}': {err}")
+        return jsonify(message=str(err)), 500
+
+
 @app.get("/<slug>")
 def get_info(slug: Text) -> Tuple[Dict[str, Any], int]:
     """
@@ -79,12 +135,9 @@ def get_info(slug: Text) -> Tuple[Dict[str, Any], int]:
     return: JSON
     """
     try:
-        if not slug or not slug.strip():
-            logger.warning("Empty slug received")
-            return jsonify(message="Slug cannot be empty"), 400
-
+        slug = require(slug, "Slug cannot be empty")
         logger.info(f"Info request for slug: {slug}")
-        data = main.get_info(slug.strip())
+        data = main.get_info(slug)
 
         if data.get("result") is None and data.get("error"):
             logger.warning(f"Info not found for slug: {slug}")
@@ -93,11 +146,42 @@ def get_info(slug: Text) -> Tuple[Dict[str, Any], int]:
         logger.info(f"Successfully served info for: {slug}")
         return data, 200
 
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
     except Exception as err:
         logger.error(f"Error in get_info for slug '{slug}': {err}")
         return jsonify(message=str(err)), 500
 
 
+@app.get("/<slug>/episodes")
+def get_episodes(slug: Text) -> Tuple[Dict[str, Any], int]:
+    """
+    Show the episode list of donghua, one page at a time
+    params: slug name of donghua - string (required)
+    query: page (optional) - int, limit (optional) - int, max 500
+    return: JSON
+    """
+    try:
+        slug, page_num, limit_num = episodes_params(slug, request.args)
+        logger.info(f"Episodes request for slug: {slug}, page: {page_num}")
+        data = main.get_episodes(slug, page_num, limit_num)
+
+        if data.get("error"):
+            logger.warning(f"Episodes not found for slug: {slug}")
+            return jsonify(message="Anime not found"), 404
+
+        logger.info(f"Successfully served episodes of {slug} page {page_num}")
+        return jsonify(data), 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in get_episodes for slug '{slug}': {err}")
+        return jsonify(message=str(err)), 500
+
+
 @app.get("/genres")
 def list_genres() -> Tuple[Dict[str, Any], int]:
     """
@@ -120,26 +204,30 @@ def get_genres(slug: str) -> Tuple[Dict[str, Any], int]:
     """
     Show list of donghua by genre
     params: slug genre - string (required)
-    query: page (optional) - int
+    query: page (optional) - int, pages (optional) - range such as 1-5,
+           limit (optional) - int, number of cards from page onwards
     return: JSON
     """
     try:
-        if not slug or not slug.strip():
-            logger.warning("Empty genre slug received")
-            return jsonify(message="Genre slug cannot be empty"), 400
+        slug = require(slug, "Genre slug cannot be empty")
+        page_num = number(request.args, "page", "genre", 1)
+        pages, limit = listing_pages(request.args, "genre", page_num)
 
-        page = request.args.get("page")
-        if page and not page.isdigit():
-            logger.warning(f"Invalid page parameter for genre: {page}")
-            return jsonify(message="Page parameter must be a number"), 400
+        if pages:
+            logger.info(f"Genre request for slug: {slug}, pages: {pages}")
+            data = main.genre_pages(slug, pages, limit)
+            logger.info(f"Successfully served genre {slug} pages {pages}")
+            return jsonify(data), 200
 
-        page_num = int(page) if page else 1
         logger.info(f"Genre request for slug: {slug}, page: {page_num}")
 
-        data = main.genres(slug.strip(), page_num)
+        data = main.genres(slug, page_num)
         logger.info(f"Successfully served genre {slug} page {page_num}")
         return jsonify(data), 200
 
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
     except Exception as err:
         logger.error(f"Error in get_genres for slug '{slug}': {err}")
         return jsonify(message=str(err)), 500
@@ -150,15 +238,14 @@ def get_episode(slug: Text) -> Tuple[Dict[str, Any], int]:
     """
     Get detail of episode
     params: slug episode - string (required)
+    query: players (optional) - "handles" (default) or "resolve",
+           video (optional) - 1 to include resolved video sources
     return: JSON
     """
     try:
-        if not slug or not slug.strip():
-            logger.warning("Empty episode slug received")
-            return jsonify(message="Episode slug cannot be empty"), 400
-
+        slug, resolve, video = episode_params(slug, request.args)
         logger.info(f"Episode request for slug: {slug}")
-        data = main.get_episode(slug.strip())
+        data = main.get_episode(slug, resolve=resolve, video=video)
 
         if data.get("result") is None and data.get("error"):
             logger.warning(f"Episode not found for slug: {slug}")
@@ -167,11 +254,41 @@ def get_episode(slug: Text) -> Tuple[Dict[str, Any], int]:
         logger.info(f"Successfully served episode: {slug}")
         return jsonify(data), 200
 
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
     except Exception as err:
         logger.error(f"Error in get_episode for slug '{slug}': {err}")
         return jsonify(message=str(err)), 500
 
 
+@app.get("/episode/<slug>/mirror/<int:mirror>")
+def get_episode_mirror(slug: Text, mirror: int) -> Tuple[Dict[str, Any], int]:
+    """
+    Get the embed URL of one mirror of an episode
+    params: slug episode - string (required), mirror - int (required)
+    return: JSON
+    """
+    try:
+        slug = require(slug, "Episode slug cannot be empty")
+        logger.info(f"Mirror {mirror} request for episode: {slug}")
+        data = main.get_episode_mirror(slug, mirror)
+
+        if data.get("result") is None:
+            logger.warning(f"Mirror {mirror} not found for episode: {slug}")
+            return jsonify(message="Mirror not found"), 404
+
+        logger.info(f"Successfully served mirror {mirror} of episode: {slug}")
+        return jsonify(data), 200
+
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
+    except Exception as err:
+        logger.error(f"Error in get_episode_mirror for slug '{slug}': {err}")
+        return jsonify(message=str(err)), 500
+
+
 @app.get("/video-source/<slug>")
 def get_video(slug: Text) -> Tuple[Dict[str, Any], int]:
     """
@@ -180,12 +297,9 @@ def get_video(slug: Text) -> Tuple[Dict[str, Any], int]:
     return: JSON
     """
     try:
-        if not slug or not slug.strip():
-            logger.warning("Empty video slug received")
-            return jsonify(message="Video slug cannot be empty"), 400
-
+        slug = require(slug, "Video slug cannot be empty")
         logger.info(f"Video source request for slug: {slug}")
-        data = main.get_video_source(slug.strip())
+        data = main.get_video_source(slug)
 
         if not data:
             logger.warning(f"Video source not found for slug: {slug}")
@@ -194,6 +308,9 @@ def get_video(slug: Text) -> Tuple[Dict[str, Any], int]:
         logger.info(f"Successfully served video source: {slug}")
         return jsonify(data), 200
 
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
     except Exception as err:
         logger.error(f"Error in get_video for slug '{slug}': {err}")
         return jsonify(message=str(err)), 500
@@ -203,18 +320,33 @@ def get_video(slug: Text) -> Tuple[Dict[str, Any], int]:
 def anime() -> Tuple[Dict[str, Any], int]:
     """
     Show list of anime
+    query: upstream filters (optional), pages (optional) - range such as 1-5,
+           limit (optional) - int, number of cards from page onwards
     return: JSON
     """
     try:
         logger.info("Anime list request")
         req = request.args
-        params_dict = dict(req)
+        params_dict = {k: v for k, v in req.items() if k not in ("pages", "limit")}
+
+        page = req.get("page")
+        start = int(page) if page and page.isdigit() else 1
+        pages, limit = listing_pages(req, "anime list", start)
+
+        if pages:
+            logger.debug(f"Anime list parameters: {params_dict}, pages: {pages}")
+            data = main.anime_pages(pages, limit, params=params_dict)
+            logger.info(f"Successfully served anime list pages {pages}")
+            return jsonify(data), 200
 
         logger.debug(f"Anime list parameters: {params_dict}")
         data = main.anime(params=params_dict)
         logger.info("Successfully served anime list")
         return jsonify(data), 200
 
+    except ParamError as err:
+        return jsonify(message=str(err)), 400
+
     except Exception as err:
         logger.error(f"Error in anime: {err}")
         return jsonify(message=str(err)), 500
@@ -1,6 +1,8 @@
 import base64
 import re
 
+from api.utils.player import parse_string_array
+
 
 def decode_and_transform(values, dynamic_value):
     result = ""
@@ -16,7 +18,7 @@ def extract_values_from_javascript(js_code):
     # Extract dynamic variable names and their values using regular expressions
     pattern = r"var (\w+) = (\[[^\]]+\]);"
     matches = re.findall(pattern, js_code)
-    return eval(matches[0][1])
+    return parse_string_array(matches[0][1])
 
 
 def extract_dynamic_value(js_code):